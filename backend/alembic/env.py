@@ -0,0 +1,57 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.database import Base, engine
+
+# Every model module, so autogenerate sees the whole schema
+import app.auth.models  # noqa: F401
+import app.caching  # noqa: F401
+import app.coach.models  # noqa: F401
+import app.jobs.models  # noqa: F401
+import app.peer.models  # noqa: F401
+import app.planner.models  # noqa: F401
+import app.profile.models  # noqa: F401
+import app.reflection.models  # noqa: F401
+import app.sync.models  # noqa: F401
+import app.usage  # noqa: F401
+
+config = context.config
+
+# Run from the CLI: log like alembic does. From app.database.migrate the
+# app's own logging is already set up and a connection is passed in.
+connection = config.attributes.get("connection")
+if connection is None and config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    with engine.connect() as conn:
+        context.configure(connection=conn, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
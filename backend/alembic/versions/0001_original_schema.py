@@ -0,0 +1,72 @@
+"""original schema
+
+The tables as they were before migrations existed. Databases created by
+create_all back then are stamped at this revision (app.database.migrate).
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("phone_number", sa.String(), nullable=False),
+        sa.Column("otp", sa.String(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_phone_number", "users", ["phone_number"], unique=True)
+
+    op.create_table(
+        "peer_posts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String()),
+        sa.Column("description", sa.String()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+
+    op.create_table(
+        "profiles",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("teacher_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=False),
+        sa.Column("bio", sa.String(), nullable=True),
+        sa.Column("expertise", sa.String(), nullable=True),
+    )
+    op.create_index("ix_profiles_id", "profiles", ["id"])
+    op.create_index("ix_profiles_teacher_id", "profiles", ["teacher_id"], unique=True)
+
+    op.create_table(
+        "reflections",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("teacher_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("reflection_text", sa.String(), nullable=False),
+        sa.Column("mood", sa.String(), nullable=False),
+        sa.Column("challenge", sa.String(), nullable=False),
+        sa.Column("success", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_reflections_id", "reflections", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("reflections")
+    op.drop_table("profiles")
+    op.drop_table("peer_posts")
+    op.drop_table("users")
@@ -0,0 +1,29 @@
+"""keyset indexes for the peer feed and reflection list
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 10:01:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_peer_posts_created_at_id", "peer_posts", ["created_at", "id"])
+    op.create_index("ix_reflections_teacher_id_id", "reflections", ["teacher_id", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_reflections_teacher_id_id", table_name="reflections")
+    op.drop_index("ix_peer_posts_created_at_id", table_name="peer_posts")
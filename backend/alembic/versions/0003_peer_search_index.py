@@ -0,0 +1,55 @@
+"""full-text index for peer posts
+
+An FTS5 table on SQLite, a tsvector column with a GIN index on Postgres.
+Existing posts are indexed by app.peer.search.backfill_search_index.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 10:02:00.000000
+
+"""
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Devanagari vowel signs / virama are combining marks, which the default
+# FTS5 tokenizer treats as separators ("बच्चे" -> "बच", "च"). Declare them
+# as token characters so whole Devanagari words are indexed.
+DEVANAGARI_MARKS = "".join(
+    chr(cp) for cp in range(0x0900, 0x0980)
+    if unicodedata.category(chr(cp)) in ("Mn", "Mc")
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE peer_posts_fts USING fts5("
+            "title, description, folded, "
+            f"tokenize = \"unicode61 remove_diacritics 2 tokenchars '{DEVANAGARI_MARKS}'\")"
+        )
+    elif dialect == "postgresql":
+        op.add_column("peer_posts", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+        op.create_index("ix_peer_posts_search_vector", "peer_posts", ["search_vector"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute("DROP TABLE peer_posts_fts")
+    elif dialect == "postgresql":
+        op.drop_index("ix_peer_posts_search_vector", table_name="peer_posts")
+        op.drop_column("peer_posts", "search_vector")
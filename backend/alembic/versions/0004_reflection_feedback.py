@@ -0,0 +1,31 @@
+"""reflection feedback filled in by the job queue
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 10:03:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("reflections", sa.Column("ai_feedback", sa.String(), nullable=True))
+    op.add_column("reflections", sa.Column("feedback_job_id", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("reflections") as batch:
+        batch.drop_column("feedback_job_id")
+        batch.drop_column("ai_feedback")
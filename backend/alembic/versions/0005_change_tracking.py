@@ -0,0 +1,42 @@
+"""change tracking for /sync
+
+Existing rows keep change_seq 0 here and are numbered by
+app.sync.changes.backfill_change_seqs.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 10:04:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRACKED_TABLES = ("reflections", "peer_posts", "profiles")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TRACKED_TABLES:
+        op.add_column(table, sa.Column("change_seq", sa.Integer(), nullable=False, server_default="0"))
+        op.add_column(table, sa.Column("updated_at", sa.DateTime(), nullable=True))
+        op.create_index(f"ix_{table}_change_seq", table, ["change_seq"])
+    op.create_index("ix_reflections_teacher_id_change_seq", "reflections", ["teacher_id", "change_seq"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_reflections_teacher_id_change_seq", table_name="reflections")
+    for table in TRACKED_TABLES:
+        op.drop_index(f"ix_{table}_change_seq", table_name=table)
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("updated_at")
+            batch.drop_column("change_seq")
@@ -0,0 +1,40 @@
+"""reaction counters and ranking score on peer posts
+
+Existing posts start at score 0 here and get their initial score from
+app.peer.reactions.backfill_scores.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 10:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = ("helpful_count", "tried_count", "thanks_count")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for counter in COUNTERS:
+        op.add_column("peer_posts", sa.Column(counter, sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("peer_posts", sa.Column("score", sa.Float(), nullable=False, server_default="0"))
+    op.create_index("ix_peer_posts_score_id", "peer_posts", ["score", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_peer_posts_score_id", table_name="peer_posts")
+    with op.batch_alter_table("peer_posts") as batch:
+        batch.drop_column("score")
+        for counter in COUNTERS:
+            batch.drop_column(counter)
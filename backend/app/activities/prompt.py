@@ -1,8 +1,9 @@
 def activity_prompt(data):
+    topic_line = f"Topic: {data.topic}\n" if data.topic else ""
     return f"""
 Create a classroom activity.
 
-Students: {data.class_size}
+{topic_line}Students: {data.class_size}
 Levels: {data.learning_levels}
 Time left: {data.time_left} minutes
 Materials: {data.materials_available}
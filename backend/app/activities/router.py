@@ -6,12 +6,8 @@ from app.coach.groq_client import call_groq
 router = APIRouter(prefix="/activities", tags=["Activities"])
 
 
-@router.post("/generate", response_model=schemas.ActivityResponse)
-def generate_activity(
-    data: schemas.ActivityRequest,
-    user_id: int = Depends(get_current_user),
-):
-    text = call_groq(prompt.activity_prompt(data))
+def build_activity(data: schemas.ActivityRequest) -> dict:
+    text = call_groq(prompt.activity_prompt(data), caller="activities")
     lines = [l for l in text.split("\n") if l.strip()]
 
     return {
@@ -19,3 +15,11 @@ def generate_activity(
         "grouping": "Mixed ability pairs",
         "quick_assessment": "Ask 2 students to explain",
     }
+
+
+@router.post("/generate", response_model=schemas.ActivityResponse)
+def generate_activity(
+    data: schemas.ActivityRequest,
+    user_id: int = Depends(get_current_user),
+):
+    return build_activity(data)
@@ -1,11 +1,12 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 class ActivityRequest(BaseModel):
     class_size: int
     learning_levels: List[str]          # ✅ FIXED
     time_left: int
     materials_available: List[str]      # ✅ FIXED
+    topic: Optional[str] = None
 
 
 class ActivityResponse(BaseModel):
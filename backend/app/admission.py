@@ -0,0 +1,195 @@
+# app/admission.py
+
+import asyncio
+import math
+import re
+import time
+from collections import deque
+
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+from app.metrics import ADMISSION_SHED
+
+LLM = "llm"
+DB = "db"
+STATIC = "static"
+
+# First match wins; paths are relative to /api/v1 (or the /api aliases).
+# None = not limited (long-polls that hold no worker thread).
+ROUTE_CLASSES = [
+    (re.compile(r"^/reflection/\d+/feedback$"), None),
+    (re.compile(r"^/planner/term-plans/\d+/events$"), None),
+    (re.compile(r"^/planner/term-plans"), DB),  # generated by a background job
+    (re.compile(r"^/(system/|resources/library$|library$|tts/audio/|$)"), STATIC),
+    (re.compile(r"^/(coach|planner|activities|parent|tts|lesson)/"), LLM),
+    (re.compile(r"^/(resources/)?(generate-plan|video-suggestions|cluster-videos)$"), LLM),
+]
+API_PREFIX_RE = re.compile(r"^/api(/v1)?(?=/)")
+
+
+def route_class(path: str):
+    path = API_PREFIX_RE.sub("", path)
+    for pattern, cls in ROUTE_CLASSES:
+        if pattern.match(path):
+            return cls
+    return DB
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit for one route class, adjusted by AIMD on observed
+    latency: +1 slot per `limit` fast completions, x0.8 when a request is
+    slower than `target_latency` or fails (at most once per target
+    interval). Requests over the limit wait in a bounded FIFO queue for
+    up to `max_wait` seconds, after which they are shed.
+
+    Runs on the event loop only, so no locking is needed.
+    """
+
+    def __init__(self, name: str, max_limit: int, target_latency: float,
+                 queue_size: int, max_wait: float, min_limit: int = 2):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(max_limit)
+        self.target_latency = target_latency
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.avg_latency = target_latency / 2
+        self._waiters = deque()
+        self._last_decrease = 0.0
+
+    async def acquire(self) -> bool:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return True
+        if len(self._waiters) >= self.queue_size:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait)
+            return True
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as we gave up: hand the slot on
+                self._release_slot()
+            else:
+                waiter.cancel()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return False
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def record(self, latency: float, ok: bool):
+        self.avg_latency += 0.1 * (latency - self.avg_latency)
+        now = time.monotonic()
+        if not ok or latency > self.target_latency:
+            if now - self._last_decrease > self.target_latency:
+                self.limit = max(self.min_limit, self.limit * 0.8)
+                self._last_decrease = now
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def release(self):
+        self._release_slot()
+
+    def _release_slot(self):
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                self.in_flight += 1
+
+    def retry_after(self) -> int:
+        # Roughly how long until the queue ahead drains
+        backlog = (len(self._waiters) + 1) / max(1.0, self.limit)
+        return max(1, min(60, math.ceil(self.avg_latency * backlog)))
+
+    def status(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "avg_latency_ms": round(self.avg_latency * 1000, 1),
+        }
+
+
+limiters = {
+    LLM: AdaptiveLimiter(
+        LLM, settings.ADMISSION_LLM_LIMIT, settings.ADMISSION_LLM_TARGET_SECONDS,
+        settings.ADMISSION_QUEUE_SIZE, settings.ADMISSION_MAX_WAIT_SECONDS,
+    ),
+    DB: AdaptiveLimiter(
+        DB, settings.ADMISSION_DB_LIMIT, settings.ADMISSION_DB_TARGET_SECONDS,
+        settings.ADMISSION_QUEUE_SIZE, settings.ADMISSION_MAX_WAIT_SECONDS,
+    ),
+    STATIC: AdaptiveLimiter(
+        STATIC, settings.ADMISSION_STATIC_LIMIT, settings.ADMISSION_STATIC_TARGET_SECONDS,
+        settings.ADMISSION_QUEUE_SIZE, settings.ADMISSION_MAX_WAIT_SECONDS,
+    ),
+}
+
+
+def admission_status() -> dict:
+    return {name: limiter.status() for name, limiter in limiters.items()}
+
+
+class AdmissionMiddleware:
+    """
+    Admits each request through its route class's limiter, so slow LLM
+    calls can't take every worker thread from cheap DB/static routes.
+    Shed requests get 503 with Retry-After. Latency is taken at the first
+    response byte, so long streams don't count as slow responses.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        cls = route_class(scope["path"])
+        if cls is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = limiters[cls]
+        if not await limiter.acquire():
+            ADMISSION_SHED.inc(route_class=cls)
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry shortly"},
+                status_code=503,
+                headers={"Retry-After": str(limiter.retry_after())},
+            )
+            await response(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        recorded = False
+
+        async def send_and_record(message):
+            nonlocal recorded
+            if message["type"] == "http.response.start" and not recorded:
+                recorded = True
+                limiter.record(time.perf_counter() - start, message["status"] < 500)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_record)
+        except Exception:
+            if not recorded:
+                recorded = True
+                limiter.record(time.perf_counter() - start, False)
+            raise
+        finally:
+            limiter.release()
@@ -4,15 +4,19 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from datetime import datetime, timedelta
+import logging
 import random
 
 from app.database import get_db
+from app.group_commit import commit_write
 from app.auth.models import User
 from app.auth.schemas import OTPRequest, OTPVerifyResponse, OTPResponse
 from app.utils import create_access_token  # function to create JWT
 
 router = APIRouter(tags=["Auth"], prefix="/auth")
 
+logger = logging.getLogger(__name__)
+
 # In-memory OTP store for testing
 otp_store = {}
 
@@ -24,6 +28,17 @@ class OTPVerifyRequest(BaseModel):
     phone_number: str
     otp: str
 
+def ensure_user(db: Session, phone_number: str) -> int:
+    """
+    Id of the user with this phone number, inserted (uncommitted) if new.
+    """
+    user = db.query(User).filter(User.phone_number == phone_number).first()
+    if not user:
+        user = User(phone_number=phone_number)
+        db.add(user)
+        db.flush()
+    return user.id
+
 # --- Endpoints ---
 
 @router.post("/send-otp", response_model=OTPResponse)
@@ -47,13 +62,12 @@ def send_otp(data: OTPSendRequest, db: Session = Depends(get_db)):
     # Create user if not exists
     user = db.query(User).filter(User.phone_number == data.phone_number).first()
     if not user:
-        user = User(phone_number=data.phone_number)
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+        commit_write(db, lambda session: ensure_user(session, data.phone_number))
 
     # Normally here you would send SMS via service
-    print(f"OTP for {data.phone_number}: {otp}")  # For local testing
+    # The code itself is only logged with LOG_LEVEL=DEBUG, for local testing
+    logger.info("OTP issued", extra={"phone": data.phone_number[-4:].rjust(len(data.phone_number), "*")})
+    logger.debug("OTP for %s: %s", data.phone_number, otp, extra={"sample_rate": 1.0})
 
     return {"status": "ok", "message": f"OTP sent to {data.phone_number}"}
 
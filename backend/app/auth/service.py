@@ -1,11 +1,15 @@
 # MOCK OTP SERVICE (SAFE FOR MVP / HACKATHON)
 
+import logging
+
+logger = logging.getLogger(__name__)
+
 _otp_store = {}
 
 
 def send_otp(phone: str):
     _otp_store[phone] = "123456"  # mock OTP
-    print(f"[DEV OTP] {phone} → 123456")
+    logger.debug("[DEV OTP] %s → 123456", phone, extra={"sample_rate": 1.0})
 
 
 def verify_otp(phone: str, otp: str) -> bool:
@@ -0,0 +1,161 @@
+# app/caching.py
+
+import hashlib
+import json
+from collections import defaultdict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from threading import Lock
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.metrics import record_cache
+
+
+class ResourceVersion(Base):
+    """
+    Version counter per cacheable resource (e.g. "profile:42", "peer_posts"),
+    bumped by every write so GET routes can build an ETag without loading data.
+    """
+    __tablename__ = "resource_versions"
+
+    scope = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class NotModified(HTTPException):
+    def __init__(self, headers: dict):
+        super().__init__(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+# route path -> {"requests": n, "not_modified": n}
+_stats = defaultdict(lambda: {"requests": 0, "not_modified": 0})
+_stats_lock = Lock()
+
+
+def _record(request: Request, not_modified: bool):
+    route = request.scope.get("route")
+    path = route.path if route else request.url.path
+    with _stats_lock:
+        entry = _stats[path]
+        entry["requests"] += 1
+        if not_modified:
+            entry["not_modified"] += 1
+    record_cache("conditional_get", not_modified)
+
+
+def cache_stats() -> dict:
+    with _stats_lock:
+        return {
+            path: {
+                **entry,
+                "not_modified_ratio": round(entry["not_modified"] / entry["requests"], 4),
+            }
+            for path, entry in _stats.items()
+        }
+
+
+def bump_version(db: Session, scope: str):
+    """
+    Invalidate cached copies of `scope`; runs in the writer's transaction.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    now = datetime.utcnow()
+    stmt = insert(ResourceVersion).values(scope=scope, version=1, updated_at=now)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["scope"],
+        set_={"version": ResourceVersion.version + 1, "updated_at": now},
+    )
+    db.execute(stmt)
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def _is_fresh(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            return False
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
+
+
+def check_not_modified(
+    request: Request,
+    response: Response,
+    db: Session,
+    scope: str,
+    cache_control: str,
+    variant: Optional[tuple] = None,
+):
+    """
+    Conditional GET from the version counter of `scope`. Raises NotModified
+    (a bodyless 304) when the client's copy is current; otherwise sets the
+    validators on `response` and lets the route build the payload.
+    The query string is part of the ETag, so each page/search has its own.
+    For a payload that also changes without a write (e.g. a window ending
+    today), pass `variant` as (key, since): `key` goes into the ETag and
+    Last-Modified is at least `since`, the time `key` took effect.
+    """
+    row = db.get(ResourceVersion, scope)
+    version = row.version if row else 0
+    last_modified = row.updated_at if row else None
+
+    key = ""
+    if variant is not None:
+        key, since = variant
+        last_modified = max(last_modified, since) if last_modified else since
+
+    digest = hashlib.sha256(f"{scope}:{version}:{request.url.query}:{key}".encode()).hexdigest()
+    headers = {"ETag": f'"{digest[:20]}"', "Cache-Control": cache_control}
+    if cache_control.startswith("private"):
+        headers["Vary"] = "Authorization"
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+
+    fresh = _is_fresh(request, headers["ETag"], last_modified)
+    _record(request, fresh)
+    if fresh:
+        raise NotModified(headers)
+
+    response.headers.update(headers)
+
+
+class StaticPayload:
+    """
+    A constant JSON payload serialized and hashed once, served with a strong
+    ETag computed from its bytes.
+    """
+
+    def __init__(self, payload, cache_control: str):
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:20]}"'
+        self.cache_control = cache_control
+
+    def respond(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control}
+        fresh = _is_fresh(request, self.etag, None)
+        _record(request, fresh)
+        if fresh:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
@@ -0,0 +1,146 @@
+import math
+import threading
+from collections import deque
+
+from app.config import settings
+
+DEFAULT_MODEL = "llama-3.1-8b-instant"
+
+# max_tokens is recomputed from the last GENERATION_WINDOW completion
+# lengths every RECOMPUTE_EVERY calls, once MIN_SAMPLES have been seen
+RECOMPUTE_EVERY = 10
+TRUNCATION_HEADROOM = 2  # a cut-off completion needed at least this many times the limit it hit
+
+
+class GenerationProfile:
+    """
+    How one feature calls the LLM: model, temperature, stop sequences, JSON
+    mode and a max_tokens that follows the feature's observed output
+    lengths (p99 plus a margin, between `min_tokens` and `max_tokens_cap`),
+    so each call asks for just enough tokens. Starts at `initial_tokens`
+    until enough completions have been seen. Counters are per worker.
+    """
+
+    def __init__(self, name: str, temperature: float, initial_tokens: int, min_tokens: int,
+                 max_tokens_cap: int, stop: tuple = (), json_mode: bool = False,
+                 model: str = DEFAULT_MODEL):
+        self.name = name
+        self.model = model
+        self.temperature = temperature
+        self.initial_tokens = initial_tokens
+        self.min_tokens = min_tokens
+        self.max_tokens_cap = max_tokens_cap
+        self.stop = list(stop)
+        self.json_mode = json_mode
+
+        self._lock = threading.Lock()
+        self._lengths = deque(maxlen=settings.GENERATION_WINDOW)
+        self._limit = initial_tokens
+        self._since_recompute = 0
+        self.calls = 0
+        self.truncated = 0
+        self.latency_seconds = 0.0
+
+    @property
+    def max_tokens(self) -> int:
+        return self._limit
+
+    def payload(self, messages: list) -> dict:
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_tokens": self._limit,
+        }
+        if self.stop:
+            payload["stop"] = self.stop
+        if self.json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        return payload
+
+    def observe(self, completion_tokens: int, truncated: bool, latency: float):
+        """
+        Record a completed call. A truncated completion only tells us the
+        real length was longer, so it is counted as TRUNCATION_HEADROOM
+        times the limit and the limit is raised right away.
+        """
+        with self._lock:
+            self.calls += 1
+            self.latency_seconds += latency
+            if truncated:
+                self.truncated += 1
+                grown = min(self.max_tokens_cap, max(completion_tokens, self._limit) * TRUNCATION_HEADROOM)
+                self._lengths.append(grown)
+                self._limit = max(self._limit, grown)
+                return
+
+            self._lengths.append(completion_tokens)
+            self._since_recompute += 1
+            if len(self._lengths) >= settings.GENERATION_MIN_SAMPLES and self._since_recompute >= RECOMPUTE_EVERY:
+                self._since_recompute = 0
+                self._limit = self._adapted_limit()
+
+    def _adapted_limit(self) -> int:
+        ordered = sorted(self._lengths)
+        p99 = ordered[max(0, math.ceil(0.99 * len(ordered)) - 1)]
+        wanted = math.ceil(p99 * settings.GENERATION_MAX_TOKENS_MARGIN)
+        return max(self.min_tokens, min(self.max_tokens_cap, wanted))
+
+    def status(self) -> dict:
+        with self._lock:
+            ordered = sorted(self._lengths)
+            calls = self.calls
+            return {
+                "model": self.model,
+                "temperature": self.temperature,
+                "json_mode": self.json_mode,
+                "stop": self.stop,
+                "max_tokens": self._limit,
+                "samples": len(ordered),
+                "p50_completion_tokens": ordered[len(ordered) // 2] if ordered else None,
+                "p99_completion_tokens": ordered[max(0, math.ceil(0.99 * len(ordered)) - 1)] if ordered else None,
+                "calls": calls,
+                "truncated": self.truncated,
+                "truncation_rate": round(self.truncated / calls, 4) if calls else 0.0,
+                "avg_latency_ms": round(self.latency_seconds / calls * 1000, 1) if calls else None,
+            }
+
+
+# Keyed by the `caller` each feature passes to call_groq
+PROFILES = {
+    profile.name: profile for profile in [
+        # 3 JSON cards of <40 words; Devanagari replies use many more tokens
+        GenerationProfile("coach", temperature=0.7, initial_tokens=600, min_tokens=200,
+                          max_tokens_cap=1200, json_mode=True),
+        # Full lesson plan JSON; 300 tokens used to cut it off mid-object
+        GenerationProfile("planner", temperature=0.5, initial_tokens=900, min_tokens=300,
+                          max_tokens_cap=2000, json_mode=True),
+        GenerationProfile("activities", temperature=0.7, initial_tokens=400, min_tokens=150,
+                          max_tokens_cap=1000),
+        # A single search query line
+        GenerationProfile("resources", temperature=0.3, initial_tokens=40, min_tokens=16,
+                          max_tokens_cap=80, stop=("\n",)),
+        GenerationProfile("parent", temperature=0.7, initial_tokens=200, min_tokens=80,
+                          max_tokens_cap=500),
+        # One template per topic in a single JSON object
+        GenerationProfile("parent_templates", temperature=0.7, initial_tokens=800, min_tokens=200,
+                          max_tokens_cap=2000, json_mode=True),
+        GenerationProfile("reflection", temperature=0.7, initial_tokens=300, min_tokens=100,
+                          max_tokens_cap=600),
+    ]
+}
+
+DEFAULT_PROFILE = GenerationProfile("other", temperature=0.7, initial_tokens=300, min_tokens=100,
+                                    max_tokens_cap=1000)
+
+
+def generation_profile(caller: str) -> GenerationProfile:
+    return PROFILES.get(caller, DEFAULT_PROFILE)
+
+
+def generation_status() -> dict:
+    """
+    Settings and observed output lengths, truncations and latency per
+    profile (this worker only).
+    """
+    return {name: profile.status() for name, profile in [*PROFILES.items(), ("other", DEFAULT_PROFILE)]}
@@ -1,29 +1,74 @@
+import time
+
 import requests
 from app.config import settings
+from app.coach.generation import generation_profile
+from app.metrics import LLM_ERRORS, LLM_LATENCY, LLM_TOKENS, LLM_TRUNCATIONS
+from app.profiling import stage
+from app.usage import current_attribution, usage
+
+GROQ_TIMEOUT = 30  # seconds
 
-GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+def call_groq(prompt: str, caller: str = "other") -> str:
+    """
+    `caller` names the feature making the call (coach, planner, ...),
+    picks its generation profile (model, temperature, adaptive max_tokens,
+    stop sequences, JSON mode) and labels its latency / token / error metrics.
+    Usage is charged to the current teacher and route; raises QuotaExceeded
+    (429) once the teacher's daily quota is used up.
+    """
+    user_id, route = current_attribution(caller)
+    usage.check_quota(user_id)
 
-def call_groq(prompt: str) -> str:
     headers = {
         "Authorization": f"Bearer {settings.GROQ_API_KEY}",
         "Content-Type": "application/json",
     }
 
-    payload = {
-        "model": "llama-3.1-8b-instant",
-        "messages": [
-            {"role": "system", "content": "You are a helpful teacher coach for Indian classrooms."},
-            {"role": "user", "content": prompt},
-        ],
-        "temperature": 0.7,
-        "max_tokens": 300,
-    }
+    profile = generation_profile(caller)
+    payload = profile.payload([
+        {"role": "system", "content": "You are a helpful teacher coach for Indian classrooms."},
+        {"role": "user", "content": prompt},
+    ])
 
-    response = requests.post(GROQ_URL, headers=headers, json=payload)
+    start = time.perf_counter()
 
-    data = response.json()
+    def failed(reason: str):
+        latency = time.perf_counter() - start
+        LLM_LATENCY.observe(latency, caller=caller, outcome="error")
+        LLM_ERRORS.inc(caller=caller, reason=reason)
+        usage.record(user_id, route, latency, 0, 0, ok=False)
+
+    try:
+        with stage("llm"):
+            response = requests.post(settings.GROQ_URL, headers=headers, json=payload, timeout=GROQ_TIMEOUT)
+            data = response.json()
+    except requests.Timeout:
+        failed("timeout")
+        raise
+    except (requests.RequestException, ValueError):
+        failed("transport")
+        raise
 
     if "choices" not in data:
+        failed(f"http_{response.status_code}")
         raise Exception(f"GROQ ERROR: {data}")
 
+    latency = time.perf_counter() - start
+    LLM_LATENCY.observe(latency, caller=caller, outcome="ok")
+    tokens = data.get("usage") or {}
+    for kind in ("prompt", "completion"):
+        if f"{kind}_tokens" in tokens:
+            LLM_TOKENS.observe(tokens[f"{kind}_tokens"], caller=caller, kind=kind)
+    usage.record(
+        user_id, route, latency,
+        tokens.get("prompt_tokens", 0), tokens.get("completion_tokens", 0), ok=True,
+    )
+
+    # Feed the output length back into the profile's max_tokens
+    truncated = data["choices"][0].get("finish_reason") == "length"
+    if truncated:
+        LLM_TRUNCATIONS.inc(caller=caller)
+    profile.observe(tokens.get("completion_tokens", 0), truncated, latency)
+
     return data["choices"][0]["message"]["content"]
@@ -0,0 +1,154 @@
+import math
+from collections import Counter
+from typing import Optional
+
+from app.utils.text import tokenize
+
+# Unicode blocks from U+0900, 128 code points each, in order
+INDIC_SCRIPTS = [
+    "Devanagari", "Bengali", "Gurmukhi", "Gujarati", "Odia",
+    "Tamil", "Telugu", "Kannada", "Malayalam",
+]
+SCRIPT_LANGUAGE = {
+    "Bengali": "Bengali",
+    "Gurmukhi": "Punjabi",
+    "Gujarati": "Gujarati",
+    "Odia": "Odia",
+    "Tamil": "Tamil",
+    "Telugu": "Telugu",
+    "Kannada": "Kannada",
+    "Malayalam": "Malayalam",
+}
+
+# Frequent Marathi words that Hindi does not use
+MARATHI_MARKERS = {"आहे", "आहेत", "नाही", "आणि", "मी", "तुम्ही", "करू", "काय", "मुले", "मुलं", "शिकवत"}
+
+# Short samples of how teachers write in each Latin-script language,
+# used to build character-trigram profiles
+ENGLISH_SAMPLE = """
+the students are not listening and the class is very noisy today what should i do
+children are talking during the group activity and nobody is paying attention
+how can i explain fractions to class four students who are confused
+half of the class has finished the work and the others are still writing
+my students find place value difficult can you suggest an activity
+the back benchers do not participate when i ask questions
+i have only fifteen minutes left and the revision is not complete
+students are tired after lunch and they are not interested in the lesson
+how do i manage two grades in the same room with one teacher
+they forget the spelling of simple words every week
+please give me a quick game to start the science lesson about plants
+some children cannot read the sentences on the board
+"""
+
+HINGLISH_SAMPLE = """
+bacche class mein bahut shor kar rahe hain kya karun
+group activity mein bacche disturb kar rahe hain koi sun hi nahi raha
+fractions samjha rahi thi lekin aadhe bacche confused hain
+aaj bacchon ka dhyan padhai mein nahi lag raha hai
+mere paas sirf pandrah minute bache hain aur revision baaki hai
+peeche baithe bacche bilkul participate nahi karte
+class teen aur chaar ke bacche ek saath baithe hain kaise padhaun
+bacche lunch ke baad thak jaate hain unko kuch samajh nahi aata
+unko jodna ghatana samajh nahi aa raha kya tarika apnaun
+kuch bacche board par likha hua padh nahi paate
+paudhon wale paath ke liye koi khel batao jisse shuruat ho sake
+har hafte woh aasan shabdon ki spelling bhool jaate hain
+"""
+
+# Very common words that decide most Latin-script cases outright
+ENGLISH_WORDS = {
+    "the", "is", "are", "and", "what", "how", "not", "they", "my", "in", "to",
+    "i", "do", "of", "can", "students", "children", "class", "should", "with",
+    "have", "has", "this", "that", "during", "very", "when", "who", "me",
+}
+HINGLISH_WORDS = {
+    "hai", "hain", "nahi", "nahin", "kya", "kar", "rahe", "raha", "rahi", "mein",
+    "ko", "ka", "ki", "ke", "aur", "bacche", "bachche", "se", "par", "toh", "to",
+    "bhi", "kaise", "kyun", "koi", "kuch", "bahut", "abhi", "karun", "karein",
+    "unko", "mera", "mere", "meri", "wale", "wala", "ho", "tha", "thi", "sab",
+}
+WORD_WEIGHT = 1.5
+
+MIN_LETTERS = 3
+MIXED_SCRIPT_SHARE = 0.25  # Latin share in Devanagari text that makes it Hinglish
+
+
+def _trigrams(text: str):
+    for word in text.split():
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            yield padded[i:i + 3]
+
+
+def _profile(sample: str) -> tuple[dict, float]:
+    counts = Counter(_trigrams(sample))
+    total = sum(counts.values())
+    vocabulary = 27 ** 3
+    log_probs = {g: math.log((c + 1) / (total + vocabulary)) for g, c in counts.items()}
+    return log_probs, math.log(1 / (total + vocabulary))
+
+
+ENGLISH_PROFILE = _profile(ENGLISH_SAMPLE)
+HINGLISH_PROFILE = _profile(HINGLISH_SAMPLE)
+
+
+def _latin_language(latin_text: str) -> str:
+    """
+    English vs romanised Hindi: trigram naive Bayes plus a vote from
+    function words.
+    """
+    en_probs, en_unseen = ENGLISH_PROFILE
+    hi_probs, hi_unseen = HINGLISH_PROFILE
+
+    score = 0.0  # > 0 favours Hinglish
+    for gram in _trigrams(latin_text):
+        score += hi_probs.get(gram, hi_unseen) - en_probs.get(gram, en_unseen)
+
+    for word in latin_text.split():
+        if word in HINGLISH_WORDS:
+            score += WORD_WEIGHT
+        if word in ENGLISH_WORDS:
+            score -= WORD_WEIGHT
+
+    return "Hinglish" if score > 0 else "English"
+
+
+def detect_language(text: str) -> Optional[str]:
+    """
+    Classify a teacher utterance as Hindi, Hinglish, English or another
+    Indian language from its script mix and character trigrams.
+    Returns None when there is too little text to tell.
+    """
+    script_counts = [0] * len(INDIC_SCRIPTS)
+    latin = 0
+    latin_chars = []
+
+    for ch in text.lower():
+        cp = ord(ch)
+        if 97 <= cp <= 122:
+            latin += 1
+            latin_chars.append(ch)
+        elif 0x0900 <= cp < 0x0D80:
+            script_counts[(cp - 0x0900) >> 7] += 1
+            latin_chars.append(" ")
+        else:
+            latin_chars.append(" " if not ch.isspace() and not ch.isalpha() else ch)
+
+    indic = max(script_counts)
+    if latin + indic < MIN_LETTERS:
+        return None
+
+    if indic > latin:
+        script = INDIC_SCRIPTS[script_counts.index(indic)]
+        if script != "Devanagari":
+            return SCRIPT_LANGUAGE[script]
+        if latin / (latin + indic) >= MIXED_SCRIPT_SHARE:
+            return "Hinglish"
+        if MARATHI_MARKERS.intersection(tokenize(text)):
+            return "Marathi"
+        return "Hindi"
+
+    if indic and indic / (latin + indic) >= MIXED_SCRIPT_SHARE:
+        return "Hinglish"
+
+    return _latin_language("".join(latin_chars))
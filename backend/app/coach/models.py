@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class CoachSession(Base):
+    """
+    A multi-turn coaching conversation. `summary` is a rolling, size-capped
+    digest of every turn before the latest one, updated as turns are added.
+    """
+    __tablename__ = "coach_sessions"
+
+    id = Column(Integer, primary_key=True)
+    teacher_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    class_level = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    language = Column(String, nullable=False)  # preference; each turn's detected language wins
+
+    summary = Column(String, nullable=False, default="")
+    turns = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class CoachTurn(Base):
+    """
+    One teacher message and the coach's card texts, stored as a compact
+    JSON list [now_fix, activity, explain] (titles follow from the language).
+    """
+    __tablename__ = "coach_turns"
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(Integer, ForeignKey("coach_sessions.id", ondelete="CASCADE"), nullable=False)
+    turn = Column(Integer, nullable=False)  # 1-based
+    problem_text = Column(String, nullable=False)
+    language = Column(String, nullable=False)
+    reply = Column(String, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("session_id", "turn"),
+    )
@@ -1,5 +1,2 @@
-def normalize_text(text: str) -> str:
-    fillers = ["uh", "um", "haan", "matlab", "actually"]
-    for f in fillers:
-        text = text.replace(f, "")
-    return text.strip()
+# Kept for existing imports; the implementation lives in app/utils/text.py
+from app.utils.text import normalize_text, normalize_batch  # noqa: F401
@@ -1,16 +1,67 @@
+# Card titles and reply-language rule per detected language
+PROMPT_VARIANTS = {
+    "English": {
+        "now_title": "⚡ What to do now (30 sec)",
+        "activity_title": "🎯 Simple Activity / Hook",
+        "explain_title": "💡 Way to explain",
+        "language_rule": "simple English",
+    },
+    "Hindi": {
+        "now_title": "⚡ अभी क्या करें (30 सेकंड)",
+        "activity_title": "🎯 आसान गतिविधि",
+        "explain_title": "💡 समझाने का तरीका",
+        "language_rule": "simple Hindi in Devanagari script",
+    },
+    "Hinglish": {
+        "now_title": "⚡ अभी क्या करें (30 सेकंड)",
+        "activity_title": "🎯 Simple Activity / Hook",
+        "explain_title": "💡 Concept समझाने का तरीका",
+        "language_rule": "Hinglish (Hindi in Roman script with common English words)",
+    },
+}
+
+
+def prompt_variant(language: str) -> dict:
+    """
+    Titles and language rule for `language`. Other Indian languages get
+    English titles; an undetected preference such as "Hindi/Hinglish"
+    keeps the old instruction to follow the teacher's input language.
+    """
+    if language in PROMPT_VARIANTS:
+        return PROMPT_VARIANTS[language]
+
+    if "/" in language:
+        return {
+            **PROMPT_VARIANTS["Hinglish"],
+            "language_rule": f"{language} (unless the teacher's input is in a different language, then adapt accordingly)",
+        }
+    return {**PROMPT_VARIANTS["English"], "language_rule": f"simple {language}"}
+
+
 def build_prompt(
     class_level: str,
     subject: str,
     problem_text: str,
-    language: str = "Hindi/Hinglish"
+    language: str = "Hindi/Hinglish",
+    history: str = None,
 ) -> str:
     """
     Builds a strict 3-card teaching coach prompt for Indian government school teachers.
     Output MUST be JSON with specific 3 keys.
+    `history` is the earlier conversation of a coaching session, if any.
     """
 
-    now_title = "⚡ What to do now (30 sec)" if language == "English" else "⚡ अभी क्या करें (30 सेकंड)"
-    explain_title = "💡 Way to explain" if language == "English" else "💡 Concept समझाने का तरीका"
+    variant = prompt_variant(language)
+
+    history_block = ""
+    if history:
+        history_block = f"""
+Earlier in this coaching session:
+{history}
+
+The teacher is following up: build on the advice above, do not repeat
+what they already tried.
+"""
 
     return f"""
 SYSTEM PROMPT (GROQ)
@@ -24,7 +75,6 @@ Your role:
 Context:
 - Teacher is currently teaching
 - Low time, low cognitive load
-- Hindi / Hinglish / English mixed input allowed
 - No long explanations
 - No theory-heavy answers
 
@@ -32,8 +82,7 @@ USER PROMPT (DYNAMIC)
 Teacher Context:
 - Class: {class_level}
 - Subject: {subject}
-- Language Preference: {language}
-
+{history_block}
 Classroom Problem (spoken by teacher):
 "{problem_text}"
 
@@ -42,7 +91,7 @@ Give immediate, practical coaching in exactly 3 short parts.
 
 Rules:
     1. Keep each part under 40 words
-    2. Use {language} (unless the teacher's input is in a different language, then adapt accordingly)
+    2. Write every "text" in {variant["language_rule"]}
     3. Must be usable instantly inside a classroom
     4. No academic jargon
     5. No moralising or blaming students
@@ -50,15 +99,15 @@ Rules:
 OUTPUT FORMAT (STRICT JSON ONLY)
     {{
       "now_fix": {{
-        "title": "{now_title}",
+        "title": "{variant["now_title"]}",
         "text": ""
       }},
       "activity": {{
-        "title": "🎯 Simple Activity / Hook",
+        "title": "{variant["activity_title"]}",
         "text": ""
       }},
       "explain": {{
-        "title": "{explain_title}",
+        "title": "{variant["explain_title"]}",
         "text": ""
       }}
     }}
@@ -1,40 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 import json
+import logging
 
 from app.database import get_db
-from app.coach.schemas import CoachQueryRequest, CoachResponse
+from app.coach.models import CoachSession, CoachTurn
+from app.coach.schemas import (
+    CoachQueryRequest, CoachResponse, CoachSessionCreate, CoachSessionResponse,
+    CoachTurnRequest, CoachTurnResponse,
+)
 from app.coach.groq_client import call_groq
-from app.coach.prompt_rules import build_prompt
-from app.auth.jwt import get_current_user
+from app.coach.prompt_rules import build_prompt, prompt_variant
+from app.coach.session import fold_turn, history_context, pack_reply, unpack_reply
+from app.coach.cache import TTLCache
+from app.coach.normalizer import normalize_text
+from app.utils.text import tokenize
+from app.coach.language import detect_language
+from app.config import settings
+from app.dependencies import get_current_user
+from app.responses import validated_response
+from app.usage import QuotaExceeded
+from app.tts.service import tts_language, promise_tts, presynthesize
 
 router = APIRouter(
     prefix="/coach",
     tags=["AI Coach"]
 )
 
+logger = logging.getLogger(__name__)
 
-@router.post("/query", response_model=CoachResponse)
-def coach_query(
-    data: CoachQueryRequest,
-    db: Session = Depends(get_db),
-):
-    """
-    Core AI coaching endpoint.
-    Returns structured classroom guidance.
-    """
+REQUIRED_FIELDS = ["now_fix", "activity", "explain"]
+
+# Same class, subject, language and (normalized) problem -> same coaching cards
+coach_cache = TTLCache("coach", maxsize=settings.COACH_CACHE_SIZE, ttl=settings.COACH_CACHE_TTL_SECONDS)
 
-    # 1️⃣ Build strict prompt
-    prompt = build_prompt(
-        class_level=data.class_level,
-        subject=data.subject,
-        problem_text=data.problem_text,
-        language=data.language
-    )
 
-    # 2️⃣ Call Groq / LLM
+def _ask_coach(prompt: str) -> dict:
+    """
+    Call the LLM and return its coaching cards as a validated dict.
+    """
+    # 🤖 Call Groq / LLM
     try:
-        raw_output = call_groq(prompt)
+        raw_output = call_groq(prompt, caller="coach")
         
         # 🔧 Clean AI response safely
         start = raw_output.find("{")
@@ -43,17 +50,20 @@ def coach_query(
             raw_output = raw_output[start:end]
             
         parsed = json.loads(raw_output)
+    except QuotaExceeded:
+        raise
     except Exception as e:
-        print(f"DEBUG: Coaching AI Error: {str(e)}")
-        print(f"DEBUG: Raw AI Output: {raw_output if 'raw_output' in locals() else 'N/A'}")
+        logger.warning(
+            "Coaching AI error: %s", e,
+            extra={"raw_output": raw_output if "raw_output" in locals() else None},
+        )
         raise HTTPException(
             status_code=500,
             detail=f"AI coaching service error: {str(e)}"
         )
 
-    # 3️⃣ Validate required fields
-    required_fields = ["now_fix", "activity", "explain"]
-    for field in required_fields:
+    # ✅ Validate required fields
+    for field in REQUIRED_FIELDS:
         if field not in parsed:
             raise HTTPException(
                 status_code=500,
@@ -66,3 +76,227 @@ def coach_query(
             )
 
     return parsed
+
+
+def _coaching_cards(class_level: str, subject: str, problem_text: str, language: str, history: str = None) -> dict:
+    """
+    Coaching cards for a normalized problem. Stand-alone problems are
+    cached; follow-ups in a session depend on their history and are not.
+    """
+    cache_key = None
+    if not history:
+        cache_key = (
+            class_level.strip().casefold(),
+            subject.strip().casefold(),
+            language,
+            problem_text.casefold(),
+        )
+        parsed = coach_cache.get(cache_key)
+        if parsed is not None:
+            return parsed
+
+    prompt = build_prompt(
+        class_level=class_level,
+        subject=subject,
+        problem_text=problem_text,
+        language=language,
+        history=history,
+    )
+    parsed = _ask_coach(prompt)
+    if cache_key is not None:
+        coach_cache.set(cache_key, parsed)
+    return parsed
+
+
+def _problem_text(raw: str) -> str:
+    """
+    The spoken problem with fillers stripped; 422 if nothing else was said.
+    """
+    problem_text = normalize_text(raw)
+    if not tokenize(problem_text):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="problem_text has no content besides filler words"
+        )
+    return problem_text
+
+
+def _attach_audio(response: CoachResponse, language: str, background_tasks: BackgroundTasks):
+    """
+    Pre-synthesize card audio after the response is sent and return its URLs now.
+    """
+    voice_language = tts_language(language)
+    texts = {field: getattr(response, field).text for field in REQUIRED_FIELDS}
+    response.audio = {
+        field: promise_tts(text, language=voice_language) for field, text in texts.items()
+    }
+    background_tasks.add_task(presynthesize, list(texts.values()), language=voice_language)
+
+
+@router.post("/query", response_model=CoachResponse)
+def coach_query(
+    data: CoachQueryRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    """
+    Core AI coaching endpoint.
+    Returns structured classroom guidance.
+    """
+
+    # 1️⃣ Strip fillers from the spoken problem before prompting / caching
+    problem_text = _problem_text(data.problem_text)
+
+    # Reply in the language the teacher actually used; the preference is the fallback
+    language = detect_language(problem_text) or data.language
+
+    # 2️⃣ Reuse cards for an identical problem, otherwise ask the LLM
+    parsed = _coaching_cards(data.class_level, data.subject, problem_text, language)
+
+    response = CoachResponse(**parsed)
+
+    # 3️⃣ Optionally pre-synthesize card audio after the response is sent
+    if data.presynthesize_audio:
+        _attach_audio(response, language, background_tasks)
+
+    return validated_response(response)
+
+
+def _own_session(db: Session, session_id: int, user_id: int) -> CoachSession:
+    session = (
+        db.query(CoachSession)
+        .filter(CoachSession.id == session_id, CoachSession.teacher_id == user_id)
+        .first()
+    )
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Coaching session not found"
+        )
+    return session
+
+
+@router.post("/sessions", response_model=CoachTurnResponse)
+def start_session(
+    data: CoachSessionCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user),
+):
+    """
+    Start a coaching session with its first problem; follow-ups go to
+    /coach/sessions/{id}/turns and are answered with the session's context.
+    """
+    problem_text = _problem_text(data.problem_text)
+    language = detect_language(problem_text) or data.language
+
+    parsed = _coaching_cards(data.class_level, data.subject, problem_text, language)
+
+    session = CoachSession(
+        teacher_id=user_id,
+        class_level=data.class_level,
+        subject=data.subject,
+        language=data.language,
+        summary="",
+        turns=1,
+    )
+    db.add(session)
+    db.flush()
+    db.add(CoachTurn(session_id=session.id, turn=1, problem_text=problem_text, language=language, reply=pack_reply(parsed)))
+    db.commit()
+
+    response = CoachTurnResponse(**parsed, session_id=session.id, turn=1)
+    if data.presynthesize_audio:
+        _attach_audio(response, language, background_tasks)
+    return validated_response(response)
+
+
+@router.post("/sessions/{session_id}/turns", response_model=CoachTurnResponse)
+def add_turn(
+    session_id: int,
+    data: CoachTurnRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user),
+):
+    """
+    Follow-up in a coaching session ("that didn't work, what else?").
+    The LLM gets the session's rolling summary plus the last turn, so the
+    prompt stays within a fixed budget however long the session gets.
+    """
+    session = _own_session(db, session_id, user_id)
+    turn = session.turns
+    last = db.query(CoachTurn).filter(CoachTurn.session_id == session_id, CoachTurn.turn == turn).one()
+    last_reply = unpack_reply(last.reply)
+
+    # 1️⃣ Ask with the summary of turns before the last one, plus the last turn
+    problem_text = _problem_text(data.problem_text)
+    language = detect_language(problem_text) or session.language
+    parsed = _coaching_cards(
+        session.class_level, session.subject, problem_text, language,
+        history=history_context(session.summary, last.problem_text, last_reply),
+    )
+
+    # 2️⃣ Fold the last turn into the summary; it is the only part rewritten
+    summary = fold_turn(
+        session.summary, turn, last.problem_text, last_reply,
+        budget=settings.COACH_SESSION_SUMMARY_TOKENS,
+    )
+
+    # 3️⃣ Save, unless a concurrent follow-up has already moved the session on
+    updated = (
+        db.query(CoachSession)
+        .filter(CoachSession.id == session_id, CoachSession.turns == turn)
+        .update({"turns": turn + 1, "summary": summary}, synchronize_session=False)
+    )
+    if not updated:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Session changed while answering; resend the message"
+        )
+    db.add(CoachTurn(session_id=session_id, turn=turn + 1, problem_text=problem_text, language=language, reply=pack_reply(parsed)))
+    db.commit()
+
+    response = CoachTurnResponse(**parsed, session_id=session_id, turn=turn + 1)
+    if data.presynthesize_audio:
+        _attach_audio(response, language, background_tasks)
+    return validated_response(response)
+
+
+@router.get("/sessions/{session_id}", response_model=CoachSessionResponse)
+def get_session(
+    session_id: int,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user),
+):
+    session = _own_session(db, session_id, user_id)
+    turns = (
+        db.query(CoachTurn)
+        .filter(CoachTurn.session_id == session_id)
+        .order_by(CoachTurn.turn)
+        .all()
+    )
+
+    items = []
+    for t in turns:
+        variant = prompt_variant(t.language)
+        reply = unpack_reply(t.reply)
+        items.append({
+            "turn": t.turn,
+            "problem_text": t.problem_text,
+            "created_at": t.created_at,
+            **{
+                field: {"title": variant[f"{title}_title"], "text": reply[field]}
+                for field, title in (("now_fix", "now"), ("activity", "activity"), ("explain", "explain"))
+            },
+        })
+
+    return {
+        "id": session.id,
+        "class_level": session.class_level,
+        "subject": session.subject,
+        "language": session.language,
+        "summary": session.summary,
+        "turns": items,
+    }
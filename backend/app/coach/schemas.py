@@ -1,4 +1,6 @@
 from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Dict, List, Optional
 
 
 class CoachQueryRequest(BaseModel):
@@ -9,6 +11,10 @@ class CoachQueryRequest(BaseModel):
         example="Group activity mein bacche disturb kar rahe hain"
     )
     language: str = Field(default="Hindi/Hinglish", example="Hinglish")
+    presynthesize_audio: bool = Field(
+        default=False,
+        description="Synthesize the card texts in the background and return their audio URLs",
+    )
 
 
 class CoachingCard(BaseModel):
@@ -20,3 +26,38 @@ class CoachResponse(BaseModel):
     now_fix: CoachingCard
     activity: CoachingCard
     explain: CoachingCard
+    audio: Optional[Dict[str, str]] = None  # card name -> /tts/audio URL
+
+
+class CoachSessionCreate(CoachQueryRequest):
+    """
+    Start a coaching session with its first problem.
+    """
+
+
+class CoachTurnRequest(BaseModel):
+    problem_text: str = Field(..., example="Woh kaam nahi kiya, aur kya kar sakti hoon?")
+    presynthesize_audio: bool = False
+
+
+class CoachTurnResponse(CoachResponse):
+    session_id: int
+    turn: int
+
+
+class CoachSessionTurn(BaseModel):
+    turn: int
+    problem_text: str
+    now_fix: CoachingCard
+    activity: CoachingCard
+    explain: CoachingCard
+    created_at: Optional[datetime] = None
+
+
+class CoachSessionResponse(BaseModel):
+    id: int
+    class_level: str
+    subject: str
+    language: str
+    summary: str
+    turns: List[CoachSessionTurn]
@@ -0,0 +1,93 @@
+import json
+import re
+from typing import Optional
+
+# Clip lengths (characters) of a turn in the rolling summary: full lines
+# keep the problem and the first card, older lines only the problem
+PROBLEM_CLIP = 140
+ADVICE_CLIP = 110
+SHORT_CLIP = 60
+
+ADVICE_SEP = " → coach: "
+OMITTED_RE = re.compile(r"^\(\+(\d+) earlier turns\)$")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough LLM token count: ~4 Latin characters per token, and ~1.5 for
+    Devanagari and other scripts, which tokenizers split much finer.
+    """
+    ascii_chars = sum(ch.isascii() for ch in text)
+    return round(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5)
+
+
+def clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def pack_reply(cards: dict) -> str:
+    return json.dumps([cards[f]["text"] for f in ("now_fix", "activity", "explain")], ensure_ascii=False)
+
+
+def unpack_reply(reply: str) -> dict:
+    return dict(zip(("now_fix", "activity", "explain"), json.loads(reply)))
+
+
+def _shorten(line: str) -> str:
+    head, _, _ = line.partition(ADVICE_SEP)
+    label, _, problem = head.partition(": ")
+    return f"{label}: {clip(problem, SHORT_CLIP)}"
+
+
+def fold_turn(summary: str, turn: int, problem_text: str, reply: dict, budget: int) -> str:
+    """
+    Add one turn to the rolling summary and shrink it back under `budget`
+    estimated tokens. Only the summary itself is rewritten, never the full
+    history: older lines are cut down to the teacher's problem, then
+    replaced by an "(+N earlier turns)" count. The first turn, which
+    usually sets out the situation, is kept as long as possible.
+    """
+    lines = summary.splitlines() if summary else []
+    lines.append(f"T{turn}: {clip(problem_text, PROBLEM_CLIP)}{ADVICE_SEP}{clip(reply['now_fix'], ADVICE_CLIP)}")
+
+    def over() -> bool:
+        return estimate_tokens("\n".join(lines)) > budget
+
+    # 1️⃣ Shorten the oldest detailed lines after the first, then the first
+    for i in [*range(1, len(lines) - 1), 0]:
+        if not over():
+            return "\n".join(lines)
+        if ADVICE_SEP in lines[i]:
+            lines[i] = _shorten(lines[i])
+
+    # 2️⃣ Drop the oldest lines after the first into the omitted-turns count
+    omitted = 0
+    if len(lines) > 1 and (match := OMITTED_RE.match(lines[1])):
+        omitted = int(match.group(1))
+    else:
+        lines.insert(1, "")
+    while over() and len(lines) > 3:
+        del lines[2]
+        omitted += 1
+        lines[1] = f"(+{omitted} earlier turns)"
+    if not omitted:
+        del lines[1]
+
+    return "\n".join(lines)
+
+
+def history_context(summary: str, last_problem: Optional[str], last_reply: Optional[dict]) -> str:
+    """
+    What the LLM sees of the session: the rolling summary plus the latest
+    turn in full.
+    """
+    parts = []
+    if summary:
+        parts.append(f"Summary of earlier turns:\n{summary}")
+    if last_problem is not None:
+        parts.append(
+            f"Last turn:\nTeacher: \"{last_problem}\"\n"
+            f"Coach: {last_reply['now_fix']} / {last_reply['activity']} / {last_reply['explain']}"
+        )
+    return "\n\n".join(parts)
@@ -11,6 +11,102 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
 
     GROQ_API_KEY: str
+    GROQ_URL: str = "https://api.groq.com/openai/v1/chat/completions"
+
+    # Background jobs (AI feedback etc.)
+    JOB_WORKERS: int = 4
+    JOB_MAX_ATTEMPTS: int = 5
+
+    # Responses smaller than this are sent uncompressed
+    COMPRESSION_MIN_SIZE: int = 500
+
+    # Text-to-speech: "espeak" (needs espeak-ng installed) or "tone" (offline test engine)
+    TTS_ENGINE: str = "espeak"
+    TTS_CACHE_DIR: str = "./tts_cache"
+    TTS_CACHE_MAX_MB: int = 500  # least recently used audio is evicted beyond this
+
+    # In-memory cache of coaching cards per normalized problem
+    COACH_CACHE_SIZE: int = 512
+    COACH_CACHE_TTL_SECONDS: int = 3600
+
+    # LLM generation profiles: max_tokens per feature follows the p99 of
+    # its last GENERATION_WINDOW completion lengths times the margin, once
+    # GENERATION_MIN_SAMPLES completions have been seen
+    GENERATION_WINDOW: int = 500
+    GENERATION_MIN_SAMPLES: int = 20
+    GENERATION_MAX_TOKENS_MARGIN: float = 1.25
+
+    # Peer reactions: counters are written in batches every
+    # PEER_REACTIONS_FLUSH_SECONDS; a reaction's weight in the ranked feed
+    # halves every PEER_RANKING_HALF_LIFE_HOURS
+    PEER_REACTIONS_FLUSH_SECONDS: float = 5.0
+    PEER_RANKING_HALF_LIFE_HOURS: float = 72.0
+
+    # Term plans: lesson plans generated at once per worker, LLM calls per
+    # minute across them (0 = unlimited) and attempts per lesson
+    TERM_PLAN_CONCURRENCY: int = 4
+    TERM_PLAN_CALLS_PER_MINUTE: int = 30
+    TERM_PLAN_LESSON_ATTEMPTS: int = 2
+    TERM_PLAN_MAX_TOPICS: int = 60
+
+    # Coaching sessions: estimated token budget of the rolling summary of
+    # earlier turns sent with each follow-up
+    COACH_SESSION_SUMMARY_TOKENS: int = 250
+
+    # Shared directory for per-worker metric files when running several
+    # worker processes; empty = each worker reports only itself
+    METRICS_DIR: str = ""
+    METRICS_EXPORT_SECONDS: float = 5.0
+
+    # Shared secret for admin-only endpoints and headers (X-Admin-Token);
+    # empty disables them
+    ADMIN_TOKEN: str = ""
+
+    # Request profiling: share of requests profiled at random (0 = only on
+    # an admin's X-Profile header), sampling interval and stored flamegraphs
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL_MS: int = 5
+    PROFILE_DIR: str = "./profiles"
+    PROFILE_KEEP: int = 200
+
+    # Logging: JSON lines written by a background thread
+    LOG_LEVEL: str = "INFO"
+    LOG_DEBUG_SAMPLE_RATE: float = 0.1  # share of DEBUG records kept
+    LOG_MAX_FIELD_CHARS: int = 1000
+    LOG_QUEUE_SIZE: int = 10000
+
+    # Admission control: max concurrent requests per route class (adapted
+    # down when responses get slower than the target), and how many may
+    # wait, for how long, before being shed with 503
+    ADMISSION_LLM_LIMIT: int = 16
+    ADMISSION_LLM_TARGET_SECONDS: float = 10.0
+    ADMISSION_DB_LIMIT: int = 32
+    ADMISSION_DB_TARGET_SECONDS: float = 1.0
+    ADMISSION_STATIC_LIMIT: int = 64
+    ADMISSION_STATIC_TARGET_SECONDS: float = 0.25
+    ADMISSION_QUEUE_SIZE: int = 50
+    ADMISSION_MAX_WAIT_SECONDS: float = 2.0
+
+    # LLM usage per teacher: counters are written to the DB in batches
+    # every USAGE_FLUSH_SECONDS; daily quotas (0 = unlimited), with all
+    # unauthenticated routes sharing one anonymous call quota
+    USAGE_FLUSH_SECONDS: float = 10.0
+    USAGE_DAILY_CALL_QUOTA: int = 300
+    USAGE_DAILY_TOKEN_QUOTA: int = 300000
+    USAGE_ANONYMOUS_DAILY_CALL_QUOTA: int = 0
+
+    # Group commit: buffer inserts of reflections, peer posts and new users
+    # for up to GROUP_COMMIT_WINDOW_MS and commit them in one transaction
+    # (off = one commit per request)
+    GROUP_COMMIT_ENABLED: bool = False
+    GROUP_COMMIT_WINDOW_MS: float = 5.0
+    GROUP_COMMIT_MAX_BATCH: int = 100
+
+    # Lesson bundle: seconds each component may take before it is
+    # reported as timed out (the others are still sent)
+    LESSON_PLAN_DEADLINE_SECONDS: float = 25.0
+    LESSON_ACTIVITY_DEADLINE_SECONDS: float = 20.0
+    LESSON_VIDEOS_DEADLINE_SECONDS: float = 15.0
 
     class Config:
         env_file = ".env"
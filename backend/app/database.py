@@ -1,5 +1,8 @@
-from sqlalchemy import create_engine
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker, declarative_base
+from pathlib import Path
 import os
 
 # Local SQLite DB (NO Docker, NO Postgres)
@@ -15,6 +18,24 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+ORIGINAL_REVISION = "0001"  # the schema create_all made before migrations existed
+
+
+def migrate(engine):
+    """
+    Upgrade the existing tables to the latest alembic revision; run before
+    create_all, which only adds the tables that are still missing.
+    """
+    config = Config(str(ALEMBIC_INI))
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        tables = inspect(conn).get_table_names()
+        if "users" in tables and "alembic_version" not in tables:
+            command.stamp(config, ORIGINAL_REVISION)
+        command.upgrade(config, "head")
+
+
 # ✅ THIS IS THE MISSING FUNCTION
 def get_db():
     db = SessionLocal()
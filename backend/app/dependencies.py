@@ -1,10 +1,13 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from jose import jwt
 
 from app.database import SessionLocal
 from app.config import settings
+from app.usage import attribute_user
 
 security = HTTPBearer()
 
@@ -26,9 +29,23 @@ def get_current_user(
             settings.JWT_SECRET,
             algorithms=[settings.JWT_ALGORITHM],
         )
-        return payload["user_id"]
+        user_id = payload["user_id"]
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
+    attribute_user(user_id)
+    return user_id
+
+
+def is_admin_token(token: str) -> bool:
+    return bool(settings.ADMIN_TOKEN) and hmac.compare_digest(token, settings.ADMIN_TOKEN)
+
+
+def require_admin(x_admin_token: str = Header(default="")):
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token required",
+        )
@@ -0,0 +1,162 @@
+# app/group_commit.py
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, TypeVar
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class GroupCommitter:
+    """
+    Batches small write transactions from concurrent requests into one
+    commit, so a burst of inserts pays for one fsync instead of one each.
+
+    Writes are functions `fn(db)` run on a single writer thread. The first
+    write of a batch waits up to `window` seconds (or until `max_batch`
+    writes are queued) for others to join it. Each write runs in its own
+    SAVEPOINT, so one failing write is rolled back alone and raises to its
+    caller, then the batch is committed once. submit() returns only after
+    that commit, so its result is durable. If the batch commit itself
+    fails, each write is retried in a transaction of its own.
+    """
+
+    def __init__(self, session_factory, window: float, max_batch: int):
+        self._session_factory = session_factory
+        self._window = window
+        self._max_batch = max_batch
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.batches = 0
+        self.writes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def submit(self, fn: Callable[[Session], T]) -> T:
+        """
+        Run `fn(db)` in the next batch and return its result once committed.
+        The result must not need the session after commit (return ids or
+        loaded objects, not lazy relationships).
+        """
+        future = Future()
+        self._queue.put((fn, future))
+        return future.result()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="group-commit", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Commit whatever is queued, then stop the writer thread.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _loop(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=0.2)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self._window
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._commit_batch(batch)
+            except Exception as e:
+                # Never leave a caller waiting, whatever went wrong
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _commit_batch(self, batch: list):
+        db = self._session_factory(expire_on_commit=False)
+        done = []
+        try:
+            for fn, future in batch:
+                try:
+                    with db.begin_nested():
+                        result = fn(db)
+                except Exception as e:
+                    future.set_exception(e)
+                else:
+                    done.append((fn, future, result))
+
+            try:
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.warning("Group commit of %d writes failed, retrying one by one: %s", len(done), e)
+                for fn, future, _ in done:
+                    self._commit_one(fn, future)
+                return
+        finally:
+            db.close()
+
+        self.batches += 1
+        self.writes += len(done)
+        for _, future, result in done:
+            future.set_result(result)
+
+    def _commit_one(self, fn, future: Future):
+        db = self._session_factory(expire_on_commit=False)
+        try:
+            result = fn(db)
+            db.commit()
+            future.set_result(result)
+        except Exception as e:
+            db.rollback()
+            future.set_exception(e)
+        finally:
+            db.close()
+
+
+group_committer = GroupCommitter(
+    SessionLocal,
+    window=settings.GROUP_COMMIT_WINDOW_MS / 1000,
+    max_batch=settings.GROUP_COMMIT_MAX_BATCH,
+)
+
+
+def commit_write(db: Session, fn: Callable[[Session], T]) -> T:
+    """
+    Run the write `fn(db)` and commit it: batched with other requests'
+    writes when group commit is running, otherwise in `db` right away.
+    """
+    if group_committer.running:
+        return group_committer.submit(fn)
+    result = fn(db)
+    db.commit()
+    return result
@@ -0,0 +1,219 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """
+    In-process background job queue persisted in the `jobs` table.
+
+    Jobs are claimed with a conditional UPDATE and a lease, so several app
+    workers can share the table, and jobs left `running` by a crashed or
+    restarted process are picked up again once their lease expires. While a
+    handler runs, a heartbeat renews its lease every third of the lease, so
+    long jobs are never claimed a second time by a live process.
+    Failed jobs are retried with exponential backoff up to `max_attempts`.
+    """
+
+    def __init__(self, session_factory, workers: int, poll_interval: float = 1.0,
+                 lease_seconds: int = 120, retry_base_seconds: int = 5):
+        self._session_factory = session_factory
+        self._workers = workers
+        self._poll_interval = poll_interval
+        self._lease = timedelta(seconds=lease_seconds)
+        self._retry_base_seconds = retry_base_seconds
+
+        self._handlers = {}
+        self._slots = threading.Semaphore(workers)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._executor = None
+        self._thread = None
+
+        self._running = set()  # ids of jobs this process is running
+        self._running_lock = threading.Lock()
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat = None
+
+    def handler(self, kind: str):
+        """
+        Register `fn(db, payload)` as the handler for jobs of `kind`.
+        The handler's writes are committed together with the job's completion.
+        """
+        def decorator(fn):
+            self._handlers[kind] = fn
+            return fn
+        return decorator
+
+    def enqueue(self, db: Session, kind: str, payload: dict, max_attempts: int = None) -> Job:
+        """
+        Add a job inside the caller's transaction; call wake() after commit.
+        """
+        job = Job(
+            kind=kind,
+            payload=payload,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        )
+        db.add(job)
+        db.flush()
+        return job
+
+    def wake(self):
+        self._wake.set()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="job")
+        self._thread = threading.Thread(target=self._loop, name="job-poller", daemon=True)
+        self._thread.start()
+        self._heartbeat_stop.clear()
+        self._heartbeat = threading.Thread(target=self._renew_leases, name="job-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+        self._heartbeat_stop.set()  # only once running jobs have finished
+        self._heartbeat.join()
+        self._thread = None
+        self._executor = None
+        self._heartbeat = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                claimed = self._claim()
+            except Exception as e:
+                logger.exception("Job queue poll failed")
+                claimed = 0
+
+            if not claimed:
+                self._wake.wait(self._poll_interval)
+                self._wake.clear()
+
+    def _claim(self) -> int:
+        """
+        Claim as many runnable jobs as there are free worker slots.
+        """
+        free = 0
+        while free < self._workers and self._slots.acquire(blocking=False):
+            free += 1
+        if not free:
+            # Every slot is busy; a finishing job wakes the poller
+            return 0
+
+        claimed = 0
+        db = self._session_factory()
+        try:
+            now = datetime.utcnow()
+            runnable = or_(
+                and_(Job.status == "pending", Job.run_after <= now),
+                and_(Job.status == "running", Job.locked_until < now),
+            )
+            candidates = (
+                db.query(Job.id)
+                .filter(runnable)
+                .order_by(Job.run_after, Job.id)
+                .limit(free)
+                .all()
+            )
+
+            for (job_id,) in candidates:
+                updated = (
+                    db.query(Job)
+                    .filter(Job.id == job_id, runnable)
+                    .update(
+                        {
+                            Job.status: "running",
+                            Job.locked_until: now + self._lease,
+                            Job.attempts: Job.attempts + 1,
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                db.commit()
+                if updated:
+                    claimed += 1
+                    self._executor.submit(self._run, job_id)
+        finally:
+            db.close()
+            for _ in range(free - claimed):
+                self._slots.release()
+
+        return claimed
+
+    def _renew_leases(self):
+        while not self._heartbeat_stop.wait(self._lease.total_seconds() / 3):
+            with self._running_lock:
+                running = list(self._running)
+            if not running:
+                continue
+
+            db = self._session_factory()
+            try:
+                db.query(Job).filter(Job.id.in_(running), Job.status == "running").update(
+                    {Job.locked_until: datetime.utcnow() + self._lease},
+                    synchronize_session=False,
+                )
+                db.commit()
+            except Exception:
+                logger.exception("Job lease renewal failed")
+            finally:
+                db.close()
+
+    def _run(self, job_id: int):
+        with self._running_lock:
+            self._running.add(job_id)
+        db = self._session_factory()
+        try:
+            job = db.get(Job, job_id)
+            handler = self._handlers.get(job.kind)
+            try:
+                if handler is None:
+                    raise LookupError(f"No handler registered for job kind '{job.kind}'")
+                handler(db, job.payload)
+                job.status = "done"
+                job.locked_until = None
+                job.last_error = None
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                job = db.get(Job, job_id)
+                logger.warning(
+                    "Job %s (%s) attempt %s failed: %s", job_id, job.kind, job.attempts, e,
+                    extra={"job_id": job_id, "job_kind": job.kind},
+                )
+                job.last_error = str(e)[:500]
+                job.locked_until = None
+                if job.attempts >= job.max_attempts:
+                    job.status = "failed"
+                else:
+                    job.status = "pending"
+                    delay = self._retry_base_seconds * 2 ** (job.attempts - 1)
+                    job.run_after = datetime.utcnow() + timedelta(seconds=delay)
+                db.commit()
+        finally:
+            db.close()
+            with self._running_lock:
+                self._running.discard(job_id)
+            self._slots.release()
+            self._wake.set()
+
+
+job_queue = JobQueue(SessionLocal, workers=settings.JOB_WORKERS)
@@ -0,0 +1,116 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import copy_context
+import logging
+import time
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from app.activities.router import build_activity
+from app.activities.schemas import ActivityRequest
+from app.config import settings
+from app.dependencies import get_current_user
+from app.lesson.schemas import LessonBundleRequest, LessonBundlePart
+from app.planner.router import generate_plan
+from app.resources.router import suggest_videos
+from app.resources.schemas import VideoSuggestionRequest
+from app.usage import usage
+
+router = APIRouter(prefix="/lesson", tags=["Lesson"])
+
+logger = logging.getLogger(__name__)
+
+
+def _plan(data: LessonBundleRequest) -> dict:
+    plan = generate_plan(data.grade, data.subject, data.time_available, topic=data.topic)
+    return plan.model_dump(mode="json")
+
+
+def _activity(data: LessonBundleRequest) -> dict:
+    return build_activity(ActivityRequest(
+        class_size=data.class_size,
+        learning_levels=data.learning_levels,
+        time_left=data.time_available,
+        materials_available=data.materials_available,
+        topic=data.topic,
+    ))
+
+
+def _videos(data: LessonBundleRequest) -> dict:
+    videos = suggest_videos(VideoSuggestionRequest(
+        grade=data.grade,
+        subject=data.subject,
+        topic=data.topic,
+        time_available=data.time_available,
+    ))
+    return videos.model_dump(mode="json")
+
+
+# component -> (generator, seconds it may take before it is reported as timed out)
+COMPONENTS = {
+    "plan": (_plan, settings.LESSON_PLAN_DEADLINE_SECONDS),
+    "activity": (_activity, settings.LESSON_ACTIVITY_DEADLINE_SECONDS),
+    "videos": (_videos, settings.LESSON_VIDEOS_DEADLINE_SECONDS),
+}
+
+
+def _line(component: str, status: str, started: float, data: dict = None, error: str = None) -> str:
+    part = LessonBundlePart(
+        component=component,
+        status=status,
+        elapsed_ms=round((time.monotonic() - started) * 1000),
+        data=data,
+        error=error,
+    )
+    return part.model_dump_json(exclude_none=True) + "\n"
+
+
+def _bundle(data: LessonBundleRequest):
+    started = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=len(COMPONENTS), thread_name_prefix="lesson")
+    try:
+        # Each component runs in a copy of the request context (request id, profiling)
+        futures = {
+            pool.submit(copy_context().run, generate, data): name
+            for name, (generate, _) in COMPONENTS.items()
+        }
+        deadlines = {name: started + deadline for name, (_, deadline) in COMPONENTS.items()}
+        pending = set(futures)
+
+        while pending:
+            next_deadline = min(deadlines[futures[f]] for f in pending)
+            done, _ = wait(pending, timeout=max(0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+
+            # 1️⃣ Send every component that finished, in completion order
+            for future in done:
+                pending.discard(future)
+                name = futures[future]
+                try:
+                    yield _line(name, "ok", started, data=future.result())
+                except Exception as e:
+                    logger.warning("Lesson bundle %s failed: %s", name, e)
+                    yield _line(name, "error", started, error=str(e))
+
+            # 2️⃣ Give up on components past their deadline; the rest keep going
+            now = time.monotonic()
+            for future in [f for f in pending if deadlines[futures[f]] <= now]:
+                pending.discard(future)
+                logger.warning("Lesson bundle %s timed out", futures[future])
+                yield _line(futures[future], "timeout", started, error="Timed out")
+    finally:
+        # Don't hold the response open for calls that already missed their deadline
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+@router.post("/bundle")
+def generate_lesson_bundle(
+    data: LessonBundleRequest,
+    user_id: int = Depends(get_current_user),
+):
+    """
+    Lesson plan, classroom activity and video suggestions for one lesson,
+    generated concurrently and streamed as NDJSON, one line per component
+    as soon as it is ready (or has failed / missed its deadline).
+    """
+    # Refuse the whole bundle up front rather than streaming three quota errors
+    usage.check_quota(user_id)
+    return StreamingResponse(_bundle(data), media_type="application/x-ndjson")
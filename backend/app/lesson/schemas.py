@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
+
+
+class LessonBundleRequest(BaseModel):
+    grade: int = Field(..., ge=1, le=12)
+    subject: str = Field(..., min_length=1)
+    topic: str = Field(..., min_length=1)
+    time_available: int = Field(40, ge=5, le=180)
+    class_size: int = Field(..., ge=1)
+    materials_available: List[str] = []
+    learning_levels: List[str] = ["mixed"]
+
+    @field_validator("subject", "topic")
+    @classmethod
+    def collapse_spaces(cls, value: str) -> str:
+        return " ".join(value.split())
+
+    @field_validator("materials_available", "learning_levels")
+    @classmethod
+    def dedupe(cls, values: List[str]) -> List[str]:
+        # Trimmed, without blanks or case-insensitive repeats, in the given order
+        seen = {}
+        for value in values:
+            value = " ".join(value.split())
+            if value and value.lower() not in seen:
+                seen[value.lower()] = value
+        return list(seen.values())
+
+
+class LessonBundlePart(BaseModel):
+    component: str  # plan | activity | videos
+    status: str  # ok | error | timeout
+    elapsed_ms: int
+    data: Optional[dict] = None
+    error: Optional[str] = None
@@ -1,8 +1,19 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from app.config import settings
-from app.database import Base, engine
+from app.database import Base, engine, migrate
 from app.middleware import setup_middleware
+from app.responses import FastJSONResponse
+from app.peer.search import backfill_search_index
+from app.peer.similarity import load_similarity_index
+from app.peer.reactions import backfill_scores, reaction_counter
+from app.sync.changes import backfill_change_seqs
+from app.jobs.queue import job_queue
+from app.group_commit import group_committer
+from app.metrics import exporter, instrument_engine
+from app.usage import usage
+from app.utils.logger import setup_logging
 
 from app.auth.router import router as auth_router
 from app.profile.router import router as profile_router
@@ -14,13 +25,45 @@ from app.peer.router import router as peer_router
 from app.reflection.router import router as reflection_router
 from app.parent_bridge.router import router as parent_router
 from app.system.router import router as system_router
+from app.tts.router import router as tts_router
+from app.sync.router import router as sync_router
+from app.lesson.router import router as lesson_router
 
 
-app = FastAPI(title=settings.PROJECT_NAME)
+setup_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    job_queue.start()
+    exporter.start(settings.METRICS_DIR, settings.METRICS_EXPORT_SECONDS)
+    usage.start(settings.USAGE_FLUSH_SECONDS)
+    reaction_counter.start(settings.PEER_REACTIONS_FLUSH_SECONDS)
+    if settings.GROUP_COMMIT_ENABLED:
+        group_committer.start()
+    yield
+    group_committer.stop()
+    job_queue.stop()
+    exporter.stop()
+    usage.stop()
+    reaction_counter.stop()
+
+
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
 setup_middleware(app)
+instrument_engine(engine)
 
+migrate(engine)
 Base.metadata.create_all(bind=engine)
+backfill_search_index(engine)
+backfill_scores(engine)
+backfill_change_seqs(engine)
+load_similarity_index(engine)
 
 app.include_router(auth_router, prefix=settings.API_V1_PREFIX)
 app.include_router(profile_router, prefix=settings.API_V1_PREFIX)
@@ -32,6 +75,9 @@ app.include_router(peer_router, prefix=settings.API_V1_PREFIX)
 app.include_router(reflection_router, prefix=settings.API_V1_PREFIX)
 app.include_router(parent_router, prefix=settings.API_V1_PREFIX)
 app.include_router(system_router, prefix=settings.API_V1_PREFIX)
+app.include_router(tts_router, prefix=settings.API_V1_PREFIX)
+app.include_router(sync_router, prefix=settings.API_V1_PREFIX)
+app.include_router(lesson_router, prefix=settings.API_V1_PREFIX)
 
 # Direct aliases for requested routes (exactly as requested)
 app.include_router(planner_router, prefix="/api")
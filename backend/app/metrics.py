@@ -0,0 +1,293 @@
+# app/metrics.py
+
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from sqlalchemy import event
+
+from app.profiling import add_stage_time
+
+# Every thread writes only to its own dict of values, so recording a metric
+# takes no lock; a scrape merges the shards. Shards of finished threads are
+# folded into _retired so short-lived worker threads don't pile up.
+_local = threading.local()
+_shards = []  # (thread, values)
+_retired = {}
+_shards_lock = threading.Lock()
+
+REGISTRY = {}
+
+
+def _shard() -> dict:
+    try:
+        return _local.values
+    except AttributeError:
+        values = _local.values = {}
+        with _shards_lock:
+            _shards.append((threading.current_thread(), values))
+        return values
+
+
+def _merge_into(total: dict, values: dict):
+    for key, cell in values.items():
+        current = total.get(key)
+        if current is None:
+            total[key] = list(cell)
+        else:
+            for i, v in enumerate(cell):
+                current[i] += v
+
+
+def _local_snapshot() -> dict:
+    total = {}
+    with _shards_lock:
+        live = []
+        for thread, values in _shards:
+            if thread.is_alive():
+                live.append((thread, values))
+            else:
+                _merge_into(_retired, values)
+        _shards[:] = live
+        _merge_into(total, _retired)
+        for _, values in live:
+            _merge_into(total, dict(values))
+    return total
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        REGISTRY[name] = self
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = (self.name, tuple(str(labels[n]) for n in self.labelnames))
+        values = _shard()
+        cell = values.get(key)
+        if cell is None:
+            cell = values[key] = [0.0]
+        cell[0] += amount
+
+    def samples(self, labels: tuple, cell: list):
+        yield self.name, labels, cell[0]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        REGISTRY[name] = self
+
+    def observe(self, value: float, **labels):
+        key = (self.name, tuple(str(labels[n]) for n in self.labelnames))
+        values = _shard()
+        cell = values.get(key)
+        if cell is None:
+            # one slot per bucket, one for +Inf, then the sum
+            cell = values[key] = [0.0] * (len(self.buckets) + 2)
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def samples(self, labels: tuple, cell: list):
+        cumulative = 0.0
+        for bound, count in zip(self.buckets, cell):
+            cumulative += count
+            yield self.name + "_bucket", labels + (("le", _format_value(bound)),), cumulative
+        cumulative += cell[len(self.buckets)]
+        yield self.name + "_bucket", labels + (("le", "+Inf"),), cumulative
+        yield self.name + "_sum", labels, cell[-1]
+        yield self.name + "_count", labels, cumulative
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LLM_LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time to serve a request, by route template.",
+    ("method", "route", "status"), LATENCY_BUCKETS,
+)
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds", "Groq chat completion latency, by calling router.",
+    ("caller", "outcome"), LLM_LATENCY_BUCKETS,
+)
+LLM_TOKENS = Histogram(
+    "llm_tokens", "Prompt and completion tokens per LLM call.",
+    ("caller", "kind"), TOKEN_BUCKETS,
+)
+LLM_ERRORS = Counter(
+    "llm_errors_total", "Failed LLM calls, by calling router and reason.",
+    ("caller", "reason"),
+)
+LLM_TRUNCATIONS = Counter(
+    "llm_truncations_total", "LLM completions cut off by max_tokens, by generation profile.",
+    ("caller",),
+)
+DB_LATENCY = Histogram(
+    "db_query_duration_seconds", "SQL statement execution time, by statement type.",
+    ("operation",), DB_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups, by cache and result (hit/miss).",
+    ("cache", "result"),
+)
+ADMISSION_SHED = Counter(
+    "admission_shed_total", "Requests rejected with 503 by admission control, by route class.",
+    ("route_class",),
+)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def instrument_engine(engine):
+    """
+    Time every statement run on `engine` into db_query_duration_seconds.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        DB_LATENCY.observe(elapsed, operation=operation)
+        add_stage_time("db", elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        starts = context.connection.info.get("query_start") if context.connection else None
+        if starts:
+            starts.pop()
+
+
+# --- Multiple workers ---------------------------------------------------
+# With METRICS_DIR set, each worker process writes its totals there every
+# `interval` seconds and a scrape of any worker sums all the files, so the
+# numbers don't depend on which worker answered.
+
+class _Exporter:
+    def __init__(self):
+        self.directory = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _path(self) -> Path:
+        return self.directory / f"metrics-{os.getpid()}.json"
+
+    def write(self, snapshot: dict):
+        rows = [[name, list(labels), cell] for (name, labels), cell in snapshot.items()]
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, "w") as f:
+            json.dump(rows, f)
+        os.replace(tmp, self._path())
+
+    def read_others(self) -> dict:
+        total = {}
+        own = self._path()
+        for path in self.directory.glob("metrics-*.json"):
+            if path == own:
+                continue
+            try:
+                rows = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            _merge_into(total, {(name, tuple(labels)): cell for name, labels, cell in rows})
+        return total
+
+    def start(self, directory: str, interval: float):
+        if not directory or self._thread is not None:
+            return
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(interval,), name="metrics-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.write(_local_snapshot())
+
+    def _loop(self, interval: float):
+        while not self._stop.wait(interval):
+            self.write(_local_snapshot())
+
+
+exporter = _Exporter()
+
+
+def snapshot() -> dict:
+    """
+    (metric name, label values) -> values, summed over threads and, when
+    METRICS_DIR is set, over every worker process.
+    """
+    total = _local_snapshot()
+    if exporter.directory is not None:
+        exporter.write(total)
+        _merge_into(total, exporter.read_others())
+    return total
+
+
+# --- Prometheus text format ---------------------------------------------
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _line(name: str, labels: tuple, value: float) -> str:
+    if labels:
+        rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+        return f"{name}{{{rendered}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+def render() -> str:
+    by_metric = {}
+    for (name, label_values), cell in snapshot().items():
+        by_metric.setdefault(name, []).append((label_values, cell))
+
+    lines = []
+    for name, metric in REGISTRY.items():
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        for label_values, cell in sorted(by_metric.get(name, [])):
+            labels = tuple(zip(metric.labelnames, label_values))
+            for sample_name, sample_labels, value in metric.samples(labels, cell):
+                lines.append(_line(sample_name, sample_labels, value))
+
+    # Hit ratio per cache, derived from cache_requests_total
+    lookups = {}
+    for (cache, result), cell in by_metric.get(CACHE_REQUESTS.name, []):
+        entry = lookups.setdefault(cache, [0.0, 0.0])
+        entry[0] += cell[0] if result == "hit" else 0
+        entry[1] += cell[0]
+    lines.append("# HELP cache_hit_ratio Share of lookups served from cache since start.")
+    lines.append("# TYPE cache_hit_ratio gauge")
+    for cache, (hits, total) in sorted(lookups.items()):
+        lines.append(_line("cache_hit_ratio", (("cache", cache),), round(hits / total, 4)))
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,141 @@
+# app/pagination.py
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Encode the (created_at, id) keyset position of a row as an opaque cursor.
+    """
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """
+    Decode a cursor produced by encode_cursor back into (created_at, id).
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_page(query, created_col, id_col, cursor: Optional[str], limit: int):
+    """
+    Return one newest-first page of `query` ordered by (created_at, id)
+    together with the cursor for the next page (None on the last page).
+    Rows must expose `created_at` and `id` attributes.
+    """
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        query = query.filter(
+            or_(
+                created_col < created_at,
+                and_(created_col == created_at, id_col < last_id),
+            )
+        )
+
+    # Fetch one extra row to know whether another page exists
+    rows = (
+        query.order_by(created_col.desc(), id_col.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return rows, next_cursor
+
+
+def encode_id_cursor(row_id: int) -> str:
+    return base64.urlsafe_b64encode(str(row_id).encode()).decode().rstrip("=")
+
+
+def decode_id_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def id_keyset_page(query, id_col, cursor: Optional[str], limit: int):
+    """
+    Same as keyset_page but keyed on the autoincrement id alone, for tables
+    whose created_at is filled in by the database and so is not known exactly.
+    """
+    if cursor:
+        query = query.filter(id_col < decode_id_cursor(cursor))
+
+    rows = query.order_by(id_col.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_id_cursor(rows[-1].id)
+
+    return rows, next_cursor
+
+
+def encode_score_cursor(score: float, row_id: int) -> str:
+    raw = json.dumps([score, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_score_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(score), int(row_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def score_keyset_page(query, score_col, id_col, cursor: Optional[str], limit: int):
+    """
+    Same as keyset_page but highest score first, for ranked feeds backed by
+    an index on (score, id). Rows must expose `score` and `id` attributes.
+    Scores change between requests, so a row can move across pages.
+    """
+    if cursor:
+        score, last_id = decode_score_cursor(cursor)
+        query = query.filter(
+            or_(
+                score_col < score,
+                and_(score_col == score, id_col < last_id),
+            )
+        )
+
+    rows = (
+        query.order_by(score_col.desc(), id_col.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_score_cursor(rows[-1].score, rows[-1].id)
+
+    return rows, next_cursor
@@ -0,0 +1,37 @@
+STUDENT_SLOT = "{student_name}"
+
+
+def template_prompt(lessons: list[tuple], language: str) -> str:
+    """
+    One prompt for all lessons (each a tuple of topics): a reusable parent
+    message per lesson with a {student_name} slot that is filled in
+    locally. The JSON answer is keyed by lesson number ("1", "2", ...).
+    """
+    lesson_lines = "\n".join(f"{i}. {'; '.join(topics)}" for i, topics in enumerate(lessons, start=1))
+    keys = ", ".join(f'"{i}": "..."' for i in range(1, len(lessons) + 1))
+
+    return f"""
+Create a short, respectful message from a teacher to a parent about what
+their child is learning in class, one message per numbered line below
+(a line with several topics gets one message covering all of them).
+
+Topics:
+{lesson_lines}
+
+Rules:
+- Language: {language}
+- Under 60 words each
+- Warm and encouraging, suggest one small thing the parent can do at home
+- Write the literal placeholder {STUDENT_SLOT} wherever the child's name goes
+
+Return ONLY this JSON, no extra text:
+{{{keys}}}
+"""
+
+
+def individual_prompt(student_name: str, topic: str, note: str, language: str) -> str:
+    return f"""
+Create a short respectful message for parent about {student_name} learning {topic}.
+Teacher's note about {student_name}: {note}
+Language: {language}. Under 60 words.
+"""
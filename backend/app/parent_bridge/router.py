@@ -1,9 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import copy_context
+import json
+import logging
+
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from app.dependencies import get_current_user
 from app.coach.groq_client import call_groq
+from app.parent_bridge.prompt import STUDENT_SLOT, template_prompt, individual_prompt
+from app.parent_bridge.schemas import BulkParentMessageRequest, ParentMessage
+from app.usage import QuotaExceeded, usage
 
 router = APIRouter(prefix="/parent", tags=["Parent Bridge"])
 
+logger = logging.getLogger(__name__)
+
+# Concurrent LLM calls per bulk request, for students that need their own message
+MAX_PARALLEL_CALLS = 4
+
 
 @router.post("/message")
 def generate_parent_message(
@@ -12,6 +26,93 @@ def generate_parent_message(
     user_id: int = Depends(get_current_user),
 ):
     text = call_groq(
-        f"Create a short respectful message for parent about {student_name} learning {topic}"
+        f"Create a short respectful message for parent about {student_name} learning {topic}",
+        caller="parent",
     )
     return {"message": text}
+
+
+def _generate_templates(lessons: list[tuple], language: str) -> dict:
+    """
+    One LLM call for all lessons (tuples of topics). Returns {} if the
+    output is unusable, in which case every student falls back to an
+    individual call. QuotaExceeded is raised: falling back would only
+    spend more of the teacher's quota.
+    """
+    try:
+        raw = call_groq(template_prompt(lessons, language), caller="parent_templates")
+        start = raw.find("{")
+        end = raw.rfind("}") + 1
+        templates = json.loads(raw[start:end])
+    except QuotaExceeded:
+        raise
+    except Exception as e:
+        logger.warning("Parent template generation failed: %s", e)
+        return {}
+
+    by_lesson = {}
+    for i, topics in enumerate(lessons, start=1):
+        text = templates.get(str(i))
+        if isinstance(text, str) and STUDENT_SLOT in text:
+            by_lesson[topics] = text
+    return by_lesson
+
+
+def _line(student_name: str, topics: tuple, message: str = None, error: str = None) -> str:
+    item = ParentMessage(student_name=student_name, topic=", ".join(topics), message=message, error=error)
+    return item.model_dump_json(exclude_none=True) + "\n"
+
+
+def _bulk_messages(data: BulkParentMessageRequest, jobs: list, templates: dict):
+    # 1️⃣ Template students are filled in locally and sent straight away
+    individual = []
+    for student, topics in jobs:
+        if not student.note and topics in templates:
+            yield _line(student.name, topics, templates[topics].replace(STUDENT_SLOT, student.name))
+        else:
+            individual.append((student, topics))
+
+    if not individual:
+        return
+
+    # 2️⃣ Students with a note (or no usable template) get their own call, in parallel
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_CALLS) as pool:
+        futures = {
+            pool.submit(
+                copy_context().run,
+                call_groq,
+                individual_prompt(student.name, ", ".join(topics), student.note or "", data.language),
+                "parent",
+            ): (student, topics)
+            for student, topics in individual
+        }
+        for future in as_completed(futures):
+            student, topics = futures[future]
+            try:
+                yield _line(student.name, topics, future.result().strip())
+            except Exception as e:
+                yield _line(student.name, topics, error=f"AI message error: {str(e)}")
+
+
+@router.post("/messages/bulk")
+def generate_bulk_parent_messages(
+    data: BulkParentMessageRequest,
+    user_id: int = Depends(get_current_user),
+):
+    """
+    Parent messages for a whole class, streamed as NDJSON (one student per line).
+    Students without a topic of their own get one message covering all the
+    class topics. Students sharing topics reuse one template from a single
+    LLM call, made before streaming starts so its errors get a real status.
+    """
+    # 1️⃣ Refuse up front rather than streaming a quota error per student
+    usage.check_quota(user_id)
+
+    class_topics = tuple(data.topics)
+    jobs = [(s, (s.topic,) if s.topic else class_topics) for s in data.students]
+
+    # 2️⃣ Templates for students without a note, before the 200 is sent
+    lessons = sorted({topics for student, topics in jobs if not student.note})
+    templates = _generate_templates(lessons, data.language) if lessons else {}
+
+    return StreamingResponse(_bulk_messages(data, jobs, templates), media_type="application/x-ndjson")
@@ -1 +1,26 @@
 # schemas.py
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class StudentEntry(BaseModel):
+    name: str
+    topic: Optional[str] = Field(default=None, description="Overrides the class topic for this student")
+    note: Optional[str] = Field(
+        default=None,
+        description="Something specific about this student; gets an individually written message",
+    )
+
+
+class BulkParentMessageRequest(BaseModel):
+    students: List[StudentEntry] = Field(..., min_length=1, max_length=80)
+    topics: List[str] = Field(..., min_length=1, max_length=10)
+    language: str = Field(default="Hindi/Hinglish", example="Hinglish")
+
+
+class ParentMessage(BaseModel):
+    student_name: str
+    topic: str
+    message: Optional[str] = None
+    error: Optional[str] = None
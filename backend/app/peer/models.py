@@ -1,12 +1,52 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Float, Index, ForeignKey, LargeBinary
 from datetime import datetime
 from app.database import Base
+from app.sync.models import ChangeTracked
 
 
-class PeerPost(Base):
+class PeerPost(ChangeTracked, Base):
     __tablename__ = "peer_posts"
 
     id = Column(Integer, primary_key=True)
     title = Column(String)
     description = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Reaction counts and time-decayed ranking score, updated in batches
+    # by app.peer.reactions
+    helpful_count = Column(Integer, nullable=False, default=0)
+    tried_count = Column(Integer, nullable=False, default=0)
+    thanks_count = Column(Integer, nullable=False, default=0)
+    score = Column(Float, nullable=False, default=0.0)
+
+    # Back the newest-first keyset feed in /peer/posts and the ranked
+    # feed in /peer/posts/ranked
+    __table_args__ = (
+        Index("ix_peer_posts_created_at_id", "created_at", "id"),
+        Index("ix_peer_posts_score_id", "score", "id"),
+    )
+
+
+class PeerPostSketch(Base):
+    """
+    MinHash signature of a post, persisted so the similarity index is
+    rebuilt at startup without re-reading every post's text.
+    """
+    __tablename__ = "peer_post_sketches"
+
+    post_id = Column(Integer, ForeignKey("peer_posts.id", ondelete="CASCADE"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)  # packed by app.peer.similarity.pack
+    duplicate_of = Column(Integer, nullable=True)  # closest near-duplicate when the post was written
+
+
+class PeerReaction(Base):
+    """
+    One teacher's reaction of one kind to a post; the per-post counts on
+    PeerPost are derived from these inserts and deletes.
+    """
+    __tablename__ = "peer_reactions"
+
+    post_id = Column(Integer, ForeignKey("peer_posts.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    kind = Column(String, primary_key=True)  # see app.peer.reactions.REACTIONS
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
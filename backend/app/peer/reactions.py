@@ -0,0 +1,204 @@
+import logging
+import math
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import bindparam, delete, text, update
+from sqlalchemy.orm import Session
+
+from app.caching import bump_version
+from app.config import settings
+from app.database import SessionLocal
+from app.peer.models import PeerPost, PeerReaction
+
+logger = logging.getLogger(__name__)
+
+# Reaction kind -> weight in the ranking score
+REACTIONS = {
+    "helpful": 3.0,
+    "tried": 2.0,
+    "thanks": 1.0,
+}
+POST_WEIGHT = 1.0  # a new post starts with this much score, so it can surface
+
+# Scores are Σ weight · e^((t - SCORE_EPOCH) / τ) over the post and its
+# reactions. Every score decays by the same factor over time, so the order
+# never needs recomputing and reactions just add to it. τ follows from
+# PEER_RANKING_HALF_LIFE_HOURS; a double overflows after ~700τ (about 8
+# years at a 72h half-life), so backfill_scores warns well before.
+SCORE_EPOCH = datetime(2026, 1, 1)
+SCORE_WARN = 1e250
+_TAU_SECONDS = settings.PEER_RANKING_HALF_LIFE_HOURS * 3600 / math.log(2)
+
+
+def contribution(weight: float, at: datetime) -> float:
+    return weight * math.exp((at - SCORE_EPOCH).total_seconds() / _TAU_SECONDS)
+
+
+def initial_score(created_at: datetime) -> float:
+    return contribution(POST_WEIGHT, created_at)
+
+
+def _counter(kind: str) -> str:
+    return f"{kind}_count"
+
+
+def add_reaction(db: Session, post_id: int, user_id: int, kind: str) -> Optional[float]:
+    """
+    Record the reaction, uncommitted. Returns the post's score change, or
+    None if the teacher had already reacted this way; pass it to
+    reaction_counter.record() once committed.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    now = datetime.utcnow()
+    stmt = insert(PeerReaction).values(post_id=post_id, user_id=user_id, kind=kind, created_at=now)
+    if db.execute(stmt.on_conflict_do_nothing()).rowcount != 1:
+        return None
+    return contribution(REACTIONS[kind], now)
+
+
+def remove_reaction(db: Session, post_id: int, user_id: int, kind: str) -> Optional[float]:
+    """
+    Withdraw the reaction, uncommitted. Returns the post's score change,
+    or None if there was no such reaction.
+    """
+    reacted_at = db.execute(
+        delete(PeerReaction)
+        .where(PeerReaction.post_id == post_id, PeerReaction.user_id == user_id, PeerReaction.kind == kind)
+        .returning(PeerReaction.created_at)
+    ).scalar()
+    if reacted_at is None:
+        return None
+    return -contribution(REACTIONS[kind], reacted_at)
+
+
+class ReactionCounter:
+    """
+    Coalesces reaction count and score changes per post in memory and
+    applies them every flush interval as one UPDATE per post, in post id
+    order, so a popular post is written once per interval instead of
+    once per tap and concurrent flushes from several workers can't
+    deadlock. Changes are recorded after the reaction row is committed;
+    those not flushed yet when a worker is killed are lost.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = defaultdict(lambda: defaultdict(float))  # post id -> column -> delta
+        self._stop = threading.Event()
+        self._thread = None
+
+    def record(self, post_id: int, kind: str, count: int, score: float):
+        with self._lock:
+            deltas = self._pending[post_id]
+            deltas[_counter(kind)] += count
+            deltas["score"] += score
+
+    def pending(self, post_id: int) -> dict:
+        """
+        Unflushed changes of `post_id` made through this worker.
+        """
+        with self._lock:
+            return dict(self._pending.get(post_id, {}))
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, defaultdict(lambda: defaultdict(float))
+            if not batch:
+                return
+
+            params = [
+                {
+                    "post_id": post_id,
+                    **{f"{_counter(kind)}_delta": int(deltas.get(_counter(kind), 0)) for kind in REACTIONS},
+                    "score_delta": deltas.get("score", 0.0),
+                }
+                for post_id, deltas in sorted(batch.items())
+            ]
+            stmt = (
+                update(PeerPost)
+                .where(PeerPost.id == bindparam("post_id"))
+                .values(
+                    **{
+                        _counter(kind): getattr(PeerPost, _counter(kind)) + bindparam(f"{_counter(kind)}_delta")
+                        for kind in REACTIONS
+                    },
+                    score=PeerPost.score + bindparam("score_delta"),
+                )
+            )
+
+            # Imported here: the peer router imports this module
+            from app.peer.router import PEER_POSTS_SCOPE
+
+            db = SessionLocal()
+            try:
+                db.connection().execute(stmt, params)
+                bump_version(db, PEER_POSTS_SCOPE)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.warning("Reaction counter flush failed: %s", e)
+                with self._lock:
+                    for post_id, deltas in batch.items():
+                        for column, delta in deltas.items():
+                            self._pending[post_id][column] += delta
+            finally:
+                db.close()
+
+    def start(self, interval: float):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(interval,), name="reaction-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.flush()
+
+    def _loop(self, interval: float):
+        while not self._stop.wait(interval):
+            self.flush()
+
+
+reaction_counter = ReactionCounter()
+
+
+def _as_datetime(value) -> datetime:
+    if value is None:
+        return SCORE_EPOCH
+    if isinstance(value, str):  # SQLite hands raw text back to text() queries
+        return datetime.fromisoformat(value)
+    return value
+
+
+def backfill_scores(engine):
+    """
+    Give posts from before reactions existed (score still 0, see alembic
+    revision 0006) their initial score, and warn when scores near overflow.
+    Every real score is positive, so each post is backfilled once.
+    """
+    with engine.begin() as conn:
+        # Plain SQL, so the ORM's onupdate doesn't stamp updated_at
+        rows = conn.execute(text("SELECT id, created_at FROM peer_posts WHERE score = 0")).fetchall()
+        if rows:
+            conn.execute(
+                text("UPDATE peer_posts SET score = :initial WHERE id = :post_id"),
+                [{"post_id": row.id, "initial": initial_score(_as_datetime(row.created_at))} for row in rows],
+            )
+
+        top = conn.execute(text("SELECT MAX(score) FROM peer_posts")).scalar()
+        if top is not None and top > SCORE_WARN:
+            logger.warning("Peer ranking scores near float overflow (%.3g); move SCORE_EPOCH forward", top)
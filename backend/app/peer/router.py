@@ -1,23 +1,249 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import datetime
+from app.caching import check_not_modified, bump_version
 from app.dependencies import get_db, get_current_user
+from app.group_commit import commit_write
+from app.pagination import keyset_page, score_keyset_page
 from app.peer import models, schemas
+from app.peer.reactions import REACTIONS, add_reaction, initial_score, reaction_counter, remove_reaction
+from app.peer.search import index_post, search_posts
+from app.peer.similarity import pack, signature, similarity_index
 
 router = APIRouter(prefix="/peer", tags=["Peer Wisdom"])
 
+PEER_POSTS_SCOPE = "peer_posts"
+PEER_CACHE_CONTROL = "public, max-age=30"
 
-@router.post("/post")
+
+def insert_post(db: Session, data: schemas.PeerPostCreate, sketch: Optional[tuple] = None,
+                duplicate_of: Optional[int] = None) -> int:
+    """
+    Insert and index a post (and its MinHash sketch, if any), uncommitted;
+    returns its id.
+    """
+    now = datetime.utcnow()
+    post = models.PeerPost(**data.dict(), created_at=now, score=initial_score(now))
+    db.add(post)
+    db.flush()
+    index_post(db, post)
+    if sketch is not None:
+        db.add(models.PeerPostSketch(post_id=post.id, signature=pack(sketch), duplicate_of=duplicate_of))
+    bump_version(db, PEER_POSTS_SCOPE)
+    return post.id
+
+
+@router.post("/post", response_model=schemas.PeerPostCreated)
 def create_post(
     data: schemas.PeerPostCreate,
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user),
 ):
-    post = models.PeerPost(**data.dict())
-    db.add(post)
-    db.commit()
-    return {"message": "Post created"}
+    """
+    Create a post. Existing posts that say nearly the same thing are
+    returned as `near_duplicates`, so the app can point the teacher there.
+    """
+    # 1️⃣ Flag near-duplicates from the in-memory index, before writing
+    sketch = signature(data.title, data.description)
+    similarity_index.refresh(db)
+    near_duplicates = similarity_index.near_duplicates(sketch)
+    duplicate_of = near_duplicates[0]["id"] if near_duplicates else None
+
+    # 2️⃣ Insert the post with its sketch, then make it findable here right away
+    post_id = commit_write(db, lambda session: insert_post(session, data, sketch, duplicate_of))
+    similarity_index.add(post_id, sketch, data.title)
+
+    return {"message": "Post created", "id": post_id, "near_duplicates": near_duplicates}
+
+
+@router.get("/posts", response_model=schemas.PeerFeedResponse)
+def get_posts(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """
+    Newest-first peer feed, paginated by an opaque `next_cursor`.
+    Only titles are loaded; fetch /peer/posts/{id} for the full description.
+    """
+    check_not_modified(request, response, db, PEER_POSTS_SCOPE, PEER_CACHE_CONTROL)
+
+    query = db.query(
+        models.PeerPost.id,
+        models.PeerPost.title,
+        models.PeerPost.created_at,
+    )
+    rows, next_cursor = keyset_page(
+        query,
+        models.PeerPost.created_at,
+        models.PeerPost.id,
+        cursor,
+        limit,
+    )
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+@router.get("/posts/ranked", response_model=schemas.PeerRankedFeedResponse)
+def get_ranked_posts(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """
+    Most useful tips first: posts ordered by their time-decayed reaction
+    score, read straight off the (score, id) index. Reactions show up here
+    after the next counter flush.
+    """
+    check_not_modified(request, response, db, PEER_POSTS_SCOPE, PEER_CACHE_CONTROL)
+
+    query = db.query(
+        models.PeerPost.id,
+        models.PeerPost.title,
+        models.PeerPost.created_at,
+        models.PeerPost.score,
+        *(getattr(models.PeerPost, f"{kind}_count") for kind in REACTIONS),
+    )
+    rows, next_cursor = score_keyset_page(
+        query,
+        models.PeerPost.score,
+        models.PeerPost.id,
+        cursor,
+        limit,
+    )
+    items = [
+        {
+            "id": row.id,
+            "title": row.title,
+            "created_at": row.created_at,
+            "reactions": {kind: getattr(row, f"{kind}_count") for kind in REACTIONS},
+        }
+        for row in rows
+    ]
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def _react(db: Session, post_id: int, user_id: int, kind: str, add: bool) -> dict:
+    if kind not in REACTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown reaction; use one of: {', '.join(REACTIONS)}"
+        )
+    post = db.query(models.PeerPost).filter(models.PeerPost.id == post_id).first()
+    if not post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+
+    # 1️⃣ Insert / delete this teacher's reaction row; no hot counter row is touched
+    write = add_reaction if add else remove_reaction
+    score_change = commit_write(db, lambda session: write(session, post_id, user_id, kind))
+
+    # 2️⃣ Counters and score catch up at the next flush
+    if score_change is not None:
+        reaction_counter.record(post_id, kind, 1 if add else -1, score_change)
+
+    pending = reaction_counter.pending(post_id)
+    counts = {
+        k: max(0, getattr(post, f"{k}_count") + int(pending.get(f"{k}_count", 0)))
+        for k in REACTIONS
+    }
+    return {
+        "post_id": post_id,
+        "kind": kind,
+        "reacted": add,
+        "changed": score_change is not None,
+        "reactions": counts,
+    }
 
 
-@router.get("/posts")
-def get_posts(db: Session = Depends(get_db)):
-    return db.query(models.PeerPost).all()
+@router.put("/posts/{post_id}/reactions/{kind}", response_model=schemas.ReactionResult)
+def react_to_post(
+    post_id: int,
+    kind: str,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user),
+):
+    """
+    React to a post (helpful / tried / thanks). Idempotent: reacting twice
+    counts once. Counts in the response include this worker's unflushed
+    reactions.
+    """
+    return _react(db, post_id, user_id, kind, add=True)
+
+
+@router.delete("/posts/{post_id}/reactions/{kind}", response_model=schemas.ReactionResult)
+def withdraw_reaction(
+    post_id: int,
+    kind: str,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user),
+):
+    return _react(db, post_id, user_id, kind, add=False)
+
+
+@router.get("/search", response_model=schemas.PeerSearchResponse)
+def search(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """
+    Ranked full-text search over peer posts (Hindi, Hinglish and English),
+    with matches highlighted in the title and description snippet.
+    """
+    check_not_modified(request, response, db, PEER_POSTS_SCOPE, PEER_CACHE_CONTROL)
+    return {"items": search_posts(db, q, limit)}
+
+
+@router.get("/posts/{post_id}/related", response_model=schemas.RelatedPostsResponse)
+def get_related_posts(
+    post_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(5, ge=1, le=20),
+    db: Session = Depends(get_db),
+):
+    """
+    Posts most similar to this one, from the MinHash/LSH index: only posts
+    sharing a band with it are compared, the table is never scanned.
+    """
+    check_not_modified(request, response, db, PEER_POSTS_SCOPE, PEER_CACHE_CONTROL)
+
+    similarity_index.refresh(db)
+    items = similarity_index.related(post_id, limit)
+    if items is None:
+        # Possibly written by another worker since the last refresh
+        similarity_index.load(db, post_id)
+        items = similarity_index.related(post_id, limit)
+    if items is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    return {"items": items}
+
+
+@router.get("/posts/{post_id}", response_model=schemas.PeerPostResponse)
+def get_post(
+    post_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    check_not_modified(request, response, db, PEER_POSTS_SCOPE, PEER_CACHE_CONTROL)
+
+    post = db.query(models.PeerPost).filter(models.PeerPost.id == post_id).first()
+    if not post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    return post
@@ -1,6 +1,77 @@
 from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
 
 
 class PeerPostCreate(BaseModel):
     title: str
     description: str
+
+
+class PeerPostSummary(BaseModel):
+    id: int
+    title: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class PeerPostResponse(PeerPostSummary):
+    description: str
+
+
+class PeerFeedResponse(BaseModel):
+    items: List[PeerPostSummary]
+    next_cursor: Optional[str] = None
+
+
+class PeerSearchResult(BaseModel):
+    id: int
+    title: str
+    snippet: str
+    created_at: datetime
+    rank: float
+
+
+class PeerSearchResponse(BaseModel):
+    items: List[PeerSearchResult]
+
+
+class SimilarPost(BaseModel):
+    id: int
+    title: str
+    similarity: float
+
+
+class PeerPostCreated(BaseModel):
+    message: str
+    id: int
+    near_duplicates: List[SimilarPost] = []
+
+
+class RelatedPostsResponse(BaseModel):
+    items: List[SimilarPost]
+
+
+class ReactionCounts(BaseModel):
+    helpful: int = 0
+    tried: int = 0
+    thanks: int = 0
+
+
+class PeerRankedPost(PeerPostSummary):
+    reactions: ReactionCounts
+
+
+class PeerRankedFeedResponse(BaseModel):
+    items: List[PeerRankedPost]
+    next_cursor: Optional[str] = None
+
+
+class ReactionResult(BaseModel):
+    post_id: int
+    kind: str
+    reacted: bool  # whether the teacher now has this reaction on the post
+    changed: bool  # False when the request repeated the current state
+    reactions: ReactionCounts
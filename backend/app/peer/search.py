@@ -0,0 +1,149 @@
+import re
+import unicodedata
+
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.peer.models import PeerPost
+from app.utils.text import tokenize
+
+REPEAT_RE = re.compile(r"([a-z])\1+")
+
+HIGHLIGHT_START = "<b>"
+HIGHLIGHT_END = "</b>"
+
+
+def fold_hinglish(value: str) -> str:
+    """
+    Fold common romanised Hindi spelling variants to one form
+    (e.g. "acchha"/"achha"/"acha", "neeche"/"niche") so they match each other.
+    """
+    value = unicodedata.normalize("NFC", value).lower()
+    value = value.replace("ee", "i").replace("oo", "u")
+    value = value.replace("chh", "ch").replace("cch", "ch")
+    return REPEAT_RE.sub(r"\1", value)
+
+
+def _folded_text(title: str, description: str) -> str:
+    return " ".join(fold_hinglish(t) for t in tokenize(f"{title} {description}"))
+
+
+def backfill_search_index(engine):
+    """
+    Index the peer posts that are not in the full-text index yet (the
+    index itself is created by alembic revision 0003).
+    """
+    dialect = engine.dialect.name
+
+    with engine.begin() as conn:
+        if dialect == "sqlite":
+            missing = conn.execute(text(
+                "SELECT id, title, description FROM peer_posts "
+                "WHERE id NOT IN (SELECT rowid FROM peer_posts_fts)"
+            )).fetchall()
+        elif dialect == "postgresql":
+            missing = conn.execute(text(
+                "SELECT id, title, description FROM peer_posts "
+                "WHERE search_vector IS NULL"
+            )).fetchall()
+        else:
+            return
+
+        for row in missing:
+            _write_index(conn, dialect, row.id, row.title or "", row.description or "")
+
+
+def _write_index(conn, dialect: str, post_id: int, title: str, description: str):
+    params = {
+        "id": post_id,
+        "title": title,
+        "description": description,
+        "folded": _folded_text(title, description),
+    }
+
+    if dialect == "sqlite":
+        conn.execute(text(
+            "INSERT OR REPLACE INTO peer_posts_fts(rowid, title, description, folded) "
+            "VALUES (:id, :title, :description, :folded)"
+        ), params)
+    elif dialect == "postgresql":
+        conn.execute(text(
+            "UPDATE peer_posts SET search_vector = "
+            "setweight(to_tsvector('simple', :title), 'A') || "
+            "setweight(to_tsvector('simple', :description), 'B') || "
+            "setweight(to_tsvector('simple', :folded), 'C') "
+            "WHERE id = :id"
+        ), params)
+
+
+def index_post(db: Session, post: PeerPost):
+    """
+    Add a single post to the full-text index inside the caller's transaction.
+    The post must already be flushed so that it has an id.
+    """
+    _write_index(
+        db.connection(),
+        db.get_bind().dialect.name,
+        post.id,
+        post.title or "",
+        post.description or "",
+    )
+
+
+def search_posts(db: Session, query: str, limit: int):
+    """
+    Ranked full-text search over peer posts. Each query word matches either
+    as typed or in its folded Hinglish spelling, as a prefix.
+    """
+    terms = []
+    for token in tokenize(query):
+        for term in (token, fold_hinglish(token)):
+            if term not in terms:
+                terms.append(term)
+
+    if not terms:
+        return []
+
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        match = " OR ".join(f'"{term}"*' for term in terms)
+        rows = db.execute(text(
+            "SELECT p.id, p.created_at, "
+            f"highlight(peer_posts_fts, 0, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}') AS title, "
+            f"snippet(peer_posts_fts, 1, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', 16) AS snippet, "
+            "-bm25(peer_posts_fts, 10.0, 4.0, 1.0) AS rank "
+            "FROM peer_posts_fts JOIN peer_posts p ON p.id = peer_posts_fts.rowid "
+            "WHERE peer_posts_fts MATCH :match "
+            "ORDER BY bm25(peer_posts_fts, 10.0, 4.0, 1.0) "
+            "LIMIT :limit"
+        ), {"match": match, "limit": limit}).fetchall()
+    elif dialect == "postgresql":
+        tsquery = " | ".join(f"{term}:*" for term in terms)
+        options = (
+            f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, "
+            "MaxWords=20, MinWords=8, ShortWord=1"
+        )
+        rows = db.execute(text(
+            "SELECT p.id, p.created_at, "
+            "ts_headline('simple', p.title, q, :title_options) AS title, "
+            "ts_headline('simple', p.description, q, :options) AS snippet, "
+            "ts_rank_cd(p.search_vector, q) AS rank "
+            "FROM peer_posts p, to_tsquery('simple', :tsquery) q "
+            "WHERE p.search_vector @@ q "
+            "ORDER BY rank DESC "
+            "LIMIT :limit"
+        ), {
+            "tsquery": tsquery,
+            "title_options": options + ", HighlightAll=true",
+            "options": options,
+            "limit": limit,
+        }).fetchall()
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Search is not supported on this database"
+        )
+
+    return rows
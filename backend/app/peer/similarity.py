@@ -0,0 +1,213 @@
+import hashlib
+import random
+import struct
+import threading
+import time
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from app.peer.search import fold_hinglish
+from app.utils.text import tokenize
+
+# 64 MinHash values per post, split into 32 LSH bands of 2: posts sharing
+# any band become candidates, which catches ~95% of pairs at Jaccard 0.3
+# and most unrelated pairs never meet
+NUM_PERM = 64
+BAND_ROWS = 2
+BANDS = NUM_PERM // BAND_ROWS
+
+NEAR_DUPLICATE_SIMILARITY = 0.8  # estimated Jaccard at which a new post is flagged
+RELATED_MIN_SIMILARITY = 0.15
+REFRESH_SECONDS = 2.0  # how stale another worker's new posts may be in this index
+# Ids below the watermark re-checked on refresh: posts (e.g. from Postgres
+# sequences) can commit out of id order
+REFRESH_OVERLAP = 1000
+
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(20240601)  # fixed: persisted signatures must stay comparable
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)]
+_PACK = struct.Struct(f"<{NUM_PERM}I")
+
+
+def shingles(title: str, description: str) -> set[str]:
+    """
+    Word pairs of the folded text (single words for one-word posts), so
+    spelling variants and reordered sentences still overlap.
+    """
+    words = [fold_hinglish(token) for token in tokenize(f"{title} {description}")]
+    if len(words) < 2:
+        return set(words)
+    return {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def signature(title: str, description: str) -> Optional[tuple]:
+    """
+    MinHash signature of a post, or None if it has no words.
+    """
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little")
+        for s in shingles(title, description)
+    ]
+    if not hashes:
+        return None
+    return tuple(
+        min((a * h + b) % _MERSENNE for h in hashes) & 0xFFFFFFFF
+        for a, b in _PERMUTATIONS
+    )
+
+
+def pack(sig: tuple) -> bytes:
+    return _PACK.pack(*sig)  # 256 bytes per post
+
+
+def unpack(data: bytes) -> tuple:
+    return _PACK.unpack(data)
+
+
+def similarity(a: tuple, b: tuple) -> float:
+    """
+    Estimated Jaccard similarity of the two posts' shingle sets.
+    """
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def _band_keys(sig: tuple):
+    for band in range(BANDS):
+        yield hash((band,) + sig[band * BAND_ROWS:(band + 1) * BAND_ROWS])
+
+
+class SimilarityIndex:
+    """
+    In-memory LSH index over the persisted MinHash signatures of peer posts.
+    Lookups touch only the posts sharing a band with the query, never the
+    whole table. Each worker keeps its own copy and picks up posts added by
+    other workers from `peer_post_sketches` at most every REFRESH_SECONDS.
+    The watermark only advances over rows read back from the table, never
+    over posts added locally, so a refresh can't skip other workers' posts.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signatures = {}  # post id -> signature
+        self._titles = {}  # post id -> title
+        self._buckets = defaultdict(list)  # band key -> post ids
+        self._max_id = 0  # highest post id read from peer_post_sketches
+        self._refreshed = 0.0
+
+    def _add(self, post_id: int, sig: tuple, title: str):
+        if post_id in self._signatures:
+            return
+        self._signatures[post_id] = sig
+        self._titles[post_id] = title
+        for key in _band_keys(sig):
+            self._buckets[key].append(post_id)
+
+    def add(self, post_id: int, sig: Optional[tuple], title: str):
+        if sig is None:
+            return
+        with self._lock:
+            self._add(post_id, sig, title)
+
+    def _load_rows(self, rows):
+        with self._lock:
+            for post_id, data, title in rows:
+                self._add(post_id, unpack(data), title or "")
+                self._max_id = max(self._max_id, post_id)
+            self._refreshed = time.monotonic()
+
+    def _fetch(self, db: Session, post_ids: list) -> list:
+        if not post_ids:
+            return []
+        return db.execute(
+            text(
+                "SELECT s.post_id, s.signature, p.title FROM peer_post_sketches s "
+                "JOIN peer_posts p ON p.id = s.post_id WHERE s.post_id IN :ids"
+            ).bindparams(bindparam("ids", expanding=True)),
+            {"ids": post_ids},
+        ).fetchall()
+
+    def refresh(self, db: Session, force: bool = False):
+        """
+        Load signatures of posts added by other workers, if the last
+        refresh is older than REFRESH_SECONDS (or `force`). Ids from
+        REFRESH_OVERLAP below the watermark up are listed and only the
+        ones not indexed yet are fetched.
+        """
+        if not force and time.monotonic() - self._refreshed < REFRESH_SECONDS:
+            return
+        ids = db.execute(text(
+            "SELECT post_id FROM peer_post_sketches WHERE post_id > :since"
+        ), {"since": max(0, self._max_id - REFRESH_OVERLAP)}).scalars().all()
+        with self._lock:
+            missing = [post_id for post_id in ids if post_id not in self._signatures]
+        self._load_rows(self._fetch(db, missing))
+
+    def load(self, db: Session, post_id: int):
+        """
+        Index one post straight from the table, e.g. one older than the
+        refresh overlap that this worker has not seen.
+        """
+        self._load_rows(self._fetch(db, [post_id]))
+
+    def _candidates(self, sig: tuple, exclude: Optional[int], min_similarity: float) -> list:
+        seen = set()
+        scored = []
+        for key in _band_keys(sig):
+            for post_id in self._buckets.get(key, ()):
+                if post_id == exclude or post_id in seen:
+                    continue
+                seen.add(post_id)
+                score = similarity(sig, self._signatures[post_id])
+                if score >= min_similarity:
+                    scored.append((score, post_id))
+        scored.sort(key=lambda item: (-item[0], -item[1]))
+        return scored
+
+    def near_duplicates(self, sig: Optional[tuple], limit: int = 3) -> list[dict]:
+        if sig is None:
+            return []
+        with self._lock:
+            scored = self._candidates(sig, None, NEAR_DUPLICATE_SIMILARITY)[:limit]
+            return [{"id": i, "title": self._titles[i], "similarity": round(s, 3)} for s, i in scored]
+
+    def related(self, post_id: int, limit: int) -> Optional[list[dict]]:
+        """
+        Most similar posts to `post_id`, or None if it is not indexed.
+        """
+        with self._lock:
+            sig = self._signatures.get(post_id)
+            if sig is None:
+                return None
+            scored = self._candidates(sig, post_id, RELATED_MIN_SIMILARITY)[:limit]
+            return [{"id": i, "title": self._titles[i], "similarity": round(s, 3)} for s, i in scored]
+
+
+similarity_index = SimilarityIndex()
+
+
+def load_similarity_index(engine):
+    """
+    Compute signatures for posts that have none yet, then load every
+    signature into `similarity_index`.
+    """
+    with engine.begin() as conn:
+        missing = conn.execute(text(
+            "SELECT id, title, description FROM peer_posts "
+            "WHERE id NOT IN (SELECT post_id FROM peer_post_sketches)"
+        )).fetchall()
+        for row in missing:
+            sig = signature(row.title or "", row.description or "")
+            if sig is not None:
+                conn.execute(text(
+                    "INSERT INTO peer_post_sketches (post_id, signature) VALUES (:id, :signature)"
+                ), {"id": row.id, "signature": pack(sig)})
+
+        rows = conn.execute(text(
+            "SELECT s.post_id, s.signature, p.title FROM peer_post_sketches s "
+            "JOIN peer_posts p ON p.id = s.post_id"
+        )).fetchall()
+
+    similarity_index._load_rows(rows)
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, UniqueConstraint
+from datetime import datetime
+from app.database import Base
+
+
+class TermPlan(Base):
+    """
+    A batch of lesson plans for one grade and subject, generated by the
+    "term_plan" background job.
+    """
+    __tablename__ = "term_plans"
+
+    id = Column(Integer, primary_key=True)
+    teacher_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    grade = Column(Integer, nullable=False)
+    subject = Column(String, nullable=False)
+    period_minutes = Column(Integer, nullable=False)
+
+    # pending -> running -> done | partial (some lessons failed) | paused (quota used up)
+    status = Column(String, nullable=False, default="pending")
+    error = Column(String, nullable=True)
+    job_id = Column(Integer, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class TermPlanLesson(Base):
+    """
+    One topic of a term plan. Lessons are claimed with a lease like jobs,
+    so a job resumed after a restart only generates what is left.
+    """
+    __tablename__ = "term_plan_lessons"
+
+    id = Column(Integer, primary_key=True)
+    term_plan_id = Column(Integer, ForeignKey("term_plans.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)  # 1-based order in the term
+    topic = Column(String, nullable=False)
+
+    # pending -> running -> done | failed
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    locked_until = Column(DateTime, nullable=True)
+    plan = Column(JSON, nullable=True)  # PlannerResponse fields
+    error = Column(String, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("term_plan_id", "position"),
+    )
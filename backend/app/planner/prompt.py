@@ -1,4 +1,5 @@
-def build_planner_prompt(grade: int, subject: str, time_available: int) -> str:
+def build_planner_prompt(grade: int, subject: str, time_available: int, topic: str = None) -> str:
+    topic_line = f"Topic: {topic}\n" if topic else ""
     return f"""
 You are an AI assistant helping teachers in Indian government schools.
 
@@ -33,5 +34,5 @@ Guidelines:
 Context:
 Grade: {grade}
 Subject: {subject}
-Total Time Available: {time_available} minutes
+{topic_line}Total Time Available: {time_available} minutes
 """
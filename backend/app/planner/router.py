@@ -1,37 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+import asyncio
 import json
+import logging
+import time
 
-from app.database import get_db
-from app.auth.jwt import get_current_user
-from app.planner.schemas import PlannerRequest, PlannerResponse
+from app.database import SessionLocal, get_db
+from app.dependencies import get_current_user
+from app.jobs.queue import job_queue
+from app.planner.models import TermPlan, TermPlanLesson
+from app.planner.schemas import (
+    PlannerRequest,
+    PlannerResponse,
+    TermPlanDocument,
+    TermPlanRequest,
+    TermPlanStatus,
+)
 from app.planner.prompt import build_planner_prompt
+from app.planner.term import FINISHED, create_term_plan, lesson_counts, resume_term_plan
 from app.coach.groq_client import call_groq
+from app.responses import negotiated_response, validated_response, wants_msgpack
+from app.profiling import stage
+from app.usage import usage
 
 router = APIRouter(
     tags=["Planner"]
 )
 
+logger = logging.getLogger(__name__)
 
-@router.post("/generate-plan", response_model=PlannerResponse)
-def generate_planner(
-    data: PlannerRequest,
-    db: Session = Depends(get_db),
-):
+
+def generate_plan(grade: int, subject: str, time_available: int, topic: str = None) -> PlannerResponse:
     """
-    Generates an AI-assisted lesson plan with topic, competencies, interactive methods, and teacher tips.
-    AI MUST return strict JSON.
+    Ask the AI for a lesson plan and validate it.
+    Raises ValueError when the AI output is not a valid plan.
     """
-
-    # 1️⃣ Build prompt
     prompt = build_planner_prompt(
-        grade=data.grade,
-        subject=data.subject,
-        time_available=data.time_available
+        grade=grade,
+        subject=subject,
+        time_available=time_available,
+        topic=topic,
     )
-
-    # 2️⃣ Call AI
-    ai_response = call_groq(prompt)
+    ai_response = call_groq(prompt, caller="planner")
 
     # 🔧 Clean AI response safely
     try:
@@ -42,20 +54,246 @@ def generate_planner(
             raise ValueError("No JSON object found")
 
         clean_json = ai_response[start:end]
-        response_data = json.loads(clean_json)
+        with stage("parse"):
+            response_data = json.loads(clean_json)
         
         # Validate required fields
         required_fields = ["topic", "competencies", "methods", "teacher_tip"]
         for field in required_fields:
             if field not in response_data:
                 raise ValueError(f"Missing field: {field}")
-                
-        return PlannerResponse(**response_data)
+
+        with stage("validate"):
+            return PlannerResponse(**response_data)
 
     except Exception as e:
-        print(f"DEBUG: JSON Parsing Error: {str(e)}")
-        print(f"DEBUG: Failed AI Response: {ai_response}")
+        logger.warning("Planner JSON parsing error: %s", e, extra={"raw_output": ai_response})
+        raise ValueError(f"Planner AI returned invalid JSON: {str(e)}") from e
+
+
+@router.post("/generate-plan", response_model=PlannerResponse)
+def generate_planner(
+    data: PlannerRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Generates an AI-assisted lesson plan with topic, competencies, interactive methods, and teacher tips.
+    AI MUST return strict JSON.
+    """
+
+    # 1️⃣ Build prompt and call AI
+    try:
+        plan = generate_plan(data.grade, data.subject, data.time_available)
+    except ValueError as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Planner AI returned invalid JSON: {str(e)}"
+            detail=str(e)
+        )
+
+    # 2️⃣ Send the validated plan as is
+    return validated_response(plan)
+
+
+TERM_EVENTS_POLL_SECONDS = 1.0
+TERM_EVENTS_KEEPALIVE_SECONDS = 15
+TERM_EVENTS_MAX_SECONDS = 600  # clients reconnect after this and get the current state
+
+
+def _own_term_plan(db: Session, term_plan_id: int, user_id: int) -> TermPlan:
+    term = (
+        db.query(TermPlan)
+        .filter(TermPlan.id == term_plan_id, TermPlan.teacher_id == user_id)
+        .first()
+    )
+    if not term:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Term plan not found"
+        )
+    return term
+
+
+def _term_status(db: Session, term: TermPlan) -> TermPlanStatus:
+    lessons = (
+        db.query(TermPlanLesson.position, TermPlanLesson.topic, TermPlanLesson.status, TermPlanLesson.error)
+        .filter(TermPlanLesson.term_plan_id == term.id)
+        .order_by(TermPlanLesson.position)
+        .all()
+    )
+    return TermPlanStatus(
+        id=term.id,
+        grade=term.grade,
+        subject=term.subject,
+        period_minutes=term.period_minutes,
+        status=term.status,
+        error=term.error,
+        progress=lesson_counts(db, term.id),
+        lessons=[lesson._asdict() for lesson in lessons],
+        created_at=term.created_at,
+    )
+
+
+@router.post("/term-plans", response_model=TermPlanStatus, status_code=status.HTTP_202_ACCEPTED)
+def submit_term_plan(
+    data: TermPlanRequest,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user),
+):
+    """
+    Queue lesson plans for a whole term, one per topic. Plans are generated
+    in the background, several at a time; follow progress on
+    /term-plans/{id} or /term-plans/{id}/events and download the result
+    from /term-plans/{id}/document.
+    """
+    # Refuse up front rather than queueing a job that can't make a call
+    usage.check_quota(user_id)
+
+    term = create_term_plan(db, user_id, data.grade, data.subject, data.period_minutes, data.topics)
+    db.commit()
+    job_queue.wake()
+    return validated_response(_term_status(db, term), status_code=status.HTTP_202_ACCEPTED)
+
+
+@router.get("/term-plans/{term_plan_id}", response_model=TermPlanStatus)
+def get_term_plan(
+    term_plan_id: int,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user),
+):
+    term = _own_term_plan(db, term_plan_id, user_id)
+    return validated_response(_term_status(db, term))
+
+
+@router.post("/term-plans/{term_plan_id}/resume", response_model=TermPlanStatus, status_code=status.HTTP_202_ACCEPTED)
+def resume_term_plan_route(
+    term_plan_id: int,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user),
+):
+    """
+    Retry the failed lessons of a partial term plan, or continue one paused
+    by the daily AI limit.
+    """
+    term = _own_term_plan(db, term_plan_id, user_id)
+    if term.status not in ("partial", "paused"):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Term plan is {term.status}; only partial or paused plans can be resumed"
         )
+    usage.check_quota(user_id)
+
+    resume_term_plan(db, term)
+    db.commit()
+    job_queue.wake()
+    return validated_response(_term_status(db, term), status_code=status.HTTP_202_ACCEPTED)
+
+
+def _term_snapshot(term_plan_id: int, user_id: int):
+    db = SessionLocal()
+    try:
+        term = db.query(TermPlan).filter(TermPlan.id == term_plan_id, TermPlan.teacher_id == user_id).first()
+        return _term_status(db, term) if term else None
+    finally:
+        db.close()
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+
+
+async def _term_events(first: TermPlanStatus, user_id: int):
+    snapshot = first
+    sent = {}  # position -> last status sent
+    progress = None
+    started = last_sent = time.monotonic()
+
+    while True:
+        # 1️⃣ One "lesson" event per lesson that finished since the last look
+        for lesson in snapshot.lessons:
+            if lesson.status in ("done", "failed") and sent.get(lesson.position) != lesson.status:
+                sent[lesson.position] = lesson.status
+                yield _sse("lesson", lesson.model_dump(exclude_none=True))
+                last_sent = time.monotonic()
+
+        # 2️⃣ Then the counts, whenever they changed
+        current = {"status": snapshot.status, **snapshot.progress.model_dump()}
+        if current != progress:
+            progress = current
+            yield _sse("progress", current)
+            last_sent = time.monotonic()
+
+        if snapshot.status in FINISHED:
+            yield _sse("end", {"status": snapshot.status, "error": snapshot.error})
+            return
+        if time.monotonic() - started > TERM_EVENTS_MAX_SECONDS:
+            return
+        if time.monotonic() - last_sent > TERM_EVENTS_KEEPALIVE_SECONDS:
+            yield ": keep-alive\n\n"
+            last_sent = time.monotonic()
+
+        await asyncio.sleep(TERM_EVENTS_POLL_SECONDS)
+        snapshot = await run_in_threadpool(_term_snapshot, first.id, user_id)
+        if snapshot is None:
+            return
+
+
+@router.get("/term-plans/{term_plan_id}/events")
+async def term_plan_events(
+    term_plan_id: int,
+    user_id: int = Depends(get_current_user),
+):
+    """
+    Server-sent events for a term plan: `lesson` when a lesson finishes,
+    `progress` when the counts change and `end` once the plan is done,
+    partial or paused. Starts with the current state, so reconnecting
+    clients catch up.
+    """
+    first = await run_in_threadpool(_term_snapshot, term_plan_id, user_id)
+    if first is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Term plan not found"
+        )
+    return StreamingResponse(
+        _term_events(first, user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/term-plans/{term_plan_id}/document", response_model=TermPlanDocument)
+def get_term_plan_document(
+    term_plan_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user),
+):
+    """
+    All finished plans of the term in one document (MessagePack with
+    `Accept: application/msgpack`), in term order.
+    """
+    term = _own_term_plan(db, term_plan_id, user_id)
+    lessons = (
+        db.query(TermPlanLesson.position, TermPlanLesson.topic, TermPlanLesson.status, TermPlanLesson.plan)
+        .filter(TermPlanLesson.term_plan_id == term.id)
+        .order_by(TermPlanLesson.position)
+        .all()
+    )
+
+    document = TermPlanDocument(
+        id=term.id,
+        grade=term.grade,
+        subject=term.subject,
+        period_minutes=term.period_minutes,
+        complete=all(lesson.status == "done" for lesson in lessons),
+        lessons=[
+            {"position": lesson.position, "topic": lesson.topic, "plan": lesson.plan}
+            for lesson in lessons if lesson.status == "done"
+        ],
+        missing=[lesson.position for lesson in lessons if lesson.status != "done"],
+    )
+    extension = "msgpack" if wants_msgpack(request) else "json"
+    return negotiated_response(
+        request, document,
+        headers={"Content-Disposition": f'attachment; filename="term-plan-{term.id}.{extension}"'},
+    )
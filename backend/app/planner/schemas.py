@@ -1,5 +1,8 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime
+from typing import List, Optional
+
+from app.config import settings
 
 
 class PlannerRequest(BaseModel):
@@ -19,3 +22,77 @@ class PlannerResponse(BaseModel):
     competencies: List[str]
     methods: List[TeachingMethod]
     teacher_tip: str
+
+
+class TermPlanRequest(BaseModel):
+    grade: int = Field(..., ge=1, le=12)
+    subject: str = Field(..., min_length=1)
+    period_minutes: int = Field(40, ge=5, le=180)
+    topics: List[str] = Field(..., min_length=1)
+
+    @field_validator("subject")
+    @classmethod
+    def collapse_spaces(cls, value: str) -> str:
+        return " ".join(value.split())
+
+    @field_validator("topics")
+    @classmethod
+    def clean_topics(cls, values: List[str]) -> List[str]:
+        # Trimmed, without blanks or case-insensitive repeats, in term order
+        seen = {}
+        for value in values:
+            value = " ".join(value.split())
+            if value and value.lower() not in seen:
+                seen[value.lower()] = value
+        if not seen:
+            raise ValueError("At least one topic is required")
+        if len(seen) > settings.TERM_PLAN_MAX_TOPICS:
+            raise ValueError(f"At most {settings.TERM_PLAN_MAX_TOPICS} topics per term plan")
+        return list(seen.values())
+
+
+class TermPlanLessonStatus(BaseModel):
+    position: int
+    topic: str
+    status: str  # pending | running | done | failed
+    error: Optional[str] = None
+
+
+class TermPlanProgress(BaseModel):
+    total: int
+    pending: int
+    running: int
+    done: int
+    failed: int
+
+
+class TermPlanStatus(BaseModel):
+    id: int
+    grade: int
+    subject: str
+    period_minutes: int
+    status: str  # pending | running | done | partial | paused
+    error: Optional[str] = None
+    progress: TermPlanProgress
+    lessons: List[TermPlanLessonStatus]
+    created_at: datetime
+
+
+class TermPlanDocumentLesson(BaseModel):
+    position: int
+    topic: str
+    plan: PlannerResponse
+
+
+class TermPlanDocument(BaseModel):
+    """
+    Every finished plan of a term in one download; `missing` lists the
+    positions not generated (yet).
+    """
+    id: int
+    grade: int
+    subject: str
+    period_minutes: int
+    complete: bool
+    lessons: List[TermPlanDocumentLesson]
+    missing: List[int] = []
@@ -0,0 +1,252 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.jobs.queue import job_queue
+from app.planner.models import TermPlan, TermPlanLesson
+from app.usage import QuotaExceeded, attribute_usage
+
+logger = logging.getLogger(__name__)
+
+TERM_PLAN_JOB = "term_plan"
+
+LESSON_LEASE = timedelta(seconds=300)  # a claimed lesson not finished by then is retried
+LEASE_POLL_SECONDS = 2
+FINISHED = ("done", "partial", "paused")
+
+
+class CallPacer:
+    """
+    Spaces LLM calls at least 60 / `per_minute` seconds apart across
+    threads, so a term plan stays under the provider's rate limit.
+    """
+
+    def __init__(self, per_minute: int):
+        self._interval = 60.0 / per_minute if per_minute else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self._interval
+        if start > now:
+            time.sleep(start - now)
+
+
+# Shared by every term plan running in this worker
+_llm_slots = threading.BoundedSemaphore(settings.TERM_PLAN_CONCURRENCY)
+_pacer = CallPacer(settings.TERM_PLAN_CALLS_PER_MINUTE)
+
+
+def create_term_plan(db: Session, teacher_id: int, grade: int, subject: str,
+                     period_minutes: int, topics: list[str]) -> TermPlan:
+    """
+    Insert a term plan with its lessons and generation job, uncommitted;
+    call job_queue.wake() after commit.
+    """
+    term = TermPlan(teacher_id=teacher_id, grade=grade, subject=subject, period_minutes=period_minutes)
+    db.add(term)
+    db.flush()
+    db.add_all(
+        TermPlanLesson(term_plan_id=term.id, position=i, topic=topic)
+        for i, topic in enumerate(topics, start=1)
+    )
+    term.job_id = job_queue.enqueue(db, TERM_PLAN_JOB, {"term_plan_id": term.id}).id
+    db.flush()
+    return term
+
+
+def resume_term_plan(db: Session, term: TermPlan):
+    """
+    Queue failed and unfinished lessons again, uncommitted.
+    """
+    db.query(TermPlanLesson).filter(
+        TermPlanLesson.term_plan_id == term.id,
+        TermPlanLesson.status == "failed",
+    ).update(
+        {TermPlanLesson.status: "pending", TermPlanLesson.attempts: 0, TermPlanLesson.error: None},
+        synchronize_session=False,
+    )
+    term.status = "pending"
+    term.error = None
+    term.job_id = job_queue.enqueue(db, TERM_PLAN_JOB, {"term_plan_id": term.id}).id
+    db.flush()
+
+
+def _claimable(term_plan_id: int, now: datetime):
+    return and_(
+        TermPlanLesson.term_plan_id == term_plan_id,
+        or_(
+            TermPlanLesson.status == "pending",
+            and_(TermPlanLesson.status == "running", TermPlanLesson.locked_until < now),
+        ),
+    )
+
+
+def _claim_lesson(term_plan_id: int) -> Optional[tuple]:
+    """
+    Claim the next unfinished lesson with a conditional UPDATE, so several
+    workers (or a job resumed after its lease expired) never generate the
+    same lesson twice. Returns (id, topic) or None when nothing is left.
+    """
+    db = SessionLocal()
+    try:
+        while True:
+            now = datetime.utcnow()
+            row = (
+                db.query(TermPlanLesson.id, TermPlanLesson.topic)
+                .filter(_claimable(term_plan_id, now))
+                .order_by(TermPlanLesson.position)
+                .first()
+            )
+            if row is None:
+                return None
+            updated = (
+                db.query(TermPlanLesson)
+                .filter(TermPlanLesson.id == row.id, _claimable(term_plan_id, now))
+                .update(
+                    {
+                        TermPlanLesson.status: "running",
+                        TermPlanLesson.locked_until: now + LESSON_LEASE,
+                        TermPlanLesson.attempts: TermPlanLesson.attempts + 1,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            if updated:
+                return row.id, row.topic
+    finally:
+        db.close()
+
+
+def _finish_lesson(lesson_id: int, **values):
+    db = SessionLocal()
+    try:
+        db.query(TermPlanLesson).filter(TermPlanLesson.id == lesson_id).update(
+            {"locked_until": None, "finished_at": datetime.utcnow(), **values},
+            synchronize_session=False,
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _generate_lessons(term: dict, quota_hit: threading.Event):
+    """
+    Worker loop: claim a lesson, generate its plan and save it right away,
+    until no lesson is left or the teacher's quota is used up.
+    """
+    # planner.router imports this module for its routes
+    from app.planner.router import generate_plan
+
+    while not quota_hit.is_set():
+        # Claim only once an LLM slot is free and the pacer lets us call,
+        # so a lesson's lease runs from the start of its generation rather
+        # than from when it queued behind other term plans
+        with _llm_slots:
+            _pacer.wait()
+            claimed = _claim_lesson(term["id"])
+            if claimed is None:
+                return
+            lesson_id, topic = claimed
+
+            try:
+                plan = generate_plan(term["grade"], term["subject"], term["period_minutes"], topic=topic)
+            except QuotaExceeded:
+                quota_hit.set()
+                _finish_lesson(lesson_id, status="pending", attempts=TermPlanLesson.attempts - 1, finished_at=None)
+                return
+            except Exception as e:
+                logger.warning("Term plan %s lesson %s failed: %s", term["id"], lesson_id, e)
+                _finish_lesson(lesson_id, status="failed", error=str(e)[:500])
+                continue
+
+        _finish_lesson(lesson_id, status="done", plan=plan.model_dump(mode="json"), error=None)
+
+
+def _requeue_failed(db: Session, term_plan_id: int) -> int:
+    """
+    Put failed lessons with attempts left back in the queue; returns how many.
+    """
+    requeued = db.query(TermPlanLesson).filter(
+        TermPlanLesson.term_plan_id == term_plan_id,
+        TermPlanLesson.status == "failed",
+        TermPlanLesson.attempts < settings.TERM_PLAN_LESSON_ATTEMPTS,
+    ).update({TermPlanLesson.status: "pending"}, synchronize_session=False)
+    db.commit()
+    return requeued
+
+
+@job_queue.handler(TERM_PLAN_JOB)
+def generate_term_plan(db: Session, payload: dict):
+    """
+    Background job: generate every unfinished lesson of a term plan,
+    TERM_PLAN_CONCURRENCY at a time. Each plan is committed as soon as it
+    is ready, so a restarted job picks up where the last one stopped.
+    """
+    term = db.get(TermPlan, payload["term_plan_id"])
+    if term is None or term.status in FINISHED:
+        return
+    term.status = "running"
+    db.commit()
+
+    snapshot = {"id": term.id, "grade": term.grade, "subject": term.subject, "period_minutes": term.period_minutes}
+    quota_hit = threading.Event()
+
+    with attribute_usage(term.teacher_id, f"job:{TERM_PLAN_JOB}"):
+        _requeue_failed(db, term.id)
+        while True:
+            with ThreadPoolExecutor(settings.TERM_PLAN_CONCURRENCY, thread_name_prefix="term-plan") as pool:
+                workers = [
+                    pool.submit(copy_context().run, _generate_lessons, snapshot, quota_hit)
+                    for _ in range(settings.TERM_PLAN_CONCURRENCY)
+                ]
+            for worker in workers:
+                worker.result()  # a database error fails the job, which is retried
+
+            if quota_hit.is_set():
+                break
+            _requeue_failed(db, term.id)
+            counts = lesson_counts(db, term.id)
+            if counts["pending"]:
+                continue
+            if counts["running"]:
+                # Leased by a run that was presumed dead; wait for it to
+                # finish them or for the lease to expire, then claim them
+                time.sleep(LEASE_POLL_SECONDS)
+                continue
+            break
+
+    counts = lesson_counts(db, term.id)
+    if quota_hit.is_set():
+        term.status, term.error = "paused", "Daily AI limit reached; resume the term plan tomorrow"
+    elif counts["failed"]:
+        term.status, term.error = "partial", f"{counts['failed']} lesson(s) could not be generated"
+    else:
+        term.status, term.error = "done", None
+
+
+def lesson_counts(db: Session, term_plan_id: int) -> dict:
+    counts = dict(
+        db.query(TermPlanLesson.status, func.count())
+        .filter(TermPlanLesson.term_plan_id == term_plan_id)
+        .group_by(TermPlanLesson.status)
+        .all()
+    )
+    return {
+        status: counts.get(status, 0) for status in ("pending", "running", "done", "failed")
+    } | {"total": sum(counts.values())}
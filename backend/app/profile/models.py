@@ -2,9 +2,10 @@ from sqlalchemy import Column, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 
 from app.database import Base
+from app.sync.models import ChangeTracked
 
 
-class Profile(Base):
+class Profile(ChangeTracked, Base):
     __tablename__ = "profiles"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
+from app.caching import check_not_modified, bump_version
 from app.database import get_db
 from app.profile.models import Profile
 from app.profile.schemas import ProfileCreate, ProfileResponse
@@ -15,9 +16,13 @@ router = APIRouter(
 
 @router.get("/", response_model=ProfileResponse)
 def get_profile(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    check_not_modified(request, response, db, f"profile:{current_user.id}", "private, no-cache")
+
     profile = db.query(Profile).filter(
         Profile.teacher_id == current_user.id
     ).first()
@@ -55,6 +60,7 @@ def create_profile(
     )
 
     db.add(profile)
+    bump_version(db, f"profile:{current_user.id}")
     db.commit()
     db.refresh(profile)
 
@@ -81,6 +87,7 @@ def update_profile(
     profile.bio = profile_data.bio
     profile.expertise = profile_data.expertise
 
+    bump_version(db, f"profile:{current_user.id}")
     db.commit()
     db.refresh(profile)
 
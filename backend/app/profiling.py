@@ -0,0 +1,256 @@
+# app/profiling.py
+
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+
+from app.config import settings
+from app.dependencies import is_admin_token
+
+PROFILE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+_current: ContextVar[Optional["Profile"]] = ContextVar("profile", default=None)
+
+
+class Profile:
+    """
+    One profiled request: per-stage wall time for the Server-Timing header,
+    plus stack samples of the request's own work: the event-loop thread
+    only while this request's task is running on it, and other threads only
+    while they are inside one of its stages.
+    """
+
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.samples = Counter()
+        self.threads = Counter()  # thread id -> stages of this request open in it
+        self._threads_lock = threading.Lock()
+        self._anchor = None  # (loop thread id, frame of the request's middleware call)
+        self._done = threading.Event()
+        self._sampler = None
+
+    def anchor(self, frame):
+        """
+        Sample the calling (event-loop) thread only while `frame`, a frame
+        of this request's task, is on its stack.
+        """
+        self._anchor = (threading.get_ident(), frame)
+
+    def watch_thread(self):
+        with self._threads_lock:
+            self.threads[threading.get_ident()] += 1
+
+    def unwatch_thread(self):
+        ident = threading.get_ident()
+        with self._threads_lock:
+            self.threads[ident] -= 1
+            if self.threads[ident] <= 0:
+                del self.threads[ident]
+
+    def add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def start_sampling(self, interval: float):
+        self._sampler = threading.Thread(target=self._sample, args=(interval,), name="profiler", daemon=True)
+        self._sampler.start()
+
+    def _sample(self, interval: float):
+        loop_ident, anchor = self._anchor or (None, None)
+        while not self._done.wait(interval):
+            frames = sys._current_frames()
+            with self._threads_lock:
+                idents = set(self.threads)
+            if loop_ident is not None:
+                idents.add(loop_ident)
+            for ident in idents:
+                frame = frames.get(ident)
+                stack = []
+                on_request = ident != loop_ident
+                while frame is not None:
+                    on_request = on_request or frame is anchor
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                if stack and on_request:  # the loop may be running another request
+                    self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self) -> float:
+        """
+        Stop sampling without waiting for the sampler; returns the elapsed time.
+        """
+        self._done.set()
+        return time.perf_counter() - self.started
+
+    def join(self):
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def server_timing(self, total: float) -> str:
+        parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items()]
+        parts.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+    def folded(self) -> str:
+        """
+        Samples in collapsed-stack format ("a;b;c count" per line), readable
+        by flamegraph.pl, speedscope and inferno.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class stage:
+    """
+    Time a block as a named Server-Timing stage of the current request:
+
+        with stage("parse"):
+            ...
+
+    Costs one context-variable lookup when the request isn't profiled.
+    """
+
+    __slots__ = ("name", "profile", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.profile = _current.get()
+        if self.profile is not None:
+            self.profile.watch_thread()
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.profile is not None:
+            self.profile.add(self.name, time.perf_counter() - self.start)
+            self.profile.unwatch_thread()
+        return False
+
+
+def add_stage_time(name: str, seconds: float):
+    """
+    Add to a stage of the current request, if it is being profiled.
+    """
+    profile = _current.get()
+    if profile is not None:
+        profile.add(name, seconds)
+
+
+class ProfileStore:
+    """
+    Folded-stack files on disk, newest `keep` retained.
+    """
+
+    def __init__(self, directory: str, keep: int):
+        self.directory = Path(directory)
+        self.keep = keep
+
+    def path(self, profile_id: str) -> Path:
+        return self.directory / f"{profile_id}.folded"
+
+    def save(self, profile: Profile, total: float):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        header = (
+            f"# {profile.method} {profile.path}\n"
+            f"# server-timing: {profile.server_timing(total)}\n"
+        )
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, "w") as f:
+            f.write(header + profile.folded())
+        os.replace(tmp, self.path(profile.id))
+
+        files = sorted(self.directory.glob("*.folded"), key=lambda p: p.stat().st_mtime)
+        for old in files[:-self.keep]:
+            old.unlink(missing_ok=True)
+
+    def list(self) -> list:
+        files = sorted(self.directory.glob("*.folded"), key=lambda p: p.stat().st_mtime, reverse=True)
+        items = []
+        for path in files:
+            with open(path) as f:
+                request_line = f.readline()[2:].strip()
+                timing = f.readline().partition(":")[2].strip()
+            items.append({"id": path.stem, "request": request_line, "server_timing": timing})
+        return items
+
+    def get(self, profile_id: str) -> Optional[str]:
+        if not PROFILE_ID_RE.match(profile_id):
+            return None
+        path = self.path(profile_id)
+        return path.read_text() if path.exists() else None
+
+
+profile_store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_KEEP)
+
+
+def _store(profile: Profile, total: float):
+    profile.join()
+    profile_store.save(profile, total)
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a request when an admin sends `X-Profile: 1` (with a valid
+    X-Admin-Token) or when it is picked by PROFILE_SAMPLE_RATE. A profiled
+    response carries Server-Timing and X-Profile-Id headers; the stack
+    samples are stored for GET /system/profiles/{id}.
+    Unprofiled requests only pay for the header lookup / random draw.
+    """
+
+    def __init__(self, app, sample_rate: float = 0.0, interval: float = 0.005):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.interval = interval
+
+    def _wanted(self, scope) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        headers = dict(scope["headers"])
+        if headers.get(b"x-profile") != b"1":
+            return False
+        return is_admin_token(headers.get(b"x-admin-token", b"").decode("latin-1"))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(scope["method"], scope["path"])
+        profile.anchor(sys._getframe())
+        token = _current.set(profile)
+        profile.start_sampling(self.interval)
+        total = None
+
+        async def send_with_timing(message):
+            nonlocal total
+            if message["type"] == "http.response.start":
+                total = profile.stop()
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", profile.server_timing(total))
+                headers.append("X-Profile-Id", profile.id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if total is None:
+                total = profile.stop()
+            # Joining the sampler and writing/pruning files would block the loop
+            await run_in_threadpool(_store, profile, total)
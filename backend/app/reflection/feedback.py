@@ -0,0 +1,30 @@
+from sqlalchemy.orm import Session
+
+from app.caching import bump_version
+from app.coach.groq_client import call_groq
+from app.jobs.queue import job_queue
+from app.reflection.models import Reflection
+from app.reflection.prompt_rules import build_reflection_prompt
+from app.usage import attribute_usage
+
+FEEDBACK_JOB = "reflection_feedback"
+
+
+@job_queue.handler(FEEDBACK_JOB)
+def generate_reflection_feedback(db: Session, payload: dict):
+    """
+    Background job: ask the LLM for coaching feedback on a reflection
+    and store it on the row. Errors propagate so the job is retried.
+    """
+    reflection = db.get(Reflection, payload["reflection_id"])
+    if reflection is None or reflection.ai_feedback:
+        return
+
+    prompt = build_reflection_prompt(
+        mood=reflection.mood,
+        challenge=reflection.challenge,
+        success=reflection.success,
+    )
+    with attribute_usage(reflection.teacher_id, f"job:{FEEDBACK_JOB}"):
+        reflection.ai_feedback = call_groq(prompt, caller="reflection").strip()
+    bump_version(db, f"reflections:{reflection.teacher_id}")
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from app.database import Base
+from app.sync.models import ChangeTracked
 
 
-class Reflection(Base):
+class Reflection(ChangeTracked, Base):
     __tablename__ = "reflections"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -14,4 +15,47 @@ class Reflection(Base):
     challenge = Column(String, nullable=False)
     success = Column(String, nullable=False)
 
+    # Filled in asynchronously by the "reflection_feedback" background job
+    ai_feedback = Column(String, nullable=True)
+    feedback_job_id = Column(Integer, nullable=True)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Backs the per-teacher keyset listing in /reflection/ and /sync
+    __table_args__ = (
+        Index("ix_reflections_teacher_id_id", "teacher_id", "id"),
+        Index("ix_reflections_teacher_id_change_seq", "teacher_id", "change_seq"),
+    )
+
+
+class ReflectionMoodRollup(Base):
+    """
+    Reflection count per teacher, mood and day/week, kept up to date by
+    create_reflection so summaries never scan the reflection history.
+    """
+    __tablename__ = "reflection_mood_rollups"
+
+    id = Column(Integer, primary_key=True)
+    teacher_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    period = Column(String, nullable=False)  # "day" or "week"
+    period_start = Column(Date, nullable=False)  # the day, or the Monday of the week
+    mood = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("teacher_id", "period", "period_start", "mood"),
+    )
+
+
+class ReflectionChallengeKeyword(Base):
+    __tablename__ = "reflection_challenge_keywords"
+
+    id = Column(Integer, primary_key=True)
+    teacher_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    keyword = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("teacher_id", "keyword"),
+        Index("ix_reflection_challenge_keywords_teacher_id_count", "teacher_id", "count"),
+    )
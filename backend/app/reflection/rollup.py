@@ -0,0 +1,128 @@
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.utils.text import tokenize
+from app.reflection.models import ReflectionMoodRollup, ReflectionChallengeKeyword
+
+DAILY_WINDOW = 7  # days returned by the summary
+WEEKLY_WINDOW = 4  # weeks returned by the summary
+TOP_KEYWORDS = 5
+
+# English + romanised Hindi function words that say nothing about the challenge
+STOPWORDS = {
+    "the", "and", "for", "with", "was", "were", "are", "not", "but", "they",
+    "them", "this", "that", "from", "have", "had", "has", "very", "too", "some",
+    "hai", "hain", "tha", "thi", "mein", "main", "aur", "nahi", "nahin",
+    "kar", "kiya", "raha", "rahe", "rahi", "kuch", "bahut", "bhi", "koi", "kya", "liye", "wala", "wale",
+    "है", "हैं", "था", "थी", "में", "और", "नहीं", "का", "की", "के", "को", "से",
+}
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def challenge_keywords(challenge: str) -> set[str]:
+    return {
+        token for token in tokenize(challenge)
+        if len(token) > 2 and token not in STOPWORDS and not token.isdigit()
+    }
+
+
+def _increment(db: Session, model, rows: list[dict]):
+    """
+    Atomically add one to each counter row identified by the keys in `rows`,
+    creating missing ones, in a single INSERT ... ON CONFLICT DO UPDATE.
+    """
+    if not rows:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    stmt = insert(model).values([{**keys, "count": 1} for keys in rows])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(rows[0]),
+        set_={"count": model.count + 1},
+    )
+    db.execute(stmt)
+
+
+def record_reflection(db: Session, teacher_id: int, mood: str, challenge: str):
+    """
+    Fold one new reflection into the teacher's rollups, in the caller's transaction.
+    """
+    today = datetime.utcnow().date()
+    mood = mood.strip().lower()
+
+    _increment(db, ReflectionMoodRollup, [
+        {"teacher_id": teacher_id, "period": "day", "period_start": today, "mood": mood},
+        {"teacher_id": teacher_id, "period": "week", "period_start": week_start(today), "mood": mood},
+    ])
+    _increment(db, ReflectionChallengeKeyword, [
+        {"teacher_id": teacher_id, "keyword": keyword}
+        for keyword in sorted(challenge_keywords(challenge))
+    ])
+
+
+def forget_reflection(db: Session, teacher_id: int, created: date, mood: str, challenge: str):
+    """
+    Undo record_reflection for a deleted reflection created on `created`.
+    """
+    mood = mood.strip().lower()
+    rollups = [
+        (ReflectionMoodRollup, dict(teacher_id=teacher_id, period="day", period_start=created, mood=mood)),
+        (ReflectionMoodRollup, dict(teacher_id=teacher_id, period="week", period_start=week_start(created), mood=mood)),
+    ] + [
+        (ReflectionChallengeKeyword, dict(teacher_id=teacher_id, keyword=keyword))
+        for keyword in challenge_keywords(challenge)
+    ]
+    for model, keys in rollups:
+        db.query(model).filter_by(**keys).filter(model.count > 0).update(
+            {model.count: model.count - 1}, synchronize_session=False
+        )
+
+
+def build_summary(db: Session, teacher_id: int, today: Optional[date] = None) -> dict:
+    """
+    Mood counts for the last DAILY_WINDOW days and WEEKLY_WINDOW weeks (up
+    to `today`, UTC by default) plus the most frequent challenge keywords.
+    Reads a bounded number of rollup rows.
+    """
+    today = today or datetime.utcnow().date()
+    first_day = today - timedelta(days=DAILY_WINDOW - 1)
+    first_week = week_start(today) - timedelta(weeks=WEEKLY_WINDOW - 1)
+
+    rollups = (
+        db.query(ReflectionMoodRollup)
+        .filter(ReflectionMoodRollup.teacher_id == teacher_id)
+        .filter(
+            ((ReflectionMoodRollup.period == "day") & (ReflectionMoodRollup.period_start >= first_day))
+            | ((ReflectionMoodRollup.period == "week") & (ReflectionMoodRollup.period_start >= first_week))
+        )
+        .all()
+    )
+
+    daily = {first_day + timedelta(days=i): {} for i in range(DAILY_WINDOW)}
+    weekly = {first_week + timedelta(weeks=i): {} for i in range(WEEKLY_WINDOW)}
+    for row in rollups:
+        bucket = daily if row.period == "day" else weekly
+        if row.period_start in bucket and row.count:
+            bucket[row.period_start][row.mood] = row.count
+
+    keywords = (
+        db.query(ReflectionChallengeKeyword)
+        .filter(ReflectionChallengeKeyword.teacher_id == teacher_id, ReflectionChallengeKeyword.count > 0)
+        .order_by(ReflectionChallengeKeyword.count.desc())
+        .limit(TOP_KEYWORDS)
+        .all()
+    )
+
+    return {
+        "daily": [{"period_start": day, "moods": moods} for day, moods in daily.items()],
+        "weekly": [{"period_start": week, "moods": moods} for week, moods in weekly.items()],
+        "top_challenges": [{"keyword": k.keyword, "count": k.count} for k in keywords],
+    }
@@ -1,9 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+from datetime import datetime
+import asyncio
+import time
 
+from app.caching import check_not_modified, bump_version
 from app.database import get_db
+from app.group_commit import commit_write
+from app.jobs.models import Job
+from app.jobs.queue import job_queue
+from app.pagination import id_keyset_page
+from app.responses import validated_response
+from app.reflection.feedback import FEEDBACK_JOB
 from app.reflection.models import Reflection
-from app.reflection.schemas import ReflectionCreate, ReflectionResponse
+from app.reflection.rollup import record_reflection, forget_reflection, build_summary
+from app.reflection.schemas import (
+    ReflectionCreate,
+    ReflectionResponse,
+    ReflectionPage,
+    ReflectionSummary,
+    ReflectionFeedback,
+)
 from app.auth.jwt import get_current_user
 from app.auth.models import User
 
@@ -13,14 +32,12 @@ router = APIRouter(
 )
 
 
-@router.post("/", response_model=ReflectionResponse)
-def create_reflection(
-    data: ReflectionCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
+def insert_reflection(db: Session, teacher_id: int, data: ReflectionCreate) -> ReflectionResponse:
+    """
+    Insert a reflection with its rollups and feedback job, uncommitted.
+    """
     reflection = Reflection(
-        teacher_id=current_user.id,   # ✅ FIX HERE
+        teacher_id=teacher_id,   # ✅ FIX HERE
         reflection_text=data.reflection_text,
         mood=data.mood,
         challenge=data.challenge,
@@ -28,19 +45,149 @@ def create_reflection(
     )
 
     db.add(reflection)
+    db.flush()
+    record_reflection(db, teacher_id, data.mood, data.challenge)
+
+    # AI feedback is generated in the background; clients poll /{id}/feedback
+    job = job_queue.enqueue(db, FEEDBACK_JOB, {"reflection_id": reflection.id})
+    reflection.feedback_job_id = job.id
+
+    bump_version(db, f"reflections:{teacher_id}")
+    db.flush()
+    return ReflectionResponse.model_validate(reflection, from_attributes=True)
+
+
+@router.post("/", response_model=ReflectionResponse)
+def create_reflection(
+    data: ReflectionCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    teacher_id = current_user.id
+    reflection = commit_write(db, lambda session: insert_reflection(session, teacher_id, data))
+    job_queue.wake()
+
+    return validated_response(reflection)
+
+
+@router.delete("/{reflection_id}")
+def delete_reflection(
+    reflection_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Delete one of the current teacher's reflections; synced clients get a
+    tombstone for it from /sync.
+    """
+    reflection = db.query(Reflection).filter(
+        Reflection.id == reflection_id,
+        Reflection.teacher_id == current_user.id,
+    ).first()
+
+    if not reflection:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reflection not found"
+        )
+
+    created = (reflection.created_at or datetime.utcnow()).date()
+    forget_reflection(db, current_user.id, created, reflection.mood, reflection.challenge)
+    db.delete(reflection)
+    bump_version(db, f"reflections:{current_user.id}")
     db.commit()
-    db.refresh(reflection)
 
-    return reflection
+    return {"message": "Reflection deleted"}
 
 
-@router.get("/", response_model=list[ReflectionResponse])
+@router.get("/", response_model=ReflectionPage)
 def get_reflections(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Newest-first reflections of the current teacher, paginated by `next_cursor`.
+    """
+    check_not_modified(request, response, db, f"reflections:{current_user.id}", "private, no-cache")
+
+    query = db.query(Reflection).filter(Reflection.teacher_id == current_user.id)  # ✅ FIX HERE
+    rows, next_cursor = id_keyset_page(query, Reflection.id, cursor, limit)
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+@router.get("/summary", response_model=ReflectionSummary)
+def get_reflection_summary(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return (
-        db.query(Reflection)
-        .filter(Reflection.teacher_id == current_user.id)  # ✅ FIX HERE
-        .all()
+    """
+    Mood trends for recent days/weeks and top challenge keywords,
+    answered from precomputed rollups.
+    """
+    # The windows end today, so a new day changes the summary without a write
+    today = datetime.utcnow().date()
+    check_not_modified(
+        request, response, db, f"reflections:{current_user.id}", "private, no-cache",
+        variant=(today.isoformat(), datetime.combine(today, datetime.min.time())),
     )
+
+    return build_summary(db, current_user.id, today)
+
+
+FEEDBACK_POLL_INTERVAL = 0.5  # seconds
+
+
+def _feedback_status(db: Session, reflection_id: int, teacher_id: int) -> dict:
+    db.expire_all()
+    reflection = db.query(Reflection).filter(
+        Reflection.id == reflection_id,
+        Reflection.teacher_id == teacher_id,
+    ).first()
+
+    if not reflection:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reflection not found"
+        )
+
+    if reflection.ai_feedback:
+        job_status = "done"
+    elif reflection.feedback_job_id:
+        job = db.get(Job, reflection.feedback_job_id)
+        job_status = job.status if job else "failed"
+    else:
+        job_status = "failed"
+
+    return {
+        "reflection_id": reflection.id,
+        "status": job_status,
+        "feedback": reflection.ai_feedback,
+    }
+
+
+@router.get("/{reflection_id}/feedback", response_model=ReflectionFeedback)
+async def get_reflection_feedback(
+    reflection_id: int,
+    wait: int = Query(0, ge=0, le=30),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    AI feedback for a reflection. With `wait`, long-polls for up to that many
+    seconds until the background job has finished.
+    """
+    deadline = time.monotonic() + wait
+
+    while True:
+        # Sync DB access runs in the threadpool so polling never blocks the event loop
+        feedback = await run_in_threadpool(_feedback_status, db, reflection_id, current_user.id)
+        if feedback["status"] in ("done", "failed") or time.monotonic() >= deadline:
+            return feedback
+
+        await asyncio.sleep(FEEDBACK_POLL_INTERVAL)
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import date, datetime
+from typing import Dict, List, Optional
 
 
 class ReflectionCreate(BaseModel):
@@ -13,6 +14,35 @@ class ReflectionResponse(ReflectionCreate):
     id: int
     teacher_id: int
     created_at: datetime
+    ai_feedback: Optional[str] = None
+    feedback_job_id: Optional[int] = None
 
     class Config:
         orm_mode = True
+
+
+class ReflectionPage(BaseModel):
+    items: List[ReflectionResponse]
+    next_cursor: Optional[str] = None
+
+
+class MoodBucket(BaseModel):
+    period_start: date
+    moods: Dict[str, int]
+
+
+class ChallengeKeyword(BaseModel):
+    keyword: str
+    count: int
+
+
+class ReflectionSummary(BaseModel):
+    daily: List[MoodBucket]
+    weekly: List[MoodBucket]
+    top_challenges: List[ChallengeKeyword]
+
+
+class ReflectionFeedback(BaseModel):
+    reflection_id: int
+    status: str  # pending | running | done | failed
+    feedback: Optional[str] = None
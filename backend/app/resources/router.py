@@ -1,7 +1,8 @@
+import logging
 import os
 import requests
 import re
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -9,11 +10,20 @@ from app.database import get_db
 from app.auth.jwt import get_current_user
 from app.resources.schemas import VideoSuggestionRequest, VideoSuggestionResponse, Video, ClusterVideoRequest
 from app.config import settings
+from app.caching import StaticPayload
+from app.responses import validated_response
+from app.profiling import stage
+from app.resources.data import RESOURCES
 from app.coach.groq_client import call_groq
 from youtubesearchpython import VideosSearch
 
 router = APIRouter(tags=["Resources"])
 
+logger = logging.getLogger(__name__)
+
+# Curated library never changes at runtime: serialize and hash it once
+resource_library = StaticPayload(RESOURCES, "public, max-age=86400")
+
 def parse_duration(duration_str: str) -> str:
     """Parses ISO 8601 duration (e.g. PT5M33S) to human readable (e.g. 5:33)"""
     match = re.match(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?', duration_str)
@@ -53,13 +63,17 @@ def is_within_duration_simple(duration_str: str, min_mins: int = 3, max_mins: in
     except:
         return False
 
-@router.post("/video-suggestions", response_model=VideoSuggestionResponse)
-def get_video_suggestions(
-    data: VideoSuggestionRequest,
-    db: Session = Depends(get_db),
-):
+@router.get("/library")
+def get_resource_library(request: Request):
+    """
+    Curated video ids per pedagogical cluster.
+    """
+    return resource_library.respond(request)
+
+def suggest_videos(data: VideoSuggestionRequest) -> VideoSuggestionResponse:
     """
     Fetches real YouTube video recommendations based on grade, subject, and topic using youtube-search-python.
+    Falls back to curated videos when the search fails.
     """
     # 0️⃣ Generate optimized search query using Groq
     try:
@@ -73,16 +87,17 @@ def get_video_suggestions(
         Avoid: Long lectures or low-quality content.
         Respond with ONLY the search query string, nothing else.
         """
-        optimized_query = call_groq(query_prompt).strip().strip('"')
-        print(f"Optimized Query for '{data.topic}': {optimized_query}")
+        optimized_query = call_groq(query_prompt, caller="resources").strip().strip('"')
+        logger.debug("Optimized video query", extra={"topic": data.topic, "query": optimized_query})
     except Exception as e:
-        print(f"Groq query optimization failed: {e}")
+        logger.warning("Groq query optimization failed: %s", e)
         optimized_query = f"Grade {data.grade} {data.subject} {data.topic} educational classroom"
 
     # 1️⃣ Search for videos using youtube-search-python (Quota-free)
     try:
-        videos_search = VideosSearch(optimized_query, limit=10)
-        search_results = videos_search.result().get("result", [])
+        with stage("search"):
+            videos_search = VideosSearch(optimized_query, limit=10)
+            search_results = videos_search.result().get("result", [])
         
         if not search_results:
             return VideoSuggestionResponse(videos=[], disclaimer="No videos found for this topic.")
@@ -128,7 +143,7 @@ def get_video_suggestions(
         )
 
     except Exception as e:
-        print(f"YouTube Search Error: {str(e)}")
+        logger.warning("YouTube search error: %s", e)
         # Return high-quality pedagogical fallback videos if search fails
         return VideoSuggestionResponse(
             videos=[
@@ -157,6 +172,16 @@ def get_video_suggestions(
             disclaimer="Note: Real-time search is currently unavailable. Providing curated pedagogical resources."
         )
 
+@router.post("/video-suggestions", response_model=VideoSuggestionResponse)
+def get_video_suggestions(
+    data: VideoSuggestionRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Fetches real YouTube video recommendations based on grade, subject, and topic using youtube-search-python.
+    """
+    return validated_response(suggest_videos(data))
+
 @router.post("/cluster-videos", response_model=VideoSuggestionResponse)
 def get_cluster_videos(
     data: ClusterVideoRequest,
@@ -168,11 +193,12 @@ def get_cluster_videos(
     # 1️⃣ Search for videos using youtube-search-python (Quota-free)
     try:
         query = f"{data.cluster_name} {data.description} teaching tips classroom"
-        videos_search = VideosSearch(query, limit=10)
-        search_results = videos_search.result().get("result", [])
+        with stage("search"):
+            videos_search = VideosSearch(query, limit=10)
+            search_results = videos_search.result().get("result", [])
         
         if not search_results:
-            return VideoSuggestionResponse(videos=[], disclaimer="No videos found for this cluster.")
+            return validated_response(VideoSuggestionResponse(videos=[], disclaimer="No videos found for this cluster."))
 
         suggested_videos = []
         for item in search_results:
@@ -204,15 +230,15 @@ def get_cluster_videos(
                     url=item["link"]
                 ))
 
-        return VideoSuggestionResponse(
+        return validated_response(VideoSuggestionResponse(
             videos=suggested_videos,
             disclaimer="Pedagogical resources for classroom improvement."
-        )
+        ))
 
     except Exception as e:
-        print(f"YouTube Cluster Search Error: {str(e)}")
+        logger.warning("YouTube cluster search error: %s", e)
         # Return high-quality pedagogical fallback videos if API fails
-        return VideoSuggestionResponse(
+        return validated_response(VideoSuggestionResponse(
             videos=[
                 Video(
                     id="8mX_5N-uVls",
@@ -237,5 +263,5 @@ def get_cluster_videos(
                 )
             ],
             disclaimer="Note: Search error. Providing curated pedagogical resources."
-        )
+        ))
 
@@ -0,0 +1,73 @@
+# app/responses.py
+
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from app.profiling import stage
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - MessagePack is then not offered
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class: renders with orjson when it is installed.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def validated_response(model: BaseModel, **kwargs) -> FastJSONResponse:
+    """
+    Return a model that is already validated without FastAPI validating
+    it again against the route's response_model.
+    """
+    with stage("serialize"):
+        return FastJSONResponse(model.model_dump(mode="json"), **kwargs)
+
+
+class MsgPackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, use_bin_type=True)
+
+
+def wants_msgpack(request: Request) -> bool:
+    """
+    True when the client accepts MessagePack and it is installed.
+    """
+    accept = request.headers.get("accept", "")
+    return msgpack is not None and any(
+        part.split(";")[0].strip() in (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+        for part in accept.split(",")
+    )
+
+
+def negotiated_response(request: Request, model: BaseModel, **kwargs) -> Response:
+    """
+    Like validated_response, but encoded as MessagePack when the client
+    asks for it with `Accept: application/msgpack`.
+    """
+    if wants_msgpack(request):
+        with stage("serialize"):
+            response = MsgPackResponse(model.model_dump(mode="json"), **kwargs)
+    else:
+        response = validated_response(model, **kwargs)
+    response.headers.append("Vary", "Accept")
+    return response
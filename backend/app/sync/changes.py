@@ -0,0 +1,110 @@
+from itertools import chain
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.caching import ResourceVersion
+from app.database import SessionLocal
+from app.sync.models import ChangeTracked, SyncTombstone
+
+SYNC_SCOPE = "sync"  # ResourceVersion row holding the last change_seq handed out
+
+TRACKED_TABLES = ("reflections", "peer_posts", "profiles")
+
+
+def next_change_seqs(db: Session, count: int) -> int:
+    """
+    Reserve `count` consecutive change_seq values and return the last one.
+
+    The counter row stays locked until the caller commits, so writers
+    commit in change_seq order and a client never skips a change that
+    becomes visible after it has synced past it. Call it as late as
+    possible: _stamp_changes does so right before COMMIT, so the lock is
+    held for a few statements rather than the whole transaction.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    stmt = insert(ResourceVersion).values(scope=SYNC_SCOPE, version=count)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["scope"],
+        set_={"version": ResourceVersion.version + count},
+    ).returning(ResourceVersion.version)
+    return db.execute(stmt).scalar_one()
+
+
+def _pending(session: Session) -> dict:
+    return session.info.setdefault("sync_changes", {"changed": {}, "deleted": {}})
+
+
+@event.listens_for(SessionLocal, "before_flush")
+def _collect_changes(session: Session, flush_context, instances):
+    """
+    Remember every change-tracked row inserted, updated or deleted in this
+    transaction; they are numbered in _stamp_changes at commit.
+    """
+    pending = _pending(session)
+    for obj in chain(session.new, session.dirty):
+        if isinstance(obj, ChangeTracked) and session.is_modified(obj):
+            pending["changed"][id(obj)] = obj
+    for obj in session.deleted:
+        if isinstance(obj, ChangeTracked):
+            pending["changed"].pop(id(obj), None)
+            pending["deleted"][id(obj)] = (obj, obj.__tablename__, obj.id, getattr(obj, "teacher_id", None))
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _stamp_changes(session: Session):
+    """
+    Give every change-tracked row written in the transaction a fresh
+    change_seq and record a tombstone for every deleted one, just before
+    COMMIT. Rows from rolled-back savepoints are skipped.
+    """
+    if session.in_nested_transaction():
+        return  # a savepoint; the outer commit numbers its rows
+    session.flush()
+    pending = session.info.pop("sync_changes", None)
+    if not pending:
+        return
+
+    changed = [obj for obj in pending["changed"].values() if inspect(obj).persistent]
+    deleted = [entry for entry in pending["deleted"].values() if inspect(entry[0]).was_deleted]
+    if not changed and not deleted:
+        return
+
+    seq = next_change_seqs(session, len(changed) + len(deleted)) - len(changed) - len(deleted)
+    by_table = {}
+    for obj in changed:
+        seq += 1
+        by_table.setdefault(obj.__tablename__, []).append({"id": obj.id, "seq": seq})
+    # Plain SQL, so the ORM's updated_at onupdate doesn't fire a second time
+    for table, params in by_table.items():
+        session.execute(text(f"UPDATE {table} SET change_seq = :seq WHERE id = :id"), params)
+    for _, entity, entity_id, owner_id in deleted:
+        seq += 1
+        session.add(SyncTombstone(entity=entity, entity_id=entity_id, owner_id=owner_id, change_seq=seq))
+    session.flush()
+
+
+@event.listens_for(SessionLocal, "after_transaction_end")
+def _forget_changes(session: Session, transaction):
+    if transaction.parent is None:
+        session.info.pop("sync_changes", None)
+
+
+def backfill_change_seqs(engine):
+    """
+    Number the rows from before /sync existed (change_seq still 0, see
+    alembic revision 0005), so clients that sync from scratch get them.
+    """
+    with engine.begin() as conn:
+        db = Session(bind=conn)
+        for table in TRACKED_TABLES:
+            max_id = conn.execute(text(f"SELECT MAX(id) FROM {table} WHERE change_seq = 0")).scalar()
+            if max_id is None:
+                continue
+            # id is unique, so base + id gives every old row its own change_seq
+            base = next_change_seqs(db, max_id) - max_id
+            conn.execute(text(f"UPDATE {table} SET change_seq = :base + id WHERE change_seq = 0"), {"base": base})
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, String
+
+from app.database import Base
+
+
+class ChangeTracked:
+    """
+    Mixin for tables served by /sync. `change_seq` is stamped from one
+    global counter on every insert and update (see app/sync/changes.py),
+    so a client's watermark is simply the highest value it has seen.
+    """
+    change_seq = Column(Integer, nullable=False, default=0, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SyncTombstone(Base):
+    """
+    Marker left behind by a deleted change-tracked row, so clients that
+    synced it before learn to drop their copy.
+    """
+    __tablename__ = "sync_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String, nullable=False)  # table name of the deleted row
+    entity_id = Column(Integer, nullable=False)
+    owner_id = Column(Integer, nullable=True)  # teacher_id; None for public rows
+    change_seq = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_sync_tombstones_entity_change_seq", "entity", "change_seq"),
+    )
@@ -0,0 +1,97 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.database import get_db
+from app.peer.models import PeerPost
+from app.profile.models import Profile
+from app.reflection.models import Reflection
+from app.responses import negotiated_response
+from app.sync.models import SyncTombstone
+from app.sync.schemas import (
+    EntityChanges,
+    PeerPostChange,
+    ProfileChange,
+    ReflectionChange,
+    SyncResponse,
+)
+from app.auth.jwt import get_current_user
+from app.auth.models import User
+
+router = APIRouter(
+    prefix="/sync",
+    tags=["Sync"]
+)
+
+
+def _changes_since(db: Session, model, schema, cursor: int, limit: int, owner_id: Optional[int]):
+    """
+    Up to `limit` upserts and tombstones of one entity with change_seq above
+    `cursor`, oldest first, plus the cursor to send next time.
+    """
+    rows = db.query(model).filter(model.change_seq > cursor)
+    tombstones = db.query(SyncTombstone.entity_id, SyncTombstone.change_seq).filter(
+        SyncTombstone.entity == model.__tablename__,
+        SyncTombstone.change_seq > cursor,
+    )
+    if owner_id is not None:
+        rows = rows.filter(model.teacher_id == owner_id)
+        tombstones = tombstones.filter(SyncTombstone.owner_id == owner_id)
+
+    # Fetch one extra of each to know whether another page exists
+    rows = rows.order_by(model.change_seq).limit(limit + 1).all()
+    tombstones = tombstones.order_by(SyncTombstone.change_seq).limit(limit + 1).all()
+
+    changes = sorted(
+        [(row.change_seq, row, None) for row in rows]
+        + [(t.change_seq, None, t.entity_id) for t in tombstones],
+        key=lambda change: change[0],
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    return EntityChanges[schema](
+        upserts=[schema.model_validate(row, from_attributes=True) for _, row, _ in changes if row is not None],
+        deleted=[entity_id for _, row, entity_id in changes if row is None],
+        cursor=changes[-1][0] if changes else cursor,
+        has_more=has_more,
+    )
+
+
+@router.get("/", response_model=SyncResponse)
+def sync(
+    request: Request,
+    reflections: Optional[int] = Query(None, ge=0),
+    peer_posts: Optional[int] = Query(None, ge=0),
+    profile: Optional[int] = Query(None, ge=0),
+    limit: int = Query(200, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Changes since the client's per-entity cursors: rows inserted or updated
+    (`upserts`) and ids of deleted rows (`deleted`). Start each cursor at 0
+    and send back the returned `cursor`; repeat while `has_more` is true.
+    Entities without a cursor are skipped, unless no cursor is given at all,
+    which syncs everything from the start.
+    Send `Accept: application/msgpack` for a MessagePack body.
+    """
+    cursors = {"reflections": reflections, "peer_posts": peer_posts, "profile": profile}
+    if all(cursor is None for cursor in cursors.values()):
+        cursors = dict.fromkeys(cursors, 0)
+
+    result = SyncResponse()
+    if cursors["reflections"] is not None:
+        result.reflections = _changes_since(
+            db, Reflection, ReflectionChange, cursors["reflections"], limit, current_user.id
+        )
+    if cursors["peer_posts"] is not None:
+        result.peer_posts = _changes_since(
+            db, PeerPost, PeerPostChange, cursors["peer_posts"], limit, None
+        )
+    if cursors["profile"] is not None:
+        result.profile = _changes_since(
+            db, Profile, ProfileChange, cursors["profile"], limit, current_user.id
+        )
+
+    return negotiated_response(request, result)
@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Generic, List, Optional, TypeVar
+
+from app.peer.schemas import PeerPostResponse
+from app.profile.schemas import ProfileResponse
+from app.reflection.schemas import ReflectionResponse
+
+T = TypeVar("T")
+
+
+class ReflectionChange(ReflectionResponse):
+    change_seq: int
+    updated_at: Optional[datetime] = None
+
+
+class PeerPostChange(PeerPostResponse):
+    change_seq: int
+    updated_at: Optional[datetime] = None
+
+
+class ProfileChange(ProfileResponse):
+    change_seq: int
+    updated_at: Optional[datetime] = None
+
+
+class EntityChanges(BaseModel, Generic[T]):
+    upserts: List[T]
+    deleted: List[int]  # ids of rows deleted since the cursor
+    cursor: int  # send back as this entity's cursor on the next sync
+    has_more: bool
+
+
+class SyncResponse(BaseModel):
+    reflections: Optional[EntityChanges[ReflectionChange]] = None
+    peer_posts: Optional[EntityChanges[PeerPostChange]] = None
+    profile: Optional[EntityChanges[ProfileChange]] = None
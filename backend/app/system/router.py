@@ -1,8 +1,80 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
 from app.system.health import health_check
+from app.admission import admission_status
+from app.caching import cache_stats
+from app.coach.generation import generation_status
+from app.metrics import render
+from app.dependencies import get_db, require_admin
+from app.profiling import profile_store
+from app.usage import usage_report
 
 router = APIRouter(prefix="/system", tags=["System"])
 
 @router.get("/health")
 def health():
     return health_check()
+
+@router.get("/cache-stats")
+def get_cache_stats():
+    """
+    Per-route conditional GET counts and 304 ratio (this worker only).
+    """
+    return cache_stats()
+
+@router.get("/admission")
+def get_admission_status():
+    """
+    Current concurrency limit, in-flight and queued requests per route class.
+    """
+    return admission_status()
+
+
+@router.get("/generation")
+def get_generation_status():
+    """
+    LLM generation profile per feature: current max_tokens, observed
+    completion lengths, truncation rate and latency (this worker only).
+    """
+    return generation_status()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Prometheus text exposition of request, LLM, DB and cache metrics.
+    """
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/profiles", dependencies=[Depends(require_admin)])
+def list_profiles():
+    """
+    Stored request profiles, newest first.
+    """
+    return profile_store.list()
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+def get_profile(profile_id: str):
+    """
+    Collapsed stacks of one profiled request, for flamegraph.pl / speedscope.
+    """
+    folded = profile_store.get(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(folded)
+
+
+@router.get("/usage", dependencies=[Depends(require_admin)])
+def get_usage_report(
+    days: int = Query(1, ge=1, le=90),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    """
+    LLM calls, tokens, errors and latency per teacher and route over the
+    last `days` days, heaviest users first (user_id 0 = unauthenticated).
+    """
+    return usage_report(db, days, limit)
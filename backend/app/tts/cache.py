@@ -0,0 +1,155 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+from app.metrics import record_cache
+from app.tts.engines import TTSEngine
+
+
+PENDING_LIMIT = 10_000  # promised-but-unwritten entries kept; the oldest are forgotten
+TOUCH_SECONDS = 3600  # a file's mtime is refreshed on use at most this often
+EVICT_TO = 0.9  # eviction frees space down to this fraction of max_bytes
+
+
+class AudioCache:
+    """
+    Content-addressed store of synthesized audio on disk. The key is a hash
+    of engine + voice + language + (NFC-normalized) text, so identical
+    requests are synthesized once and files never change once written.
+    Files are kept under `max_bytes` by evicting the least recently used
+    (by mtime, refreshed when a file is served).
+    """
+
+    def __init__(self, directory: str, engine: TTSEngine, max_bytes: int):
+        self.directory = Path(directory)
+        self.engine = engine
+        self.max_bytes = max_bytes
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        # key -> (text, voice, language) for audio promised but not yet written.
+        # Per process: another worker can only serve the key once it's on disk
+        self._pending = OrderedDict()
+        self._size = None  # bytes on disk, counted on first write
+        self._size_lock = threading.Lock()
+
+    def key(self, text: str, voice: str, language: str) -> str:
+        text = unicodedata.normalize("NFC", text.strip())
+        raw = "\x1f".join([self.engine.name, voice, language, text])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.{self.engine.extension}"
+
+    def _lock(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def promise(self, text: str, voice: str, language: str) -> str:
+        """
+        Reserve a key for audio that will be synthesized later (or on first
+        fetch). The promise lives in this process only: a fetch routed to
+        another worker before presynthesize() has written the file gets a 404.
+        """
+        key = self.key(text, voice, language)
+        if not self.path(key).exists():
+            with self._locks_guard:
+                self._pending[key] = (text, voice, language)
+                while len(self._pending) > PENDING_LIMIT:
+                    self._pending.popitem(last=False)
+        return key
+
+    def get_or_create(self, text: str, voice: str, language: str) -> str:
+        key = self.key(text, voice, language)
+        path = self.path(key)
+        if path.exists():
+            record_cache("tts_audio", True)
+            self._touch(path)
+            return key
+        record_cache("tts_audio", False)
+
+        # One synthesis per key even if several requests race for it; the
+        # promise is dropped either way, so failed ones don't pile up
+        written = 0
+        try:
+            with self._lock(key):
+                if not path.exists():
+                    audio = self.engine.synthesize(text, voice, language)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    fd, tmp = tempfile.mkstemp(dir=path.parent)
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(audio)
+                    os.replace(tmp, path)
+                    written = len(audio)
+        finally:
+            with self._locks_guard:
+                self._pending.pop(key, None)
+                self._locks.pop(key, None)
+
+        if written:
+            self._grow(written)
+        return key
+
+    def _touch(self, path: Path):
+        try:
+            if time.time() - path.stat().st_mtime > TOUCH_SECONDS:
+                os.utime(path)
+        except FileNotFoundError:
+            pass  # evicted meanwhile
+
+    def _files(self) -> list:
+        return [p for p in self.directory.glob(f"*/*.{self.engine.extension}") if p.is_file()]
+
+    def _grow(self, written: int):
+        with self._size_lock:
+            if self._size is None:
+                self._size = sum(p.stat().st_size for p in self._files())
+            else:
+                self._size += written
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """
+        Delete the least recently used files until under EVICT_TO of the cap.
+        Rescans the directory, so files written by other workers count too.
+        """
+        entries = []
+        for p in self._files():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+
+        size = sum(entry[1] for entry in entries)
+        target = self.max_bytes * EVICT_TO
+        for _, file_size, p in entries:
+            if size <= target:
+                break
+            p.unlink(missing_ok=True)  # readers with the file open keep their copy
+            size -= file_size
+        self._size = size
+
+    def resolve(self, key: str):
+        """
+        Path of the audio for `key`, synthesizing a promised entry if needed.
+        Returns None for unknown keys (including ones promised by another
+        worker and not yet written); synthesis errors propagate.
+        """
+        path = self.path(key)
+        if path.exists():
+            self._touch(path)
+            return path
+
+        with self._locks_guard:
+            pending = self._pending.get(key)
+        if pending is None:
+            return None
+        self.get_or_create(*pending)
+        return path
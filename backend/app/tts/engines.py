@@ -0,0 +1,79 @@
+import io
+import math
+import shutil
+import struct
+import subprocess
+import wave
+
+
+class TTSEngine:
+    """
+    Interface for speech engines. `synthesize` returns the complete audio
+    file as bytes in `media_type`.
+    """
+    name = ""
+    media_type = "audio/wav"
+    extension = "wav"
+
+    def synthesize(self, text: str, voice: str, language: str) -> bytes:
+        raise NotImplementedError
+
+
+class ToneEngine(TTSEngine):
+    """
+    Offline, dependency-free engine for tests and local development:
+    renders one short deterministic tone per character as a WAV file.
+    """
+    name = "tone"
+
+    SAMPLE_RATE = 8000
+    CHAR_SECONDS = 0.03
+
+    def synthesize(self, text: str, voice: str, language: str) -> bytes:
+        samples_per_char = int(self.SAMPLE_RATE * self.CHAR_SECONDS)
+        frames = bytearray()
+        for ch in text:
+            freq = 0 if ch.isspace() else 220 + (ord(ch) % 48) * 10
+            for i in range(samples_per_char):
+                value = int(8000 * math.sin(2 * math.pi * freq * i / self.SAMPLE_RATE))
+                frames += struct.pack("<h", value)
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.SAMPLE_RATE)
+            wav.writeframes(bytes(frames))
+        return buffer.getvalue()
+
+
+class EspeakEngine(TTSEngine):
+    """
+    Offline synthesis through the espeak-ng (or espeak) binary,
+    which ships Hindi and English voices.
+    """
+    name = "espeak"
+
+    VOICES = {"hi": "hi", "en": "en-in"}
+
+    def __init__(self):
+        self.binary = shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def synthesize(self, text: str, voice: str, language: str) -> bytes:
+        if not self.binary:
+            raise RuntimeError("espeak-ng is not installed")
+
+        result = subprocess.run(
+            [self.binary, "--stdout", "--stdin", "-v", voice or self.VOICES.get(language, language)],
+            input=text.encode(),
+            capture_output=True,
+            timeout=30,
+            check=True,
+        )
+        return result.stdout
+
+
+ENGINES = {
+    ToneEngine.name: ToneEngine,
+    EspeakEngine.name: EspeakEngine,
+}
@@ -1,13 +1,117 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
+import logging
+import re
 
-from app.tts.service import generate_tts
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, status
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
+
+from app.dependencies import get_current_user
+from app.tts.service import generate_tts, audio_cache, engine
 
 router = APIRouter(prefix="/tts", tags=["TTS"])
 
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
 class TTSRequest(BaseModel):
-    text: str
+    text: str = Field(..., min_length=1, max_length=2000)
+    voice: str = ""
+    language: str = Field(default="hi", example="hi")
+
 
 @router.post("/")
-def tts(req: TTSRequest):
-    return generate_tts(req.text)
+def tts(req: TTSRequest, user_id: int = Depends(get_current_user)):
+    try:
+        return generate_tts(req.text, req.voice, req.language)
+    except Exception as e:
+        logger.exception("TTS error")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"TTS service error: {str(e)}"
+        )
+
+
+def _iter_file(path, start: int, length: int):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+@router.get("/audio/{audio_id}")
+def get_audio(
+    request: Request,
+    audio_id: str = Path(..., pattern="^[0-9a-f]{64}$"),
+):
+    """
+    Stream cached audio in chunks, honouring single `Range: bytes=` requests.
+    Promised audio is synthesized on first fetch (503 if that fails). Promises
+    are per worker, so a URL fetched from another worker before it's written
+    is a 404 until presynthesis finishes; clients should retry.
+    """
+    try:
+        path = audio_cache.resolve(audio_id)
+    except Exception as e:
+        logger.exception("TTS error")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"TTS service error: {str(e)}"
+        )
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audio not found"
+        )
+
+    size = path.stat().st_size
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{audio_id}"',
+        # Content-addressed: the bytes behind this URL never change
+        "Cache-Control": "public, max-age=31536000, immutable",
+    }
+
+    range_header = request.headers.get("range")
+    if not range_header:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(_iter_file(path, 0, size), media_type=engine.media_type, headers=headers)
+
+    match = RANGE_RE.match(range_header.strip())
+    if not match or match.groups() == ("", ""):
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+
+    if start > end or start >= size:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+
+    length = end - start + 1
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(length)
+    return StreamingResponse(
+        _iter_file(path, start, length),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=engine.media_type,
+        headers=headers,
+    )
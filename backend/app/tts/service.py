@@ -1,9 +1,52 @@
-def generate_tts(text: str):
+import logging
+
+from app.config import settings
+from app.tts.cache import AudioCache
+from app.tts.engines import ENGINES
+
+logger = logging.getLogger(__name__)
+
+engine = ENGINES[settings.TTS_ENGINE]()
+audio_cache = AudioCache(settings.TTS_CACHE_DIR, engine, settings.TTS_CACHE_MAX_MB * 1024 * 1024)
+
+
+def tts_language(language: str) -> str:
     """
-    Placeholder for future backend TTS.
-    Currently frontend/browser handles audio.
+    Map a coach language preference ("Hindi/Hinglish", "English", ...) to a TTS language.
     """
+    return "en" if language.strip().lower() == "english" else "hi"
+
+
+def audio_url(key: str) -> str:
+    return f"{settings.API_V1_PREFIX}/tts/audio/{key}"
+
+
+def generate_tts(text: str, voice: str = "", language: str = "hi"):
+    """
+    Synthesize `text` (or reuse the cached audio) and return where to fetch it.
+    """
+    key = audio_cache.get_or_create(text, voice, language)
     return {
-        "audio": None,
-        "text": text
+        "audio_id": key,
+        "url": audio_url(key),
+        "media_type": engine.media_type,
+        "text": text,
     }
+
+
+def promise_tts(text: str, voice: str = "", language: str = "hi") -> str:
+    """
+    URL for audio of `text` without synthesizing it yet; pair with presynthesize().
+    """
+    return audio_url(audio_cache.promise(text, voice, language))
+
+
+def presynthesize(texts: list[str], voice: str = "", language: str = "hi"):
+    """
+    Background task: fill the cache so the first playback starts instantly.
+    """
+    for text in texts:
+        try:
+            audio_cache.get_or_create(text, voice, language)
+        except Exception as e:
+            logger.warning("TTS pre-synthesis failed: %s", e)
@@ -0,0 +1,336 @@
+# app/usage.py
+
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import Column, Date, Float, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import Base, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+ANONYMOUS = 0  # user_id for calls made by unauthenticated routes
+
+
+class LlmUsage(Base):
+    """
+    LLM calls, tokens and latency per day, user and route, flushed in
+    batches by UsageAccountant.
+    """
+    __tablename__ = "llm_usage"
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)
+    user_id = Column(Integer, nullable=False)  # ANONYMOUS for unauthenticated routes
+    route = Column(String, nullable=False)
+    calls = Column(Integer, nullable=False, default=0)
+    errors = Column(Integer, nullable=False, default=0)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    latency_seconds = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        UniqueConstraint("day", "user_id", "route"),
+    )
+
+
+class QuotaExceeded(HTTPException):
+    def __init__(self, detail: str):
+        now = datetime.utcnow()
+        midnight = datetime.combine(now.date() + timedelta(days=1), time())
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(int((midnight - now).total_seconds()) + 1)},
+        )
+
+
+# Per-request {"user_id", "route" or "scope"}; a mutable dict so the auth
+# dependency (run in a worker thread) can fill in the user for call_groq
+_attribution: ContextVar[Optional[dict]] = ContextVar("llm_usage_attribution", default=None)
+
+
+class UsageAttributionMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _attribution.set({"user_id": ANONYMOUS, "scope": scope})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _attribution.reset(token)
+
+
+def attribute_user(user_id: int):
+    """
+    Charge the current request's LLM calls to `user_id`; called by the auth
+    dependencies.
+    """
+    holder = _attribution.get()
+    if holder is not None:
+        holder["user_id"] = user_id
+
+
+@contextmanager
+def attribute_usage(user_id: int, route: str):
+    """
+    Charge LLM calls made outside a request (background jobs) to `user_id`.
+    """
+    token = _attribution.set({"user_id": user_id, "route": route})
+    try:
+        yield
+    finally:
+        _attribution.reset(token)
+
+
+def current_attribution(caller: str) -> tuple[int, str]:
+    holder = _attribution.get()
+    if holder is None:
+        return ANONYMOUS, f"other:{caller}"
+    if "route" in holder:
+        return holder["user_id"], holder["route"]
+    route = holder["scope"].get("route")
+    return holder["user_id"], route.path if route else "unmatched"
+
+
+# Order of the counters kept per (day, user, route)
+CALLS, ERRORS, PROMPT_TOKENS, COMPLETION_TOKENS, LATENCY = range(5)
+
+
+class _Batch:
+    """
+    Unflushed counters: per (day, user, route) for the table, and per
+    (day, user) as [calls, tokens] for quota checks.
+    """
+
+    def __init__(self):
+        self.rows = defaultdict(lambda: [0, 0, 0, 0, 0.0])
+        self.users = defaultdict(lambda: [0, 0])
+
+    def add(self, key: tuple, counters: list):
+        row = self.rows[key]
+        for i, value in enumerate(counters):
+            row[i] += value
+        user = self.users[key[:2]]
+        user[0] += counters[CALLS]
+        user[1] += counters[PROMPT_TOKENS] + counters[COMPLETION_TOKENS]
+
+
+class UsageAccountant:
+    """
+    Counts LLM usage in memory and writes it to `llm_usage` in one batch
+    every flush interval. Daily quotas are checked against the totals read
+    back at the last flush (all workers) plus this worker's unflushed
+    counts, so no request waits on the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = _Batch()
+        self._flushing = _Batch()  # taken from _pending while a flush writes it
+        self._totals = {}  # user -> (calls, tokens) today, as of the last flush
+        self._totals_day = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def record(self, user_id: int, route: str, latency: float, prompt_tokens: int,
+               completion_tokens: int, ok: bool):
+        with self._lock:
+            self._pending.add(
+                (datetime.utcnow().date(), user_id, route),
+                [1, 0 if ok else 1, prompt_tokens, completion_tokens, latency],
+            )
+
+    def used_today(self, user_id: int) -> tuple[int, int]:
+        """
+        (calls, tokens) of `user_id` today across all workers, as of the last flush.
+        """
+        today = datetime.utcnow().date()
+        with self._lock:
+            calls, tokens = self._totals.get(user_id, (0, 0)) if self._totals_day == today else (0, 0)
+            for batch in (self._pending, self._flushing):
+                batch_calls, batch_tokens = batch.users.get((today, user_id), (0, 0))
+                calls += batch_calls
+                tokens += batch_tokens
+        return calls, tokens
+
+    def check_quota(self, user_id: int):
+        if user_id == ANONYMOUS:
+            call_quota, token_quota = settings.USAGE_ANONYMOUS_DAILY_CALL_QUOTA, 0
+        else:
+            call_quota, token_quota = settings.USAGE_DAILY_CALL_QUOTA, settings.USAGE_DAILY_TOKEN_QUOTA
+        if not call_quota and not token_quota:
+            return
+
+        calls, tokens = self.used_today(user_id)
+        if call_quota and calls >= call_quota:
+            raise QuotaExceeded(f"Daily AI request limit reached ({call_quota} per day)")
+        if token_quota and tokens >= token_quota:
+            raise QuotaExceeded(f"Daily AI token limit reached ({token_quota} per day)")
+
+    def flush(self):
+        """
+        Write the pending counters in one transaction and refresh today's
+        totals. If the write fails the counters are kept for the next attempt.
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._flushing, self._pending = self._pending, _Batch()
+                batch = self._flushing
+
+            today = datetime.utcnow().date()
+            db = SessionLocal()
+            try:
+                for (day, user_id, route), counters in batch.rows.items():
+                    _add_usage(db, day, user_id, route, counters)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                db.close()
+                logger.warning("LLM usage flush failed: %s", e)
+                with self._lock:
+                    for key, counters in batch.rows.items():
+                        self._pending.add(key, counters)
+                    self._flushing = _Batch()
+                return
+
+            try:
+                rows = (
+                    db.query(
+                        LlmUsage.user_id,
+                        func.sum(LlmUsage.calls),
+                        func.sum(LlmUsage.prompt_tokens + LlmUsage.completion_tokens),
+                    )
+                    .filter(LlmUsage.day == today)
+                    .group_by(LlmUsage.user_id)
+                    .all()
+                )
+            except Exception as e:
+                # Quotas run on the previous totals until the next flush
+                logger.warning("LLM usage totals refresh failed: %s", e)
+                rows = None
+            finally:
+                db.close()
+
+            with self._lock:
+                if rows is not None:
+                    self._totals = {user_id: (int(calls), int(tokens)) for user_id, calls, tokens in rows}
+                    self._totals_day = today
+                self._flushing = _Batch()
+
+    def start(self, interval: float):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(interval,), name="usage-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.flush()
+
+    def _loop(self, interval: float):
+        while not self._stop.wait(interval):
+            self.flush()
+
+
+def _add_usage(db: Session, day: date, user_id: int, route: str, counters: list):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    values = {
+        "calls": counters[CALLS],
+        "errors": counters[ERRORS],
+        "prompt_tokens": counters[PROMPT_TOKENS],
+        "completion_tokens": counters[COMPLETION_TOKENS],
+        "latency_seconds": counters[LATENCY],
+    }
+    stmt = insert(LlmUsage).values(day=day, user_id=user_id, route=route, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["day", "user_id", "route"],
+        set_={name: getattr(LlmUsage, name) + value for name, value in values.items()},
+    )
+    db.execute(stmt)
+
+
+usage = UsageAccountant()
+
+
+def usage_report(db: Session, days: int, limit: int) -> dict:
+    """
+    Usage per user over the last `days` days (today included), heaviest
+    token users first, each broken down by route.
+    """
+    usage.flush()
+    first_day = datetime.utcnow().date() - timedelta(days=days - 1)
+
+    rows = (
+        db.query(
+            LlmUsage.user_id,
+            LlmUsage.route,
+            func.sum(LlmUsage.calls),
+            func.sum(LlmUsage.errors),
+            func.sum(LlmUsage.prompt_tokens),
+            func.sum(LlmUsage.completion_tokens),
+            func.sum(LlmUsage.latency_seconds),
+        )
+        .filter(LlmUsage.day >= first_day)
+        .group_by(LlmUsage.user_id, LlmUsage.route)
+        .all()
+    )
+
+    users = {}
+    for user_id, route, calls, errors, prompt_tokens, completion_tokens, latency in rows:
+        entry = users.setdefault(user_id, {
+            "user_id": user_id,
+            "calls": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0,
+            "latency_seconds": 0.0, "routes": {},
+        })
+        entry["routes"][route] = {
+            "calls": calls,
+            "errors": errors,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "avg_latency_ms": round(latency / calls * 1000, 1) if calls else 0.0,
+        }
+        entry["calls"] += calls
+        entry["errors"] += errors
+        entry["prompt_tokens"] += prompt_tokens
+        entry["completion_tokens"] += completion_tokens
+        entry["latency_seconds"] += latency
+
+    report = sorted(users.values(), key=lambda u: u["prompt_tokens"] + u["completion_tokens"], reverse=True)
+    for entry in report:
+        latency = entry.pop("latency_seconds")
+        entry["avg_latency_ms"] = round(latency / entry["calls"] * 1000, 1) if entry["calls"] else 0.0
+        entry["used_today"] = dict(zip(("calls", "tokens"), usage.used_today(entry["user_id"])))
+
+    return {
+        "from": first_day.isoformat(),
+        "days": days,
+        "quotas": {
+            "daily_calls": settings.USAGE_DAILY_CALL_QUOTA,
+            "daily_tokens": settings.USAGE_DAILY_TOKEN_QUOTA,
+            "anonymous_daily_calls": settings.USAGE_ANONYMOUS_DAILY_CALL_QUOTA,
+        },
+        "users": report[:limit],
+    }
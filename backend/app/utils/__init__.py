@@ -1,4 +1,4 @@
-# app/utils.py
+# app/utils/__init__.py
 
 from datetime import datetime, timedelta
 from typing import Optional
@@ -1,12 +1,144 @@
 import re
+import unicodedata
+from typing import Iterable
 
+# Spoken fillers stripped from teacher speech before it reaches the LLM.
+# Latin letters may be stretched ("ummm", "yaaar", "achha"), so each
+# filler is listed once and repeated letters are matched by the pattern.
 FILLERS = [
-    "umm", "uh", "haan", "achha", "matlab", "yaar", "basically"
+    # Latin / Hinglish
+    "um", "uh", "hm", "haan", "matlab", "basically", "actually",
+    # Devanagari
+    "उम", "उम्म", "अं", "हम्म", "हाँ", "हां", "मतलब",
+    "बेसिकली", "एक्चुअली",
 ]
 
+# Discourse markers that are also content words ("bacche acha nahi padh
+# rahe" = "aren't studying well"): only stripped at the start of the
+# utterance or right next to a comma, where they can only be a marker
+MARKERS = ["acha", "yaar", "अच्छा", "यार"]
+
+# A word character in either script. Devanagari vowel signs and the virama
+# are combining marks, which `\w` does not match, so `\b` cannot be used.
+WORD_CHARS = r"\w\u0900-\u0963\u0966-\u097F"
+
+TOKEN_RE = re.compile(rf"[{WORD_CHARS}]+")
+REPEAT_RE = re.compile(r"([a-z])\1+")
+
+# Zero-width characters left behind by some Android keyboards
+INVISIBLE = ("\u200b", "\ufeff")
+
+# Space before punctuation, and comma runs left where a filler was removed
+PUNCT_RE = re.compile(r"(?: ?,)+(?= ?[,.!?।])| (?=[,.!?।])")
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Compile words into one regex whose alternations follow a prefix trie
+    ("uh", "um", "haan", "hm" -> "u+(?:h+|m+)|h+(?:a+n+|m+)"), so a match
+    is decided by walking the trie once instead of trying every word.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in REPEAT_RE.sub(r"\1", word.lower()):
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node) -> str:
+        branches = []
+        for ch, child in sorted(node.items()):
+            if not ch:
+                continue
+            atom = re.escape(ch) + ("+" if "a" <= ch <= "z" else "")
+            branches.append(atom + emit(child))
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = "(?:" + body + ")?"
+        return body
+
+    return emit(trie)
+
+
+FILLER_RE = re.compile(
+    rf"(?<![{WORD_CHARS}])(?:{_trie_pattern(FILLERS)})(?![{WORD_CHARS}])",
+    re.IGNORECASE,
+)
+
+# Markers are only tried at anchored positions (the start, either side of a
+# comma) instead of scanning the whole utterance a second time
+_MARKER = rf"(?:{_trie_pattern(MARKERS)})(?![{WORD_CHARS}])"
+LEADING_MARKER_RE = re.compile(rf"[ ,]*{_MARKER}", re.IGNORECASE)
+MARKER_RE = re.compile(_MARKER, re.IGNORECASE)
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Lowercased Latin/Devanagari words of `text`.
+    """
+    return TOKEN_RE.findall(unicodedata.normalize("NFC", text).lower())
+
+
+def _marker_spans(text: str) -> list[tuple[int, int]]:
+    """
+    Spans of MARKERS where they can only be discourse markers: at the start
+    of `text` (after any commas) or right before / after a comma. `text`
+    must already have its whitespace collapsed.
+    """
+    spans = []
+    leading = LEADING_MARKER_RE.match(text)
+    if leading:
+        spans.append(leading.span())
+    comma = text.find(",")
+    while comma != -1:
+        before = comma - (text[comma - 1:comma] == " ")
+        start = text.rfind(" ", 0, before) + 1
+        if MARKER_RE.fullmatch(text, start, before):
+            spans.append((start, before))
+        after = comma + 1 + (text[comma + 1:comma + 2] == " ")
+        match = MARKER_RE.match(text, after)
+        if match:
+            spans.append(match.span())
+        comma = text.find(",", comma + 1)
+    return spans
+
+
+def _cut(text: str, spans: list[tuple[int, int]]) -> str:
+    kept, end = [], 0
+    for start, stop in sorted(spans):
+        kept.append(text[end:max(start, end)])
+        end = max(end, stop)
+    kept.append(text[end:])
+    return " ".join("".join(kept).split())
+
+
 def normalize_text(text: str) -> str:
-    text = text.lower()
-    for word in FILLERS:
-        text = re.sub(rf"\b{word}\b", "", text)
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+    """
+    Clean one utterance: NFC, drop fillers in both scripts as whole words
+    (MARKERS only where they can't be content), collapse whitespace and
+    leftover punctuation. Case is preserved.
+    """
+    if not unicodedata.is_normalized("NFC", text):
+        text = unicodedata.normalize("NFC", text)
+    for ch in INVISIBLE:
+        if ch in text:
+            text = text.replace(ch, "")
+
+    text, removed = FILLER_RE.subn("", text)
+    text = " ".join(text.split())
+    spans = _marker_spans(text)
+    if spans:
+        text = _cut(text, spans)
+        removed += len(spans)
+    if removed:
+        text = PUNCT_RE.sub("", text)
+    return text.strip(" ,")
+
+
+def normalize_batch(texts: Iterable[str]) -> list[str]:
+    """
+    normalize_text over a list of utterances (e.g. a transcript split into turns).
+    """
+    return [normalize_text(text) for text in texts]
@@ -0,0 +1,169 @@
+"""
+Local stand-in for the Groq chat completions API, for load tests.
+
+Answers with canned output shaped like what each feature's prompt asks
+for (coach cards, lesson plan JSON, a search query, plain text), after a
+latency drawn from a log-normal distribution, and fails a configurable
+share of calls the way Groq does (429/500 with an "error" body).
+Output longer than max_tokens (~4 characters per token) is cut off with
+finish_reason "length".
+Requests with "stream": true get server-sent-event chunks.
+
+    cd backend
+    python -m benchmarks.fake_groq --port 8901 --median-ms 600 --sigma 0.5 --error-rate 0.02
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COACH_OUTPUT = {
+    "now_fix": {"title": "⚡ Abhi kya karein (30 second)", "text": "Taali bajakar sabka dhyan kheenchiye aur har group se ek leader chuniye."},
+    "activity": {"title": "🎯 Simple Activity", "text": "2 minute ka silent challenge: jo group bina bole 10 tak ginti likh de, woh jeetega."},
+    "explain": {"title": "💡 Concept samjhane ka tarika", "text": "Fractions ko roti ke tukdon se samjhaiye: 4 barabar hisse, har hissa 1/4."},
+}
+
+PLANNER_OUTPUT = {
+    "topic": "Introduction to Fractions",
+    "competencies": ["Understands a fraction as part of a whole", "Compares simple fractions"],
+    "methods": [
+        {"title": "Roti Sharing", "description": "Fold a paper roti into halves and quarters.", "time": "10 minutes"},
+        {"title": "Fraction Pairs", "description": "Pairs fold strips and name the fraction.", "time": "15 minutes"},
+        {"title": "Exit Ticket", "description": "Draw one fraction from daily life.", "time": "5 minutes"},
+    ],
+    "teacher_tip": "Keep the strips for equivalent fractions next week.",
+}
+
+
+def canned_reply(prompt: str) -> str:
+    if '"now_fix"' in prompt:
+        return json.dumps(COACH_OUTPUT, ensure_ascii=False)
+    if '"teacher_tip"' in prompt:
+        return json.dumps(PLANNER_OUTPUT, ensure_ascii=False)
+    if "YouTube search query" in prompt:
+        return '"class 4 maths fractions activity hindi"'
+    if "{student_name}" in prompt:
+        message = "Namaste! {student_name} is learning fractions. Please cut a roti into 4 parts with them tonight."
+        return json.dumps(dict.fromkeys(re.findall(r'"(\d+)": "\.\.\."', prompt), message))
+    return "1. Divide the class into pairs.\n2. Give each pair a strip of paper.\n3. Ask them to fold and name the parts."
+
+
+class Behaviour:
+    def __init__(self, median_ms: float, sigma: float, error_rate: float, chunk_ms: float):
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.chunk_ms = chunk_ms
+
+    def latency(self) -> float:
+        return self.median_ms / 1000 * math.exp(random.gauss(0, self.sigma)) if self.sigma else self.median_ms / 1000
+
+
+class Handler(BaseHTTPRequestHandler):
+    behaviour: Behaviour
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        prompt = payload.get("messages", [{}])[-1].get("content", "")
+
+        time.sleep(self.behaviour.latency())
+
+        if random.random() < self.behaviour.error_rate:
+            status = random.choice([429, 500])
+            self._send_json(status, {"error": {"message": "fake upstream failure", "type": "server_error"}})
+            return
+
+        reply = canned_reply(prompt)
+        finish_reason = "stop"
+        max_tokens = payload.get("max_tokens")
+        if max_tokens and len(reply) // 4 > max_tokens:
+            reply = reply[:max_tokens * 4]
+            finish_reason = "length"
+        usage = {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(reply) // 4,
+            "total_tokens": (len(prompt) + len(reply)) // 4,
+        }
+
+        if not payload.get("stream"):
+            self._send_json(200, {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "model": payload.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": finish_reason}],
+                "usage": usage,
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        words = reply.split(" ")
+        for i, word in enumerate(words):
+            delta = {"content": word if i == 0 else " " + word}
+            self._chunk(f"data: {json.dumps({'choices': [{'index': 0, 'delta': delta}]}, ensure_ascii=False)}\n\n")
+            time.sleep(self.behaviour.chunk_ms / 1000)
+        self._chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _chunk(self, text: str):
+        data = text.encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+class FakeGroq:
+    def __init__(self, port: int = 0, median_ms: float = 600, sigma: float = 0.5,
+                 error_rate: float = 0.0, chunk_ms: float = 15):
+        handler = type("FakeGroqHandler", (Handler,), {"behaviour": Behaviour(median_ms, sigma, error_rate, chunk_ms)})
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}/openai/v1/chat/completions"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--median-ms", type=float, default=600, help="median fake LLM latency")
+    parser.add_argument("--sigma", type=float, default=0.5, help="log-normal spread of the latency (0 = fixed)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls answered with 429/500")
+    parser.add_argument("--chunk-ms", type=float, default=15, help="delay between streamed chunks")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8901)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    fake = FakeGroq(args.port, args.median_ms, args.sigma, args.error_rate, args.chunk_ms)
+    print(f"Fake Groq listening on {fake.url}")
+    fake.server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Reflection inserts per second with one commit per request vs group commit.
+
+Concurrent writer threads insert reflections through the same function
+POST /reflection/ uses (rollups, feedback job and version bump included),
+either committing each one themselves or through a GroupCommitter.
+Uses a fresh SQLite file unless DATABASE_URL is set (e.g. to a scratch
+Postgres database).
+
+    cd backend
+    python -m benchmarks.group_commit --threads 32 --inserts 50
+    python -m benchmarks.group_commit --window-ms 2 --json results.json
+"""
+
+import argparse
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+
+# app.database connects on import; point it at a scratch database first
+_scratch = tempfile.mkdtemp(prefix="group-commit-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}/bench.db")
+os.environ.setdefault("JWT_SECRET", "benchmark")
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.group_commit import GroupCommitter  # noqa: E402
+from app.reflection.router import insert_reflection  # noqa: E402
+from app.reflection.schemas import ReflectionCreate  # noqa: E402
+
+REFLECTION = ReflectionCreate(
+    reflection_text="Fractions with paper strips went well; the back rows lost focus after 20 minutes.",
+    mood="Good",
+    challenge="Back benchers lose focus during group work",
+    success="Paper strip folding activity",
+)
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _per_request(teacher_id: int):
+    db = SessionLocal()
+    try:
+        insert_reflection(db, teacher_id, REFLECTION)
+        db.commit()
+    finally:
+        db.close()
+
+
+def run(mode: str, threads: int, inserts: int, window: float, max_batch: int) -> dict:
+    committer = None
+    if mode == "group":
+        committer = GroupCommitter(SessionLocal, window=window, max_batch=max_batch)
+        committer.start()
+        write = lambda teacher_id: committer.submit(lambda db: insert_reflection(db, teacher_id, REFLECTION))
+    else:
+        write = _per_request
+
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def worker(teacher_id: int):
+        for _ in range(inserts):
+            start = time.perf_counter()
+            try:
+                write(teacher_id)
+            except Exception as e:
+                with lock:
+                    errors.append(type(e).__name__)
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=worker, args=(i + 1,)) for i in range(threads)]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    result = {
+        "mode": mode,
+        "inserts": len(latencies),
+        "errors": len(errors),
+        "seconds": round(elapsed, 2),
+        "inserts_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 1) if latencies else None,
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 1) if latencies else None,
+    }
+    if committer is not None:
+        committer.stop()
+        result["commits"] = committer.batches
+        result["avg_batch"] = round(committer.writes / max(1, committer.batches), 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32, help="concurrent writers (≈ concurrent requests)")
+    parser.add_argument("--inserts", type=int, default=50, help="reflections inserted by each writer")
+    parser.add_argument("--window-ms", type=float, default=5.0, help="group commit batching window")
+    parser.add_argument("--max-batch", type=int, default=100, help="group commit batch size cap")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    print(f"database: {engine.url.render_as_string(hide_password=True)}")
+
+    results = [
+        run(mode, args.threads, args.inserts, args.window_ms / 1000, args.max_batch)
+        for mode in ("per-request", "group")
+    ]
+
+    print(f"{'mode':12} {'inserts':>8} {'errors':>7} {'ins/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'commits':>8}")
+    for r in results:
+        print(
+            f"{r['mode']:12} {r['inserts']:>8} {r['errors']:>7} {r['inserts_per_sec']:>9} "
+            f"{r['p50_ms']!s:>8} {r['p99_ms']!s:>8} {r.get('commits', r['inserts'])!s:>8}"
+        )
+    speedup = results[1]["inserts_per_sec"] / max(results[0]["inserts_per_sec"], 1e-9)
+    print(f"group commit: {speedup:.1f}x the inserts/sec of per-request commits")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Accuracy and speed of the local language detector on labelled teacher
+utterances (benchmarks/data/teacher_utterances.jsonl).
+
+Exits non-zero when accuracy falls below --min-accuracy, so it can run in CI.
+
+    cd backend
+    python -m benchmarks.language_detection [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from collections import Counter
+from pathlib import Path
+
+# app.utils loads settings on import; benchmarks need no real credentials
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("JWT_SECRET", "benchmark")
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+from app.coach.language import detect_language  # noqa: E402
+
+DATA_FILE = Path(__file__).parent / "data" / "teacher_utterances.jsonl"
+
+
+def load_samples():
+    with open(DATA_FILE, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--min-accuracy", type=float, default=0.9)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    samples = load_samples()
+
+    correct = Counter()
+    total = Counter()
+    misses = []
+    for sample in samples:
+        predicted = detect_language(sample["text"])
+        total[sample["language"]] += 1
+        if predicted == sample["language"]:
+            correct[sample["language"]] += 1
+        else:
+            misses.append((sample["language"], predicted, sample["text"]))
+
+    texts = [s["text"] for s in samples]
+    seconds = min(timeit.repeat(lambda: [detect_language(t) for t in texts], number=200, repeat=5)) / 200
+    us_per_call = seconds / len(texts) * 1e6
+    accuracy = sum(correct.values()) / len(samples)
+
+    for language in total:
+        print(f"{language:10} {correct[language]:>3}/{total[language]:<3}")
+    for expected, predicted, text in misses:
+        print(f"  miss: expected {expected}, got {predicted}: {text}")
+    print(f"accuracy {accuracy:.3f} over {len(samples)} utterances, {us_per_call:.1f} µs/call")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"accuracy": round(accuracy, 4), "us_per_call": round(us_per_call, 2)}, f, indent=2)
+
+    if accuracy < args.min_accuracy:
+        sys.exit(f"accuracy {accuracy:.3f} is below {args.min_accuracy}")
+
+
+if __name__ == "__main__":
+    main()
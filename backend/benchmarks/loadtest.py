@@ -0,0 +1,337 @@
+"""
+Mixed-traffic load test against a local copy of the app.
+
+Starts the fake Groq server (benchmarks/fake_groq.py) and the app under
+uvicorn with a throwaway SQLite database, YouTube search stubbed out and a
+fixed OTP. Then N virtual teachers log in and loop over coach, planner,
+video, reflection and peer-feed calls for --duration seconds. Reports
+throughput and p50/p95/p99 per route, and can save the results as JSON
+and compare them with an earlier run.
+
+    cd backend
+    python -m benchmarks.loadtest --users 20 --duration 60 --json loadtest.json
+    python -m benchmarks.loadtest --compare loadtest.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+
+from benchmarks import fake_groq
+
+API = "/api/v1"
+FIXED_OTP = "123456"
+
+PROBLEMS = [
+    "Group activity mein bacche disturb kar rahe hain",
+    "Bacche fractions samajh nahi pa rahe",
+    "बच्चे शोर कर रहे हैं, कोई ध्यान नहीं दे रहा",
+    "The back benchers are not participating",
+    "Class 3 aur 4 ek saath baithe hain, kaise padhaun",
+    "Students forget spellings every week",
+]
+SUBJECTS = ["Maths", "EVS", "Hindi", "English"]
+TOPICS = ["Fractions", "Water cycle", "Plants", "Addition", "Shapes"]
+MOODS = ["hopeful", "tired", "happy", "frustrated"]
+
+# scenario -> relative weight in the traffic mix
+MIX = {
+    "coach": 30,
+    "planner": 15,
+    "videos": 15,
+    "reflection_create": 8,
+    "reflection_list": 10,
+    "peer_feed": 17,
+    "peer_post": 5,
+}
+
+
+# --- App under test (runs in the uvicorn process) ----------------------
+
+class StubVideosSearch:
+    """
+    Stand-in for youtubesearchpython.VideosSearch: fixed results after a delay.
+    """
+    latency = 0.3
+
+    def __init__(self, query: str, limit: int = 10):
+        self.query = query
+        self.limit = limit
+
+    def result(self) -> dict:
+        time.sleep(self.latency)
+        return {
+            "result": [
+                {
+                    "id": f"stub{i:07d}",
+                    "title": f"{self.query} | part {i}",
+                    "channel": {"name": "Stub Channel"},
+                    "duration": f"{2 + i}:{(7 * i) % 60:02d}",
+                    "link": f"https://www.youtube.com/watch?v=stub{i:07d}",
+                }
+                for i in range(self.limit)
+            ]
+        }
+
+
+class _FixedOTP:
+    @staticmethod
+    def randint(a: int, b: int) -> int:
+        return int(FIXED_OTP)
+
+
+def stubbed_app():
+    """
+    uvicorn app factory, called in every worker process.
+    """
+    import app.auth.router as auth_router
+    import app.resources.router as resources_router
+    from app.main import app
+
+    StubVideosSearch.latency = float(os.environ.get("LOADTEST_VIDEO_LATENCY", "0.3"))
+    resources_router.VideosSearch = StubVideosSearch
+    auth_router.random = _FixedOTP
+    return app
+
+
+# --- Load generator -----------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_up(url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    async def call(self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.latencies[route].append(time.perf_counter() - start)
+            self.statuses[route]["failed"] += 1
+            return None
+        self.latencies[route].append(time.perf_counter() - start)
+        self.statuses[route][str(response.status_code)] += 1
+        return response
+
+
+async def virtual_teacher(n: int, client: httpx.AsyncClient, recorder: Recorder, deadline: float, rng: random.Random):
+    phone = f"90000{n:05d}"
+    await recorder.call(client, "POST /auth/send-otp", "POST", f"{API}/auth/send-otp", json={"phone_number": phone})
+    response = await recorder.call(
+        client, "POST /auth/verify-otp", "POST", f"{API}/auth/verify-otp",
+        json={"phone_number": phone, "otp": FIXED_OTP},
+    )
+    if response is None or response.status_code != 200:
+        return
+    auth = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    feed_etag = None
+
+    scenarios, weights = zip(*MIX.items())
+    while time.monotonic() < deadline:
+        scenario = rng.choices(scenarios, weights)[0]
+        if scenario == "coach":
+            await recorder.call(client, "POST /coach/query", "POST", f"{API}/coach/query", headers=auth, json={
+                "class_level": f"Grade {rng.randint(1, 5)}",
+                "subject": rng.choice(SUBJECTS),
+                "problem_text": rng.choice(PROBLEMS),
+            })
+        elif scenario == "planner":
+            await recorder.call(client, "POST /planner/generate-plan", "POST", f"{API}/planner/generate-plan", json={
+                "grade": rng.randint(1, 5), "subject": rng.choice(SUBJECTS), "time_available": rng.choice([30, 40, 45]),
+            })
+        elif scenario == "videos":
+            await recorder.call(client, "POST /resources/video-suggestions", "POST", f"{API}/resources/video-suggestions", json={
+                "grade": rng.randint(1, 5), "subject": rng.choice(SUBJECTS), "topic": rng.choice(TOPICS),
+            })
+        elif scenario == "reflection_create":
+            await recorder.call(client, "POST /reflection/", "POST", f"{API}/reflection/", headers=auth, json={
+                "reflection_text": "Aaj group work mein shor tha lekin leader system se madad mili.",
+                "mood": rng.choice(MOODS),
+                "challenge": rng.choice(PROBLEMS),
+                "success": "Two shy students explained the answer on the board",
+            })
+        elif scenario == "reflection_list":
+            await recorder.call(client, "GET /reflection/", "GET", f"{API}/reflection/", headers=auth)
+        elif scenario == "peer_feed":
+            headers = {"If-None-Match": feed_etag} if feed_etag else {}
+            response = await recorder.call(client, "GET /peer/posts", "GET", f"{API}/peer/posts", headers=headers)
+            if response is not None and response.status_code == 200:
+                feed_etag = response.headers.get("etag")
+        elif scenario == "peer_post":
+            await recorder.call(client, "POST /peer/post", "POST", f"{API}/peer/post", headers=auth, json={
+                "title": f"Tip from teacher {n}: {rng.choice(TOPICS)}",
+                "description": "Make Class 4 'math buddies' for Class 3 during group work.",
+            })
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+    # nearest-rank
+    index = max(0, math.ceil(q * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    routes = {}
+    for route, values in sorted(recorder.latencies.items()):
+        values.sort()
+        statuses = recorder.statuses[route]
+        routes[route] = {
+            "requests": len(values),
+            "errors": sum(n for code, n in statuses.items() if not code.startswith(("2", "3"))),
+            "statuses": dict(sorted(statuses.items())),
+            "rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(_percentile(values, 0.50) * 1000, 1),
+            "p95_ms": round(_percentile(values, 0.95) * 1000, 1),
+            "p99_ms": round(_percentile(values, 0.99) * 1000, 1),
+        }
+    total = sum(r["requests"] for r in routes.values())
+    return {
+        "total": {
+            "requests": total,
+            "errors": sum(r["errors"] for r in routes.values()),
+            "rps": round(total / elapsed, 2),
+            "seconds": round(elapsed, 1),
+        },
+        "routes": routes,
+    }
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_results(results: dict, baseline: dict = None):
+    base_routes = (baseline or {}).get("routes", {})
+    print(f"{'route':34} {'reqs':>6} {'err':>5} {'rps':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}" + ("  p95 vs base" if baseline else ""))
+    for route, r in results["routes"].items():
+        line = (
+            f"{route:34} {r['requests']:>6} {r['errors']:>5} {r['rps']:>7} "
+            f"{r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8}"
+        )
+        old = base_routes.get(route)
+        if old and old["p95_ms"]:
+            line += f"  {(r['p95_ms'] / old['p95_ms'] - 1) * 100:+.0f}%"
+        print(line)
+    t = results["total"]
+    print(f"\n{t['requests']} requests, {t['errors']} errors, {t['rps']} req/s over {t['seconds']}s")
+    if baseline:
+        print(f"baseline ({baseline['meta']['commit']}): {baseline['total']['rps']} req/s")
+
+
+async def drive(base_url: str, users: int, duration: float, seed: int) -> dict:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        start = time.monotonic()
+        deadline = start + duration
+        await asyncio.gather(*(
+            virtual_teacher(n, client, recorder, deadline, random.Random(seed + n)) for n in range(users)
+        ))
+        elapsed = time.monotonic() - start
+    return summarize(recorder, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual teachers")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of traffic")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--video-latency-ms", type=float, default=300, help="stubbed YouTube search latency")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    fake_groq.add_arguments(parser)
+    args = parser.parse_args()
+
+    groq_port, app_port = _free_port(), _free_port()
+    workdir = tempfile.mkdtemp(prefix="loadtest-")
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{workdir}/loadtest.db",
+        "JWT_SECRET": "loadtest",
+        "GROQ_API_KEY": "loadtest",
+        "GROQ_URL": f"http://127.0.0.1:{groq_port}/openai/v1/chat/completions",
+        "TTS_ENGINE": "tone",
+        "TTS_CACHE_DIR": f"{workdir}/tts",
+        "LOG_LEVEL": "WARNING",
+        "USAGE_DAILY_CALL_QUOTA": "0",
+        "USAGE_DAILY_TOKEN_QUOTA": "0",
+        "LOADTEST_VIDEO_LATENCY": str(args.video_latency_ms / 1000),
+    }
+
+    processes = [
+        subprocess.Popen([
+            sys.executable, "-m", "benchmarks.fake_groq", "--port", str(groq_port),
+            "--median-ms", str(args.median_ms), "--sigma", str(args.sigma),
+            "--error-rate", str(args.error_rate), "--chunk-ms", str(args.chunk_ms),
+        ], stdout=subprocess.DEVNULL),
+        subprocess.Popen([
+            sys.executable, "-m", "uvicorn", "benchmarks.loadtest:stubbed_app", "--factory",
+            "--host", "127.0.0.1", "--port", str(app_port),
+            "--workers", str(args.workers), "--log-level", "warning",
+        ], env=env),
+    ]
+    try:
+        base_url = f"http://127.0.0.1:{app_port}"
+        _wait_until_up(f"{base_url}{API}/system/health")
+        results = asyncio.run(drive(base_url, args.users, args.duration, args.seed))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+    results["meta"] = {
+        "commit": _commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {k: v for k, v in vars(args).items() if k not in ("json", "compare")},
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
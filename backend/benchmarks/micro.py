@@ -0,0 +1,232 @@
+"""
+Microbenchmarks for the pure-Python work done on every request, with a
+checked-in baseline (benchmarks/data/micro_baseline.json).
+
+Timings are divided by a fixed calibration loop run in the same process,
+so a baseline saved on a laptop still means something on a CI runner.
+Every case is measured in several interleaved rounds and compared by its
+median. --check exits non-zero only when a case is slower than its
+baseline by more than --threshold plus its measured noise, and still is
+when re-measured, so one noisy run doesn't fail CI.
+
+    cd backend
+    python -m benchmarks.micro                   # table, compared with the baseline
+    python -m benchmarks.micro --check           # CI: fail on regressions (make bench-check)
+    python -m benchmarks.micro --save-baseline   # after an intended change
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import timeit
+from pathlib import Path
+
+# app.utils loads settings on import; benchmarks need no real credentials
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("JWT_SECRET", "benchmark")
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+from jose import jwt  # noqa: E402
+
+from app.coach.prompt_rules import build_prompt  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.planner.prompt import build_planner_prompt  # noqa: E402
+from app.planner.schemas import PlannerResponse  # noqa: E402
+from app.resources.router import parse_duration, is_within_duration, is_within_duration_simple  # noqa: E402
+from app.resources.schemas import Video  # noqa: E402
+from app.utils import create_access_token  # noqa: E402
+from app.utils.text import normalize_text  # noqa: E402
+
+BASELINE_FILE = Path(__file__).parent / "data" / "micro_baseline.json"
+
+COACH_OUTPUT = """Sure! Here is the guidance in the requested format:
+
+{"now_fix": {"title": "⚡ अभी क्या करें (30 सेकंड)", "text": "Taali bajakar sabka dhyan kheenchiye. Har group se ek leader chuniye jo group ko shaant rakhega."},
+ "activity": {"title": "🎯 Simple Activity / Hook", "text": "Bachon ko 2 minute ka silent challenge dijiye: jo group sabse pehle bina bole 10 tak ginti likh de, woh jeetega."},
+ "explain": {"title": "💡 Concept समझाने का तरीका", "text": "Fractions ko roti ke tukdon se samjhaiye: ek roti ke 4 barabar hisse, har hissa 1/4."}}
+
+Let me know if you need anything else."""
+
+PLANNER_DATA = {
+    "topic": "Introduction to Fractions",
+    "competencies": [
+        "Understands a fraction as a part of a whole",
+        "Compares simple fractions using objects and drawings",
+        "Represents fractions on a number line",
+    ],
+    "methods": [
+        {"title": "Roti Sharing Demonstration", "description": "Use a paper circle as a roti. Fold it into halves and quarters while students call out the fraction.", "time": "10 minutes"},
+        {"title": "Fraction Pairs Game", "description": "In pairs, one student folds a paper strip and the partner names the fraction.", "time": "15 minutes"},
+        {"title": "Exit Ticket", "description": "Each student draws one fraction from daily life in their notebook.", "time": "5 minutes"},
+    ],
+    "teacher_tip": "Keep the strips from today's lesson; they work again for equivalent fractions next week.",
+}
+PLANNER_OUTPUT = "```json\n" + json.dumps(PLANNER_DATA, ensure_ascii=False, indent=2) + "\n```"
+
+SEARCH_ITEMS = [
+    {
+        "id": f"vid{i:08d}",
+        "title": f"Fractions for Class 4 | Part {i} | Easy explanation in Hindi",
+        "channel": {"name": "Shiksha Classroom"},
+        "duration": duration,
+        "link": f"https://www.youtube.com/watch?v=vid{i:08d}",
+    }
+    for i, duration in enumerate(["4:12", "12:40", "1:02:03", "7:55", "0:45", "9:10", "3:33", "15:01", "5:05", "2:20"])
+]
+ISO_DURATIONS = ["PT5M33S", "PT1H2M3S", "PT45S", "PT12M", "PT3M7S"]
+
+TOKEN = create_access_token({"user_id": 42})
+
+NOISE_SPREADS = 3  # a slowdown must exceed the threshold by this many spreads (MADs)
+
+
+def _extract_json(raw: str) -> dict:
+    # Same slicing the coach and planner routers do
+    start = raw.find("{")
+    end = raw.rfind("}") + 1
+    return json.loads(raw[start:end])
+
+
+CASES = {
+    "build_prompt": lambda: build_prompt("Grade 4", "Maths", "Group activity mein bacche disturb kar rahe hain", "Hinglish"),
+    "build_planner_prompt": lambda: build_planner_prompt(4, "Maths", 40),
+    "extract_json (coach)": lambda: _extract_json(COACH_OUTPUT),
+    "extract_json (planner)": lambda: _extract_json(PLANNER_OUTPUT),
+    "normalize_text": lambda: normalize_text("Umm haan toh basically bacche group activity mein, matlab, disturb kar rahe hain yaar"),
+    "parse_duration x5": lambda: [parse_duration(d) for d in ISO_DURATIONS],
+    "is_within_duration x5": lambda: [is_within_duration(d, 3, 10) for d in ISO_DURATIONS],
+    "is_within_duration_simple x10": lambda: [is_within_duration_simple(item["duration"], 2, 10) for item in SEARCH_ITEMS],
+    "Video x3": lambda: [
+        Video(id=item["id"], title=item["title"], channel=item["channel"]["name"], duration=item["duration"], url=item["link"])
+        for item in SEARCH_ITEMS[:3]
+    ],
+    "PlannerResponse": lambda: PlannerResponse(**PLANNER_DATA),
+    "jwt encode": lambda: create_access_token({"user_id": 42}),
+    "jwt decode": lambda: jwt.decode(TOKEN, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]),
+}
+
+
+def _calibration():
+    # Fixed interpreter-bound work: dict/str/int churn similar to the cases
+    total = 0
+    for i in range(2000):
+        key = f"k{i % 37}"
+        total += len(key) + (i * 7 % 13)
+    return total
+
+
+def _time(fn, number: int, repeat: int) -> float:
+    """
+    Best seconds per call over `repeat` runs of `number` calls; the minimum
+    is the run least disturbed by other processes.
+    """
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def _spread(values: list) -> float:
+    """
+    Median absolute deviation relative to the median: the case's noise.
+    """
+    median = statistics.median(values)
+    return statistics.median(abs(v - median) for v in values) / median
+
+
+def run(number: int, repeat: int, rounds: int, names=None) -> dict:
+    """
+    Time each case (all of CASES, or `names`) once per round and keep the
+    median of the rounds. Rounds go over every case in turn, so a burst of
+    load on the machine skews one round of many cases rather than every
+    round of one case.
+    """
+    names = list(names or CASES)
+    calibrations = []
+    seconds = {name: [] for name in names}
+    relative = {name: [] for name in names}
+    for _ in range(rounds):
+        for name in names:
+            # Calibrate next to each case so clock-speed drift affects both alike
+            calibration = _time(_calibration, max(1, number // 20), repeat)
+            took = _time(CASES[name], number, repeat)
+            calibrations.append(calibration)
+            seconds[name].append(took)
+            relative[name].append(took / calibration)
+
+    results = {
+        name: {
+            "us": round(statistics.median(seconds[name]) * 1e6, 3),
+            "relative": round(statistics.median(relative[name]), 5),
+            "spread": round(_spread(relative[name]), 4),
+        }
+        for name in names
+    }
+    return {"calibration_us": round(statistics.median(calibrations) * 1e6, 2), "cases": results}
+
+
+def _regressed(result: dict, base: dict, threshold: float) -> tuple:
+    """
+    (slowdown vs baseline, whether it exceeds the threshold plus noise).
+    """
+    ratio = result["relative"] / base["relative"] - 1
+    noise = NOISE_SPREADS * max(result.get("spread", 0.0), base.get("spread", 0.0))
+    return ratio, ratio > threshold + noise
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=1000, help="calls per timing run")
+    parser.add_argument("--repeat", type=int, default=7, help="timing runs per case and round (best is used)")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per case (median is used)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any case regressed beyond --threshold")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write results to {BASELINE_FILE.name}")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = run(args.number, args.repeat, args.rounds)
+
+    baseline = {}
+    if BASELINE_FILE.exists():
+        baseline = json.loads(BASELINE_FILE.read_text())["cases"]
+
+    suspects = []
+    print(f"{'case':32} {'µs/call':>10} {'relative':>10} {'noise':>7} {'vs base':>9}")
+    for name, r in results["cases"].items():
+        change = ""
+        if name in baseline:
+            ratio, slower = _regressed(r, baseline[name], args.threshold)
+            change = f"{ratio * 100:+.0f}%"
+            if slower:
+                suspects.append(name)
+        print(f"{name:32} {r['us']:>10} {r['relative']:>10} {r['spread'] * 100:>6.1f}% {change:>9}")
+    print(f"(calibration loop: {results['calibration_us']} µs)")
+
+    # Re-measure apparent regressions; only those that reproduce count
+    regressions = []
+    if args.check and suspects:
+        print(f"Re-measuring {', '.join(suspects)}")
+        again = run(args.number, args.repeat, args.rounds, suspects)["cases"]
+        for name in suspects:
+            ratio, slower = _regressed(again[name], baseline[name], args.threshold)
+            print(f"{name:32} {again[name]['us']:>10} {again[name]['relative']:>10} {ratio * 100:>+17.0f}%")
+            if slower:
+                regressions.append((name, ratio))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        BASELINE_FILE.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE_FILE}")
+        return
+
+    if args.check and regressions:
+        for name, ratio in regressions:
+            print(f"REGRESSION: {name} is {ratio * 100:.0f}% slower than baseline", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Filler normalization: the two previous implementations against the
+single-pass compiled engine in app/utils/text.py (per utterance and batch).
+
+Before timing, normalize_text is checked against EXPECTED and the script
+exits 1 on any mismatch.
+
+    cd backend
+    python -m benchmarks.normalizer [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+
+# app.utils loads settings on import; benchmarks need no real credentials
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("JWT_SECRET", "benchmark")
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+from app.utils.text import normalize_text, normalize_batch  # noqa: E402
+
+UTTERANCES = [
+    "Umm bacche group activity mein disturb kar rahe hain, matlab koi sun hi nahi raha",
+    "Haan toh basically fractions samjha rahi thi aur uh aadhe bacche confused hain yaar",
+    "Actually last bench ke bacche bilkul participate nahi karte, kya karun",
+    "उम्म बच्चे शोर कर रहे हैं, मतलब कोई भी ध्यान नहीं दे रहा",
+    "हाँ तो अच्छा, क्लास 3 और 4 एक साथ बैठे हैं, यार समझ नहीं आ रहा कैसे पढ़ाऊं",
+    "The students are not understanding place value, umm, what activity can I do?",
+    "Achha so umbrella wala chapter hai, bacche actually bahut excited hain but noisy",
+    "Ummmm mere paas sirf 15 minute bache hain aur revision baaki hai",
+]
+
+
+# (utterance, normalize_text output): fillers go, content words stay
+EXPECTED = [
+    ("Umm acha, class 3 aur 4 saath baithe hain", "class 3 aur 4 saath baithe hain"),
+    ("Achha so umbrella wala chapter hai", "so umbrella wala chapter hai"),
+    # "acha" / "अच्छा" meaning "well" is part of the problem
+    ("bachche acha nahi padh rahe", "bachche acha nahi padh rahe"),
+    ("बच्चे अच्छा नहीं पढ़ रहे", "बच्चे अच्छा नहीं पढ़ रहे"),
+    ("sab acha hai, yaar, kya karun", "sab acha hai, kya karun"),
+    ("yaar acha laga aaj", "acha laga aaj"),
+    ("um", ""),
+]
+
+
+def check() -> list:
+    return [(text, want, got) for text, want in EXPECTED if (got := normalize_text(text)) != want]
+
+
+def legacy_coach_normalize(text: str) -> str:
+    # Previous app/coach/normalizer.py
+    fillers = ["uh", "um", "haan", "matlab", "actually"]
+    for f in fillers:
+        text = text.replace(f, "")
+    return text.strip()
+
+
+LEGACY_FILLERS = ["umm", "uh", "haan", "achha", "matlab", "yaar", "basically"]
+
+
+def legacy_utils_normalize(text: str) -> str:
+    # Previous app/utils/text.py
+    text = text.lower()
+    for word in LEGACY_FILLERS:
+        text = re.sub(rf"\b{word}\b", "", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def run(number: int) -> dict:
+    batch = UTTERANCES * 25  # 200 utterances
+
+    def per_item(fn):
+        return lambda: [fn(t) for t in batch]
+
+    cases = {
+        "legacy coach (str.replace)": per_item(legacy_coach_normalize),
+        "legacy utils (re.sub per filler)": per_item(legacy_utils_normalize),
+        "compiled normalize_text": per_item(normalize_text),
+        "compiled normalize_batch": lambda: normalize_batch(batch),
+    }
+
+    results = {}
+    for name, fn in cases.items():
+        seconds = min(timeit.repeat(fn, number=number, repeat=5)) / number
+        results[name] = {"us_per_utterance": round(seconds / len(batch) * 1e6, 3)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=50, help="iterations per timing run")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    failures = check()
+    for text, want, got in failures:
+        print(f"MISMATCH: {text!r} -> {got!r}, expected {want!r}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+    print("Sample output:")
+    for text in UTTERANCES[:4]:
+        print(f"  {text!r}\n    -> {normalize_text(text)!r}")
+    print(f"  legacy coach mangles: {legacy_coach_normalize(UTTERANCES[6])!r}\n")
+
+    results = run(args.number)
+    for name, r in results.items():
+        print(f"{name:36} {r['us_per_utterance']:>8} µs/utterance")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
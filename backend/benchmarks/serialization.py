@@ -0,0 +1,204 @@
+"""
+Serialization time and bytes on the wire per endpoint.
+
+Compares FastAPI's default path (re-validate against response_model,
+jsonable_encoder, json.dumps) with the app's path (pre-validated model,
+model_dump, orjson), and reports body size raw / gzip / brotli.
+
+    cd backend
+    python -m benchmarks.serialization [--json results.json]
+"""
+
+import argparse
+import gzip
+import json
+import timeit
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+
+from app.coach.schemas import CoachResponse
+from app.peer.schemas import PeerFeedResponse
+from app.planner.schemas import PlannerResponse
+from app.reflection.schemas import ReflectionPage
+from app.resources.schemas import VideoSuggestionResponse
+from app.responses import FastJSONResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _coach():
+    return {
+        "now_fix": {
+            "title": "⚡ अभी क्या करें (30 सेकंड)",
+            "text": "Taali bajakar sabka dhyan kheenchiye. Har group se ek 'leader' chuniye jo "
+                    "group ko shaant rakhega aur aapko signal dega jab kaam ho jaye.",
+        },
+        "activity": {
+            "title": "🎯 Simple Activity / Hook",
+            "text": "Bachon ko 2 minute ka 'silent challenge' dijiye: jo group sabse pehle "
+                    "bina bole 10 tak ginti likh de, woh jeetega.",
+        },
+        "explain": {
+            "title": "💡 Concept समझाने का तरीका",
+            "text": "Fractions ko roti ke tukdon se samjhaiye: ek roti ke 4 barabar hisse, "
+                    "har hissa 1/4. Bachon se poochiye 2 hisse kitne hue.",
+        },
+    }
+
+
+def _planner():
+    return {
+        "topic": "Introduction to Fractions",
+        "competencies": [
+            "Understands a fraction as a part of a whole",
+            "Compares simple fractions using objects and drawings",
+            "Represents fractions on a number line",
+        ],
+        "methods": [
+            {
+                "title": "Roti Sharing Demonstration",
+                "description": "Use a paper circle as a roti. Fold it into halves and quarters "
+                               "while students call out the fraction for each part. Invite "
+                               "volunteers to shade parts on the board.",
+                "time": "10 minutes",
+            },
+            {
+                "title": "Fraction Pairs Game",
+                "description": "In pairs, one student folds a paper strip and the partner names "
+                               "the fraction. Swap roles after every turn. Walk around and ask "
+                               "pairs to explain their answers.",
+                "time": "15 minutes",
+            },
+            {
+                "title": "Exit Ticket",
+                "description": "Each student draws one fraction from daily life in their "
+                               "notebook and writes it in numbers.",
+                "time": "5 minutes",
+            },
+        ],
+        "teacher_tip": "Keep the strips from today's lesson; they work again for equivalent "
+                       "fractions next week.",
+    }
+
+
+def _videos():
+    return {
+        "videos": [
+            {
+                "id": f"vid{i:08d}",
+                "title": f"Fractions for Class 4 | Part {i} | Easy explanation in Hindi",
+                "channel": "Shiksha Classroom",
+                "duration": f"{4 + i}:{10 + i:02d}",
+                "url": f"https://www.youtube.com/watch?v=vid{i:08d}",
+            }
+            for i in range(3)
+        ],
+        "disclaimer": "Videos are provided as reference or inspiration, not as a replacement for teaching.",
+    }
+
+
+def _peer_feed():
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    return {
+        "items": [
+            {
+                "id": 500 - i,
+                "title": f"Multi-grade class tip #{i}: make Class 4 'math buddies' for Class 3",
+                "created_at": now - timedelta(minutes=7 * i),
+            }
+            for i in range(20)
+        ],
+        "next_cursor": "WyIyMDI2LTAxLTAxVDA5OjEzOjAwIiw0ODBd",
+    }
+
+
+def _reflections():
+    now = datetime(2026, 1, 1, 16, 0, 0)
+    return {
+        "items": [
+            {
+                "id": 200 - i,
+                "teacher_id": 7,
+                "reflection_text": "Aaj ka lesson theek raha. Group work mein shuru mein shor tha "
+                                   "lekin leader system se kaafi madad mili.",
+                "mood": "hopeful",
+                "challenge": "Back benchers were not participating in group work",
+                "success": "Two shy students explained the answer on the board",
+                "created_at": now - timedelta(days=i),
+                "ai_feedback": "Aapne shor ko sambhalne ka accha tareeka dhoondha. Kal back "
+                               "benchers ko group leader banakar dekhiye.",
+                "feedback_job_id": 900 - i,
+            }
+            for i in range(20)
+        ],
+        "next_cursor": "MTgx",
+    }
+
+
+ENDPOINTS = {
+    "POST /coach/query": (CoachResponse, _coach),
+    "POST /planner/generate-plan": (PlannerResponse, _planner),
+    "POST /resources/video-suggestions": (VideoSuggestionResponse, _videos),
+    "GET /peer/posts": (PeerFeedResponse, _peer_feed),
+    "GET /reflection/": (ReflectionPage, _reflections),
+}
+
+
+def default_path(schema, data):
+    # What FastAPI does with a plain return value and a response_model
+    validated = schema.model_validate(data)
+    content = jsonable_encoder(validated)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def fast_path(model):
+    return FastJSONResponse(None).render(model.model_dump(mode="json"))
+
+
+def run(number: int) -> dict:
+    results = {}
+    for endpoint, (schema, factory) in ENDPOINTS.items():
+        data = factory()
+        model = schema.model_validate(data)
+        body = fast_path(model)
+
+        default_us = min(timeit.repeat(lambda: default_path(schema, data), number=number, repeat=5)) / number * 1e6
+        fast_us = min(timeit.repeat(lambda: fast_path(model), number=number, repeat=5)) / number * 1e6
+
+        results[endpoint] = {
+            "default_us": round(default_us, 2),
+            "fast_us": round(fast_us, 2),
+            "speedup": round(default_us / fast_us, 2),
+            "raw_bytes": len(body),
+            "gzip_bytes": len(gzip.compress(body, compresslevel=6)),
+            "brotli_bytes": len(brotli.compress(body, quality=5)) if brotli else None,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="iterations per timing run")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = run(args.number)
+
+    print(f"{'endpoint':36} {'default µs':>11} {'fast µs':>9} {'x':>5} {'raw B':>7} {'gzip B':>7} {'br B':>7}")
+    for endpoint, r in results.items():
+        print(
+            f"{endpoint:36} {r['default_us']:>11} {r['fast_us']:>9} {r['speedup']:>5} "
+            f"{r['raw_bytes']:>7} {r['gzip_bytes']:>7} {str(r['brotli_bytes']):>7}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()